@@ -20,10 +20,9 @@ from uuid import uuid4
 import pandas as pd
 import streamlit as st
 
-from core import schema
-from core.engine import Engine
+from core import jobs, schema
 from core import storage
-from core.schema import SchemaValidationError
+from core.settings import load_settings
 from ui.bootstrap import init_app
 from ui.nav import render_sidebar
 from ui.style import apply_style
@@ -374,16 +373,12 @@ if st.button("Kontrolleri Çalıştır", type="primary"):
         json.dumps(mapping_payload, indent=2, ensure_ascii=True), encoding="utf-8"
     )
 
-    engine = Engine()
+    manager = jobs.get_job_manager(load_settings().job_workers)
     try:
-        result = engine.run(demo_type, inputs, run_id=run_id)
-    except SchemaValidationError as exc:
-        for message in exc.messages:
-            st.error(message)
-        st.stop()
+        manager.submit(demo_type, inputs, run_id=run_id)
     except Exception as exc:
         st.error(f"Beklenmeyen hata: {exc}")
         st.stop()
 
-    st.session_state["run_id"] = result.run_id
+    st.session_state["run_id"] = run_id
     st.switch_page("pages/2_Results.py")
@@ -14,6 +14,7 @@ from boot import ensure_project_root_on_path
 ensure_project_root_on_path()
 
 import json
+import time
 from typing import List
 
 import pandas as pd
@@ -21,8 +22,10 @@ import streamlit as st
 
 from core.audit import AuditTrailReader, AuditTrailWriter
 from core.engine import Engine
-from core import storage
+from core import jobs, storage
+from core.settings import load_settings
 from ui.bootstrap import init_app
+from ui.evidence import render_evidence
 from ui.nav import render_sidebar
 from ui.style import apply_style
 
@@ -33,12 +36,22 @@ SEVERITY_LABELS = {
     "medium": "ORTA",
     "high": "YÜKSEK",
 }
+JOB_STATUS_LABELS = {
+    "queued": "Sırada bekliyor…",
+    "running": "Çalışıyor…",
+    "done": "Tamamlandı",
+    "failed": "Çalıştırma başarısız oldu.",
+    "cancelled": "Çalıştırma iptal edildi.",
+    "interrupted": "Çalıştırma yarıda kaldı (uygulama yeniden başlatıldı).",
+}
+JOB_POLL_SECONDS = 1.0
 STATUS_LABELS = {
     "done": "Tamamlandı",
     "needs_approval": "Onay Bekliyor",
     "applied": "Uygulandı",
     "skipped": "Atlandı",
     "failed": "Başarısız",
+    "cancelled": "İptal Edildi",
 }
 
 st.set_page_config(page_title="ClarityAI", page_icon="✅", layout="wide")
@@ -54,6 +67,35 @@ if not run_id:
     st.info("Henüz bir çalıştırma seçilmedi.")
     st.stop()
 
+manager = jobs.get_job_manager(load_settings().job_workers)
+job = manager.poll(run_id)
+if job is not None and job["status"] not in jobs.FINAL_STATUSES:
+    st.write(f"Çalıştırma ID: {run_id}")
+    st.info(JOB_STATUS_LABELS[job["status"]])
+    progress = job.get("progress") or {}
+    if progress.get("title") or progress.get("action"):
+        line = f"Adım: {progress.get('title') or progress.get('action')}"
+        line += f" · tamamlanan adım: {progress.get('steps_done', 0)}"
+        if progress.get("rows"):
+            line += f" · işlenen satır: {progress['rows']:,}"
+        st.caption(line)
+    if job.get("cancel_requested"):
+        st.caption("İptal istendi; iş bir sonraki güvenli noktada durur.")
+    elif st.button("İptal et"):
+        manager.cancel(run_id)
+        st.rerun()
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
+
+if job is not None and job["status"] == jobs.CANCELLED:
+    st.warning(JOB_STATUS_LABELS[job["status"]])
+elif job is not None and job["status"] != jobs.DONE:
+    st.error(JOB_STATUS_LABELS[job["status"]])
+    for message in job.get("messages") or ([job["error"]] if job.get("error") else []):
+        st.error(message)
+    if not storage.get_audit_path(run_id).exists():
+        st.stop()
+
 reader = AuditTrailReader()
 audit = reader.load_run(run_id)
 run_dir = storage.ensure_run_dir(run_id)
@@ -215,7 +257,4 @@ if st.session_state["show_audit"]:
             st.write(f"İşlem: {step.action}")
             st.write(f"Karar: {step.decision}")
             st.write(f"Onay gerekir: {'Evet' if step.requires_approval else 'Hayır'}")
-            if step.evidence:
-                st.markdown("**Kanıtlar**")
-                for item in step.evidence:
-                    st.write(f"- {item}")
+            render_evidence(run_id, step, key=step.step_id)
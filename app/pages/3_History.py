@@ -17,7 +17,9 @@ import streamlit as st
 
 from core import storage
 from core.audit import AuditTrailReader
+from core.evidence import evidence_count
 from ui.bootstrap import init_app
+from ui.evidence import render_evidence
 from ui.nav import render_sidebar
 from ui.style import apply_style
 
@@ -53,7 +55,17 @@ run_id = selected.get("run_id")
 if run_id:
     audit = AuditTrailReader().load_run(run_id)
     st.subheader("Kanıt Defteri")
-    st.json(audit.model_dump(mode="json"))
+    # Spilled steps carry only a sample here; their full evidence is paged below.
+    st.json(audit.model_dump(mode="json"), expanded=False)
+
+    steps_with_evidence = [step for step in audit.steps if evidence_count(step)]
+    if steps_with_evidence:
+        chosen = st.selectbox(
+            "Kanıtlarını incele",
+            options=steps_with_evidence,
+            format_func=lambda step: f"{step.title} ({evidence_count(step):,})",
+        )
+        render_evidence(run_id, chosen, key=f"history-{chosen.step_id}")
 
     st.subheader("Çıktılar")
     if audit.artifacts:
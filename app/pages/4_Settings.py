@@ -15,6 +15,7 @@ import os
 
 import streamlit as st
 
+from core import classifier
 from core.settings import Settings, load_settings, save_settings
 from ui.bootstrap import init_app
 from ui.nav import render_sidebar
@@ -53,6 +54,63 @@ if chunk_enabled:
         step=500,
     )
 
+vectorized_rules = st.checkbox(
+    "Vektörel kural motoru (hızlı)",
+    value=settings.vectorized_rules,
+)
+
+cache_enabled = st.checkbox(
+    "Ayrıştırılmış girdi önbelleği",
+    value=settings.cache_max_mb is not None,
+)
+cache_max_mb = settings.cache_max_mb or 2048
+if cache_enabled:
+    cache_max_mb = st.number_input(
+        "Önbellek boyutu (MB)",
+        min_value=64,
+        value=cache_max_mb,
+        step=256,
+    )
+
+load_workers = st.number_input(
+    "Paralel dosya yükleme iş parçacığı (0 = otomatik)",
+    min_value=0,
+    value=settings.load_workers or 0,
+    step=1,
+)
+parse_workers = st.number_input(
+    "Tek büyük dosya için paralel ayrıştırma süreci (0 = kapalı)",
+    min_value=0,
+    value=settings.parse_workers or 0,
+    step=1,
+)
+duplicate_memory_mb = st.number_input(
+    "Mükerrer kontrolü için diske taşma bellek sınırı (MB, 0 = kapalı)",
+    min_value=0,
+    value=settings.duplicate_memory_mb or 0,
+    step=64,
+    help="Yalnızca mükerrer kontrolünü sınırlar; fatura tablosu yine tamamen belleğe yüklenir.",
+)
+
+job_workers = st.number_input(
+    "Aynı anda çalışan arka plan işi",
+    min_value=1,
+    value=settings.job_workers or 1,
+    step=1,
+)
+audit_checkpoint_seconds = st.number_input(
+    "Denetim kaydını çalışma sırasında kaydetme aralığı (sn, 0 = yalnızca sonda)",
+    min_value=0,
+    value=settings.audit_checkpoint_seconds or 0,
+    step=10,
+)
+evidence_spill_threshold = st.number_input(
+    "Bu sayıdan fazla kanıtı ayrı dosyaya taşı (0 = kapalı)",
+    min_value=0,
+    value=settings.evidence_spill_threshold or 0,
+    step=500,
+)
+
 st.subheader("Temizlik")
 ttl_days = st.number_input(
     "Otomatik temizlik (TTL gün, 0 = kapalı)",
@@ -67,6 +125,91 @@ if use_openai:
     st.warning("Hassas veri yüklemeyin.")
     if not api_key_present:
         st.warning("API anahtarı bulunamadı. Offline mod kullanılacak.")
+draft_llm_improve = st.checkbox(
+    "Yanıt taslaklarını LLM ile iyileştir (şablon başına bir istek)",
+    value=settings.draft_llm_improve,
+)
+llm_batch_size = st.number_input(
+    "İstek başına talep sayısı (kategori tahmini)",
+    min_value=1,
+    value=settings.llm_batch_size or 1,
+    step=1,
+)
+llm_workers = st.number_input(
+    "Eşzamanlı LLM isteği",
+    min_value=1,
+    value=settings.llm_workers or 1,
+    step=1,
+)
+llm_requests_per_minute = st.number_input(
+    "Dakikada en fazla LLM isteği (0 = sınırsız)",
+    min_value=0,
+    value=settings.llm_requests_per_minute or 0,
+    step=10,
+)
+llm_cache_enabled = st.checkbox(
+    "LLM yanıt önbelleği (yalnızca maskelenmiş metin)",
+    value=settings.llm_cache_max_entries is not None,
+)
+llm_cache_max_entries = settings.llm_cache_max_entries or 100_000
+llm_cache_ttl_days = settings.llm_cache_ttl_days or 0
+if llm_cache_enabled:
+    llm_cache_max_entries = st.number_input(
+        "Önbellekte en fazla yanıt",
+        min_value=100,
+        value=llm_cache_max_entries,
+        step=1000,
+    )
+    llm_cache_ttl_days = st.number_input(
+        "Önbellek süresi (gün, 0 = süresiz)",
+        min_value=0,
+        value=llm_cache_ttl_days,
+        step=1,
+    )
+
+st.subheader("Yerel sınıflandırıcı")
+classifier_enabled = st.checkbox(
+    "Kategoriyi önce yerel modelle tahmin et",
+    value=settings.classifier_min_confidence is not None,
+)
+classifier_min_confidence = settings.classifier_min_confidence or 80
+if classifier_enabled:
+    classifier_min_confidence = st.slider(
+        "En düşük güven (%) — altındakiler LLM'e gider",
+        min_value=50,
+        max_value=99,
+        value=min(max(classifier_min_confidence, 50), 99),
+    )
+st.caption(
+    "Model: "
+    + ("Var" if classifier.get_model_path().exists() else "Yok")
+    + " — geçmiş çalıştırmaların categories.csv çıktılarından eğitilir."
+)
+if st.button("Sınıflandırıcıyı eğit"):
+    model = classifier.train_from_runs()
+    if model is None:
+        st.warning("Yeterli etiketli örnek yok; model kaydedilmedi.")
+    else:
+        st.success("Model eğitildi: " + ", ".join(model.classes))
+
+st.subheader("Benzer talepler")
+cluster_enabled = st.checkbox(
+    "Benzer talepleri grupla (MinHash LSH)",
+    value=settings.cluster_similarity is not None,
+)
+cluster_similarity = settings.cluster_similarity or 60
+cluster_representatives = settings.cluster_representatives
+if cluster_enabled:
+    cluster_similarity = st.slider(
+        "Benzerlik eşiği (%)",
+        min_value=30,
+        max_value=95,
+        value=min(max(cluster_similarity, 30), 95),
+    )
+    cluster_representatives = st.checkbox(
+        "Her gruptan yalnızca bir temsilciyi kategorize et",
+        value=settings.cluster_representatives,
+    )
 
 if st.button("Ayarları Kaydet", type="primary"):
     new_settings = Settings(
@@ -74,6 +217,31 @@ if st.button("Ayarları Kaydet", type="primary"):
         chunk_size=chunk_size if chunk_enabled else None,
         ttl_days=ttl_days if ttl_days > 0 else None,
         use_openai=use_openai,
+        vectorized_rules=vectorized_rules,
+        cache_max_mb=cache_max_mb if cache_enabled else None,
+        load_workers=load_workers if load_workers > 0 else None,
+        parse_workers=parse_workers if parse_workers > 0 else None,
+        duplicate_memory_mb=duplicate_memory_mb if duplicate_memory_mb > 0 else None,
+        llm_batch_size=llm_batch_size,
+        llm_workers=llm_workers,
+        llm_requests_per_minute=(
+            llm_requests_per_minute if llm_requests_per_minute > 0 else None
+        ),
+        llm_cache_ttl_days=llm_cache_ttl_days if llm_cache_ttl_days > 0 else None,
+        llm_cache_max_entries=llm_cache_max_entries if llm_cache_enabled else None,
+        classifier_min_confidence=(
+            classifier_min_confidence if classifier_enabled else None
+        ),
+        cluster_similarity=cluster_similarity if cluster_enabled else None,
+        cluster_representatives=cluster_enabled and cluster_representatives,
+        draft_llm_improve=draft_llm_improve,
+        job_workers=job_workers,
+        audit_checkpoint_seconds=(
+            audit_checkpoint_seconds if audit_checkpoint_seconds > 0 else None
+        ),
+        evidence_spill_threshold=(
+            evidence_spill_threshold if evidence_spill_threshold > 0 else None
+        ),
     )
     save_settings(new_settings)
     st.success("Ayarlar kaydedildi.")
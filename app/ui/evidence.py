@@ -0,0 +1,29 @@
+import streamlit as st
+
+from core import evidence
+from core.models import StepRecord
+
+
+PAGE_SIZE = 50
+
+
+def render_evidence(run_id: str, step: StepRecord, key: str) -> None:
+    """Show a step's evidence one page at a time; only that page is read."""
+    total = evidence.evidence_count(step)
+    if total == 0:
+        return
+    st.markdown(f"**Kanıtlar** ({total:,})")
+    page_count = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.number_input(
+            f"Sayfa (1-{page_count})",
+            min_value=1,
+            max_value=page_count,
+            value=1,
+            step=1,
+            key=f"evidence-page-{key}",
+        )
+    offset = (int(page) - 1) * PAGE_SIZE
+    for item in evidence.read_evidence(run_id, step, offset, PAGE_SIZE):
+        st.write(f"- {item}")
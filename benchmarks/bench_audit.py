@@ -0,0 +1,70 @@
+"""Compare per-step audit writes with one in-memory session write.
+
+Usage: python benchmarks/bench_audit.py --steps 10 --evidence 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.audit import AuditTrailWriter  # noqa: E402
+from core.models import StepRecord  # noqa: E402
+
+
+def build_steps(steps: int, evidence: int) -> list[StepRecord]:
+    return [
+        StepRecord(
+            title=f"Kontrol {index}",
+            action="TOTAL_CHECK",
+            severity="medium",
+            evidence=[
+                f"Toplam uyuşmazlığı: INV-{index}-{row} beklenen 118.00 bulunan 123.00"
+                for row in range(evidence)
+            ],
+            decision="Toplam uyuşmazlığı bulundu",
+            requires_approval=False,
+            status="done",
+        )
+        for index in range(steps)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--evidence", type=int, default=100_000)
+    args = parser.parse_args()
+
+    steps = build_steps(args.steps, args.evidence)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        writer = AuditTrailWriter()
+
+        writer.create_run("per-step", "edoc", [])
+        start = time.perf_counter()
+        for step in steps:
+            writer.append_step("per-step", step)
+        writer.finalize_run("per-step", "done", [])
+        per_step = time.perf_counter() - start
+
+        start = time.perf_counter()
+        session = writer.start_session("session", "edoc", [])
+        session.append_steps(steps)
+        session.finalize("done", [])
+        batched = time.perf_counter() - start
+
+    total = args.steps * args.evidence
+    print(f"steps={args.steps} evidence_strings={total}")
+    print(f"append_step per step : {per_step:.2f}s")
+    print(f"session, one write   : {batched:.2f}s")
+    print(f"speedup              : {per_step / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Time training and batched inference of the offline ticket classifier.
+
+Usage: python benchmarks/bench_classifier.py --tickets 1000000 [--distinct]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.classifier import TicketClassifier  # noqa: E402
+
+
+TEXTS = [
+    ("Siparişim gelmedi, kargo nerede?", "delivery"),
+    ("refund please, the charge was wrong", "refund"),
+    ("Ürün hasarlı geldi iade etmek istiyorum", "refund"),
+    ("payment failed twice", "billing"),
+    ("Faturam hatalı kesilmiş", "billing"),
+    ("Teşekkürler, sorun çözüldü", "general"),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--distinct", action="store_true", help="unique token per ticket")
+    args = parser.parse_args()
+
+    texts = [
+        TEXTS[i % len(TEXTS)][0] + (f" no{i}" if args.distinct else "")
+        for i in range(args.tickets)
+    ]
+    labels = [TEXTS[i % len(TEXTS)][1] for i in range(args.tickets)]
+
+    start = time.perf_counter()
+    model = TicketClassifier.train(texts, labels)
+    elapsed = time.perf_counter() - start
+    print(f"    train: {elapsed:8.3f}s  {len(texts) / elapsed:12.1f} tickets/s")
+
+    start = time.perf_counter()
+    model.predict(texts)
+    elapsed = time.perf_counter() - start
+    print(f"  predict: {elapsed:8.3f}s  {len(texts) / elapsed:12.1f} tickets/s")
+
+
+if __name__ == "__main__":
+    main()
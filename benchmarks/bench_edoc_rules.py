@@ -0,0 +1,94 @@
+"""Compare the row-wise and vectorized e-document rule sets on synthetic data.
+
+Usage: python benchmarks/bench_edoc_rules.py --rows 200000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plugins.edocument_audit import rules, vectorized_rules  # noqa: E402
+
+
+def build_frames(rows: int, seed: int = 42) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    po_count = max(rows // 4, 1)
+    subtotal = np.round(rng.uniform(10, 5000, rows), 2)
+    vat_rate = rng.choice([0.01, 0.08, 0.18, 0.2], rows)
+    vat_amount = np.round(subtotal * vat_rate, 2)
+    vat_amount[rng.random(rows) < 0.01] += 1.0
+    total = np.round(subtotal + vat_amount, 2)
+    total[rng.random(rows) < 0.01] += 5.0
+    po_index = rng.integers(0, int(po_count * 1.01) + 1, rows)
+    invoices = pd.DataFrame(
+        {
+            "invoice_id": pd.array([f"INV-{i}" for i in range(rows)], dtype="string"),
+            "vendor": pd.array(
+                rng.choice(["Vendor A", "Vendor B", "Vendor C", "Vendor D"], rows),
+                dtype="string",
+            ),
+            "subtotal": subtotal,
+            "vat_rate": vat_rate,
+            "vat_amount": vat_amount,
+            "total": total,
+            "po_id": pd.array([f"PO-{i}" for i in po_index], dtype="string"),
+            "dn_id": pd.array([f"DN-{i}" for i in po_index], dtype="string"),
+        }
+    )
+    purchase_orders = pd.DataFrame(
+        {
+            "po_id": pd.array([f"PO-{i}" for i in range(po_count)], dtype="string"),
+            "item_count": rng.integers(1, 20, po_count),
+        }
+    )
+    delivered = purchase_orders["item_count"].to_numpy().copy()
+    delivered[rng.random(po_count) < 0.02] -= 1
+    delivery_notes = pd.DataFrame(
+        {
+            "dn_id": pd.array([f"DN-{i}" for i in range(po_count)], dtype="string"),
+            "delivered_item_count": delivered,
+        }
+    )
+    return invoices, purchase_orders, delivery_notes
+
+
+def run_rule_set(module, invoices, purchase_orders, delivery_notes) -> int:
+    found = 0
+    found += len(module.find_total_mismatch(invoices)[0])
+    found += len(module.find_vat_mismatch(invoices)[0])
+    found += len(module.find_missing_po_dn(invoices, purchase_orders, delivery_notes))
+    found += len(module.find_three_way_mismatch(invoices, purchase_orders, delivery_notes))
+    found += len(module.find_unapproved_vendors(invoices, ["Vendor A", "Vendor B"]))
+    found += len(module.find_disallowed_vat_rates(invoices, [0.01, 0.08, 0.18]))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--skip-row-wise", action="store_true")
+    args = parser.parse_args()
+
+    invoices, purchase_orders, delivery_notes = build_frames(args.rows)
+    timings = {}
+    for label, module in (("vectorized", vectorized_rules), ("row-wise", rules)):
+        if label == "row-wise" and args.skip_row_wise:
+            continue
+        start = time.perf_counter()
+        found = run_rule_set(module, invoices, purchase_orders, delivery_notes)
+        timings[label] = time.perf_counter() - start
+        print(f"{label:>10}: {timings[label]:8.3f}s  issues={found}")
+
+    if "row-wise" in timings and timings["vectorized"] > 0:
+        print(f"speedup: {timings['row-wise'] / timings['vectorized']:.1f}x ({args.rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare per-ticket and batched LLM categorization against the mock server.
+
+Usage: python benchmarks/bench_llm_categorize.py --tickets 2000 --latency-ms 50
+       [--batch-size 20] [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.llm import LLMClient  # noqa: E402
+from core.mock_openai import start_mock_server  # noqa: E402
+
+
+TEXTS = [
+    "Siparişim gelmedi, kargo nerede?",
+    "refund please, the charge was wrong",
+    "Ürün hasarlı geldi iade etmek istiyorum",
+    "payment failed twice",
+    "Teşekkürler, sorun çözüldü",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--skip-serial", action="store_true")
+    args = parser.parse_args()
+
+    texts = [TEXTS[i % len(TEXTS)] + f" #{i}" for i in range(args.tickets)]
+    server = start_mock_server(latency_ms=args.latency_ms)
+    try:
+        client = LLMClient(
+            api_key="mock",
+            use_openai=True,
+            base_url=server.base_url,
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+        )
+        if not args.skip_serial:
+            start = time.perf_counter()
+            for text in texts:
+                client.categorize(text)
+            elapsed = time.perf_counter() - start
+            print(f"    serial: {elapsed:8.3f}s  {len(texts) / elapsed:8.1f} tickets/s")
+        before = server.request_count
+        start = time.perf_counter()
+        client.categorize_many(texts)
+        elapsed = time.perf_counter() - start
+        print(
+            f"   batched: {elapsed:8.3f}s  {len(texts) / elapsed:8.1f} tickets/s  "
+            f"requests={server.request_count - before}"
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure PII masking throughput over a synthetic ticket text column.
+
+Usage: python benchmarks/bench_pii.py --texts 500000 [--pii-every 3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.pii import mask_texts  # noqa: E402
+
+
+TEXTS = [
+    "Siparişim gelmedi, kargo nerede?",
+    "refund please, the charge was wrong",
+    "Ürün hasarlı geldi iade etmek istiyorum",
+    "payment failed twice",
+    "Faturam hatalı kesilmiş",
+]
+PII = [
+    " beni 0532 {n:03d} 45 67 numarasından arayın",
+    " mail: musteri{n}@example.com",
+    " sipariş no: {n}",
+    " kart 4111 1111 1111 1111",
+    " IBAN TR33 0006 1005 1978 6457 8413 26",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=500_000)
+    parser.add_argument("--pii-every", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = []
+    for index in range(args.texts):
+        text = rng.choice(TEXTS) + f" #{index}"
+        if args.pii_every and index % args.pii_every == 0:
+            text += rng.choice(PII).format(n=index % 1000)
+        texts.append(text)
+
+    start = time.perf_counter()
+    _, counts = mask_texts(texts)
+    elapsed = time.perf_counter() - start
+    print(f"masked: {elapsed:8.3f}s  {len(texts) / elapsed:12.1f} texts/s")
+    print("  " + "  ".join(f"{kind}={count}" for kind, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
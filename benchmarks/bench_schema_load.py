@@ -0,0 +1,75 @@
+"""Time load_csv_with_schema on a synthetic invoices CSV.
+
+Usage: python benchmarks/bench_schema_load.py --rows 500000 [--chunk-size 100000]
+       [--parse-workers 8]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import schema  # noqa: E402
+from core.settings import Settings  # noqa: E402
+
+
+def write_invoices(path: Path, rows: int, date_format: str, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    subtotal = np.round(rng.uniform(10, 5000, rows), 2)
+    vat_rate = rng.choice([0.01, 0.08, 0.18, 0.2], rows)
+    vat_amount = np.round(subtotal * vat_rate, 2)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    frame = pd.DataFrame(
+        {
+            "invoice_id": [f"INV-{i}" for i in range(rows)],
+            "vendor": rng.choice(["Vendor A", "Vendor B", "Vendor C", "Vendor D"], rows),
+            "date": dates.strftime(date_format),
+            "subtotal": subtotal,
+            "vat_rate": vat_rate,
+            "vat_amount": vat_amount,
+            "total": np.round(subtotal + vat_amount, 2),
+            "po_id": [f"PO-{i // 3}" for i in range(rows)],
+            "dn_id": [f"DN-{i // 3}" for i in range(rows)],
+        }
+    )
+    frame.to_csv(path, index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--date-format", default="%Y-%m-%d")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    invoice_schema = schema.get_input_schema("edoc", "invoices")
+    settings = Settings(
+        chunk_size=args.chunk_size,
+        cache_max_mb=None,
+        parse_workers=args.parse_workers,
+    )
+    schema.PARALLEL_MIN_BYTES = 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "invoices.csv"
+        write_invoices(path, args.rows, args.date_format)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            df = schema.load_csv_with_schema(path, invoice_schema, None, settings)
+            timings.append(time.perf_counter() - start)
+    print(f"rows={len(df)} best={min(timings):.3f}s mean={sum(timings) / len(timings):.3f}s")
+    print(" ".join(schema.memory_evidence(df)))
+    print(", ".join(f"{col}:{dtype}" for col, dtype in df.dtypes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the row-wise and fused vectorized ticket triage passes.
+
+Usage: python benchmarks/bench_ticket_triage.py --rows 200000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from plugins.ticket_triage.plugin import TicketTriagePlugin  # noqa: E402
+
+
+TEXTS = [
+    "Siparişim gelmedi, acil dönüş bekliyorum",
+    "refund please, the charge was wrong",
+    "Ürün hasarlı geldi iade etmek istiyorum",
+    "Fatura adresimi güncellemek istiyorum",
+    "urgent: payment failed twice",
+    "Teşekkürler, sorun çözüldü",
+]
+
+
+def write_tickets(path: Path, rows: int, seed: int = 42) -> None:
+    rng = np.random.default_rng(seed)
+    order_ids = np.array([f"ORD-{i}" for i in range(rows)], dtype=object)
+    order_ids[rng.random(rows) < 0.05] = " "
+    frame = pd.DataFrame(
+        {
+            "ticket_id": [f"T{i}" for i in range(rows)],
+            "created_at": "2024-01-01",
+            "channel": rng.choice(["email", "chat", "phone"], rows),
+            "customer_text": rng.choice(TEXTS, rows),
+            "category": rng.choice(["billing", "shipping", "other"], rows),
+            "order_id": order_ids,
+            "amount": np.round(rng.uniform(10, 2000, rows), 2),
+        }
+    )
+    frame.to_csv(path, index=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        path = Path(tmp_dir) / "tickets.csv"
+        write_tickets(path, args.rows)
+        for label, vectorized in (("vectorized", True), ("row-wise", False)):
+            Path("settings.json").write_text(
+                json.dumps({"vectorized_rules": vectorized, "cache_max_mb": None}),
+                encoding="utf-8",
+            )
+            result = TicketTriagePlugin().analyze({"tickets": path}, None, f"bench-{label}")
+            triage_ms = sum(
+                step.duration_ms or 0
+                for step in result.steps
+                if step.action in {"CATEGORIZE", "MISSING_INFO", "PRIORITY_SCORE"}
+            )
+            print(f"{label:>10}: triage={triage_ms / 1000:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
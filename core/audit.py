@@ -1,28 +1,137 @@
+"""Run audits as an append-only event log plus a compacted snapshot.
+
+``audit.json`` is a complete :class:`RunAudit` as of the last compaction and
+``audit.log.jsonl`` holds one line per mutation since then. Appends only add
+a line; the log is folded into the snapshot when it outgrows it and at
+finalize. Replaying a line is idempotent (steps are keyed by ``step_id``),
+so a crash between writing the snapshot and truncating the log is harmless.
+"""
 from __future__ import annotations
 
 import json
+import os
 import threading
+import time
 from datetime import datetime, timezone
-from typing import List
+from typing import Iterable, List
 
-from core.models import ArtifactRecord, InputFileRecord, RunAudit, StepRecord
+from core.models import ArtifactRecord, InputFileRecord, RunAudit, RunStatus, StepRecord
 from core import storage
 
 
 _AUDIT_LOCK = threading.Lock()
+# The log is compacted once it is larger than the snapshot and this floor,
+# which keeps the amortized cost of an append independent of the audit size.
+COMPACT_MIN_BYTES = 1024 * 1024
 
 
 def _write_audit(run_id: str, audit: RunAudit) -> None:
     audit_path = storage.get_audit_path(run_id)
-    with audit_path.open("w", encoding="utf-8") as handle:
-        json.dump(audit.model_dump(mode="json"), handle, indent=2, ensure_ascii=True)
+    # Serialized by pydantic in one pass and swapped in whole, so a crash
+    # mid-write leaves the previous audit rather than a truncated one.
+    tmp_path = audit_path.with_suffix(".tmp")
+    tmp_path.write_bytes(audit.model_dump_json(indent=2).encode("utf-8"))
+    os.replace(tmp_path, audit_path)
+
+
+def _append_event(run_id: str, line: str) -> int:
+    """Append one event line to the log; returns the log size afterwards."""
+    log_path = storage.get_audit_log_path(run_id)
+    data = line.encode("utf-8")
+    with log_path.open("a+b") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size:
+            handle.seek(size - 1)
+            if handle.read(1) != b"\n":
+                # A crash cut the previous line short; keep this one whole.
+                data = b"\n" + data
+        handle.write(data)
+        handle.flush()
+        return handle.tell()
+
+
+def _steps_event(steps: Iterable[StepRecord]) -> str:
+    body = ",".join(step.model_dump_json() for step in steps)
+    return f'{{"event":"steps","steps":[{body}]}}\n'
+
+
+def _finalize_event(
+    finished_at: datetime,
+    final_summary: str,
+    artifacts: List[ArtifactRecord],
+    status: RunStatus,
+) -> str:
+    payload = {
+        "event": "finalize",
+        "finished_at": finished_at.isoformat(),
+        "final_summary": final_summary,
+        "artifacts": [artifact.model_dump(mode="json") for artifact in artifacts],
+        "status": status,
+    }
+    return json.dumps(payload, ensure_ascii=False) + "\n"
+
+
+def _apply_event(audit: RunAudit, step_ids: set, event: dict) -> None:
+    kind = event.get("event")
+    if kind == "steps":
+        for payload in event["steps"]:
+            step = StepRecord.model_validate(payload)
+            if step.step_id not in step_ids:
+                step_ids.add(step.step_id)
+                audit.steps.append(step)
+    elif kind == "finalize":
+        audit.finished_at = datetime.fromisoformat(event["finished_at"])
+        audit.final_summary = event["final_summary"]
+        audit.artifacts = [ArtifactRecord.model_validate(item) for item in event["artifacts"]]
+        audit.status = event["status"]
+    elif kind == "mark_applied":
+        _mark_applied(audit, event.get("step_id"))
+
+
+def _mark_applied(audit: RunAudit, step_id: str | None) -> None:
+    for step in audit.steps:
+        if step_id is None and step.requires_approval:
+            step.status = "applied"
+        elif step_id is not None and step.step_id == step_id:
+            step.status = "applied"
 
 
 def _read_audit(run_id: str) -> RunAudit:
-    audit_path = storage.get_audit_path(run_id)
-    with audit_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-    return RunAudit.model_validate(payload)
+    """Snapshot plus every event logged after it."""
+    audit = RunAudit.model_validate_json(storage.get_audit_path(run_id).read_bytes())
+    log_path = storage.get_audit_log_path(run_id)
+    if not log_path.exists():
+        return audit
+    step_ids = {step.step_id for step in audit.steps}
+    with log_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash mid-append is skipped.
+                continue
+            _apply_event(audit, step_ids, event)
+    return audit
+
+
+def _compact(run_id: str) -> RunAudit:
+    """Fold the log into the snapshot and empty it; caller holds the lock."""
+    audit = _read_audit(run_id)
+    _write_audit(run_id, audit)
+    storage.get_audit_log_path(run_id).write_text("", encoding="utf-8")
+    return audit
+
+
+def _compact_if_large(run_id: str, log_size: int) -> None:
+    if log_size < COMPACT_MIN_BYTES:
+        return
+    if log_size > storage.get_audit_path(run_id).stat().st_size:
+        _compact(run_id)
+
+
+def load_audit(run_id: str) -> RunAudit:
+    with _AUDIT_LOCK:
+        return _read_audit(run_id)
 
 
 class AuditTrailWriter:
@@ -43,26 +152,50 @@ class AuditTrailWriter:
             artifacts=[],
         )
         storage.ensure_run_dir(run_id)
-        _write_audit(run_id, audit)
+        with _AUDIT_LOCK:
+            _write_audit(run_id, audit)
+            storage.get_audit_log_path(run_id).write_text("", encoding="utf-8")
         storage.upsert_index_entry(run_id, demo_type, started_at, None)
         return audit
 
-    def append_step(self, run_id: str, step: StepRecord) -> RunAudit:
+    def append_step(self, run_id: str, step: StepRecord) -> None:
+        self.append_steps(run_id, [step])
+
+    def append_steps(self, run_id: str, steps: Iterable[StepRecord]) -> None:
+        """Append several steps as one log line, without reading the audit."""
+        steps = list(steps)
+        if not steps:
+            return
+        line = _steps_event(steps)
         with _AUDIT_LOCK:
-            audit = _read_audit(run_id)
-            audit.steps.append(step)
-            _write_audit(run_id, audit)
-        return audit
+            _compact_if_large(run_id, _append_event(run_id, line))
+
+    def start_session(
+        self,
+        run_id: str,
+        demo_type: str,
+        input_files: List[InputFileRecord],
+        checkpoint_seconds: float | None = None,
+    ) -> "AuditSession":
+        """Create the run and keep its audit in memory until finalize."""
+        return AuditSession(
+            self.create_run(run_id, demo_type, input_files), checkpoint_seconds
+        )
 
     def finalize_run(
-        self, run_id: str, final_summary: str, artifacts: List[ArtifactRecord]
+        self,
+        run_id: str,
+        final_summary: str,
+        artifacts: List[ArtifactRecord],
+        status: RunStatus = "done",
     ) -> RunAudit:
+        line = _finalize_event(
+            datetime.now(timezone.utc), final_summary, artifacts, status
+        )
         with _AUDIT_LOCK:
-            audit = _read_audit(run_id)
-            audit.finished_at = datetime.now(timezone.utc)
-            audit.final_summary = final_summary
-            audit.artifacts = artifacts
-            _write_audit(run_id, audit)
+            _append_event(run_id, line)
+            # Finished runs are compacted so audit.json alone is complete.
+            audit = _compact(run_id)
             storage.upsert_index_entry(
                 run_id,
                 audit.demo_type,
@@ -71,18 +204,90 @@ class AuditTrailWriter:
             )
         return audit
 
-    def mark_applied(self, run_id: str, step_id: str | None = None) -> RunAudit:
+    def mark_applied(self, run_id: str, step_id: str | None = None) -> None:
+        """Log the approval as one line; readers apply it when replaying."""
+        line = json.dumps({"event": "mark_applied", "step_id": step_id}) + "\n"
         with _AUDIT_LOCK:
-            audit = _read_audit(run_id)
-            for step in audit.steps:
-                if step_id is None and step.requires_approval:
-                    step.status = "applied"
-                elif step_id is not None and step.step_id == step_id:
-                    step.status = "applied"
-            _write_audit(run_id, audit)
+            _compact_if_large(run_id, _append_event(run_id, line))
+
+
+class AuditSession:
+    """In-memory audit of a running run, written out when it is finalized.
+
+    With ``checkpoint_seconds``, steps buffered for at least that long are
+    appended to the event log, so a crash loses at most that window of
+    steps. ``None`` writes only at finalize.
+    """
+
+    def __init__(self, audit: RunAudit, checkpoint_seconds: float | None = None) -> None:
+        self.audit = audit
+        self.checkpoint_seconds = checkpoint_seconds
+        self._step_ids = {step.step_id for step in audit.steps}
+        self._pending: List[StepRecord] = []
+        self._last_write = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        return self.audit.run_id
+
+    def has_step(self, step_id: str) -> bool:
+        with self._lock:
+            return step_id in self._step_ids
+
+    def append_step(self, step: StepRecord) -> None:
+        self.append_steps([step])
+
+    def append_steps(self, steps: Iterable[StepRecord]) -> None:
+        """Add steps not yet in the session; a step id is only recorded once."""
+        with self._lock:
+            for step in steps:
+                if step.step_id in self._step_ids:
+                    continue
+                self._step_ids.add(step.step_id)
+                self.audit.steps.append(step)
+                self._pending.append(step)
+            due = (
+                self.checkpoint_seconds is not None
+                and time.monotonic() - self._last_write >= self.checkpoint_seconds
+            )
+        if due:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            line = _steps_event(pending)
+            with _AUDIT_LOCK:
+                _compact_if_large(self.run_id, _append_event(self.run_id, line))
+            self._last_write = time.monotonic()
+
+    def finalize(
+        self,
+        final_summary: str,
+        artifacts: List[ArtifactRecord],
+        status: RunStatus = "done",
+    ) -> RunAudit:
+        with self._lock:
+            audit = self.audit
+            audit.finished_at = datetime.now(timezone.utc)
+            audit.final_summary = final_summary
+            audit.artifacts = artifacts
+            audit.status = status
+            self._pending = []
+            with _AUDIT_LOCK:
+                # The session holds the whole audit, so the snapshot is
+                # written from memory and the log can simply be emptied.
+                _write_audit(self.run_id, audit)
+                storage.get_audit_log_path(self.run_id).write_text("", encoding="utf-8")
+                storage.upsert_index_entry(
+                    self.run_id, audit.demo_type, audit.started_at, audit.finished_at
+                )
         return audit
 
 
 class AuditTrailReader:
     def load_run(self, run_id: str) -> RunAudit:
-        return _read_audit(run_id)
+        return load_audit(run_id)
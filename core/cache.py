@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+from uuid import uuid4
+
+import pandas as pd
+
+from core import storage
+
+
+# Bump whenever load_csv_with_schema changes the frames it produces so stale
+# entries written by an older loader are never served.
+CACHE_VERSION = 3
+PARSED_DIRNAME = "parsed"
+CACHE_SUFFIX = ".arrow"
+
+_DIGEST_LOCK = threading.Lock()
+_DIGEST_MEMO: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path) -> str:
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _DIGEST_LOCK:
+        cached = _DIGEST_MEMO.get(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _DIGEST_LOCK:
+        _DIGEST_MEMO[memo_key] = value
+    return value
+
+
+def parsed_cache_key(
+    file_hash: str,
+    schema_columns: Dict[str, str],
+    mapping: Dict[str, str] | None,
+    max_rows: int | None,
+) -> str:
+    payload = {
+        "version": CACHE_VERSION,
+        "file_hash": file_hash,
+        "schema": sorted(schema_columns.items()),
+        "mapping": sorted((mapping or {}).items(), key=lambda item: item[0]),
+        "max_rows": max_rows,
+    }
+    encoded = json.dumps(payload, ensure_ascii=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_parsed_dir() -> Path:
+    parsed_dir = storage.get_cache_dir() / PARSED_DIRNAME
+    parsed_dir.mkdir(parents=True, exist_ok=True)
+    return parsed_dir
+
+
+def _entry_path(key: str) -> Path:
+    return get_parsed_dir() / f"{key}{CACHE_SUFFIX}"
+
+
+def load_parsed(key: str) -> pd.DataFrame | None:
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return None
+
+    path = _entry_path(key)
+    if not path.exists():
+        return None
+    try:
+        table = feather.read_table(path, memory_map=True)
+        frame = table.to_pandas()
+        for col in frame.columns:
+            # Arrow dictionaries come back with "str" categories; the loader
+            # builds them from "string" columns.
+            if isinstance(frame[col].dtype, pd.CategoricalDtype):
+                categories = frame[col].cat.categories
+                if pd.api.types.is_string_dtype(categories.dtype):
+                    frame[col] = frame[col].cat.set_categories(categories.astype("string"))
+    except Exception:
+        path.unlink(missing_ok=True)
+        return None
+    # mtime doubles as the LRU clock.
+    os.utime(path)
+    return frame
+
+
+def store_parsed(key: str, df: pd.DataFrame, max_bytes: int) -> None:
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError:
+        return
+
+    path = _entry_path(key)
+    tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        if tmp_path.stat().st_size > max_bytes:
+            return
+        os.replace(tmp_path, path)
+    except Exception:
+        return
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    evict_parsed(max_bytes)
+
+
+def evict_parsed(max_bytes: int) -> None:
+    entries = []
+    for path in get_parsed_dir().glob(f"*{CACHE_SUFFIX}"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,215 @@
+"""Offline ticket category classifier: hashed n-grams with multinomial naive Bayes.
+
+Usage: python -m core.classifier train [--min-examples 20]
+Trains on the ``categories.csv`` artifacts of past ticket runs and saves
+the model under ``runs/_models``.
+"""
+from __future__ import annotations
+
+import argparse
+import string
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core import storage
+
+
+MODEL_FILENAME = "ticket_classifier.npz"
+CATEGORIES_ARTIFACT = "categories.csv"
+N_FEATURES = 2**18
+PREFIX_LENGTH = 4
+# Label sources worth learning from; heuristic and classifier guesses are not.
+TRAINABLE_SOURCES = ("input", "llm")
+
+_UNIGRAM_KEY = "ngram-unigram-01"
+_PREFIX_KEY = "ngram-prefix-001"
+_BIGRAM_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_PUNCTUATION = string.punctuation + "“”‘’«»…"
+
+
+def _hash_dictionary(values, hash_key: str) -> np.ndarray:
+    strings = np.asarray(values.to_pylist(), dtype=object)
+    return pd.util.hash_array(strings, hash_key=hash_key)
+
+
+def extract_features(
+    texts: Sequence[str], n_features: int = N_FEATURES
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (document index, feature bucket) pairs for every n-gram.
+
+    Features are lowercased word unigrams, word bigrams and word prefixes.
+    Tokens are dictionary-encoded first, so only distinct tokens are hashed.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = pa.array(list(texts), type=pa.string()).fill_null("")
+    tokens = pc.utf8_split_whitespace(pc.utf8_lower(array))
+    # Trimming punctuation per token is far cheaper than a regex over the text.
+    flat = pc.utf8_trim(pc.list_flatten(tokens), characters=_PUNCTUATION)
+    keep = pc.not_equal(flat, "")
+    flat = flat.filter(keep)
+    doc_ids = (
+        pc.list_parent_indices(tokens).filter(keep).to_numpy().astype(np.int64)
+    )
+    if len(flat) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    encoded = pc.dictionary_encode(flat)
+    unigram = _hash_dictionary(encoded.dictionary, _UNIGRAM_KEY)[
+        encoded.indices.to_numpy()
+    ]
+    prefixes = pc.dictionary_encode(pc.utf8_slice_codeunits(flat, 0, PREFIX_LENGTH))
+    prefix = _hash_dictionary(prefixes.dictionary, _PREFIX_KEY)[prefixes.indices.to_numpy()]
+
+    same_doc = doc_ids[1:] == doc_ids[:-1]
+    bigram = (unigram[:-1] * _BIGRAM_MULTIPLIER) ^ unigram[1:]
+    hashes = np.concatenate([unigram, prefix, bigram[same_doc]])
+    docs = np.concatenate([doc_ids, doc_ids, doc_ids[1:][same_doc]])
+    buckets = (hashes % np.uint64(n_features)).astype(np.int64)
+    return docs, buckets
+
+
+class TicketClassifier:
+    """Multinomial naive Bayes over hashed n-gram counts."""
+
+    def __init__(
+        self,
+        classes: Sequence[str],
+        log_prior: np.ndarray,
+        feature_log_prob: np.ndarray,
+    ) -> None:
+        self.classes = np.asarray(classes, dtype=object)
+        self.log_prior = np.asarray(log_prior, dtype=np.float64)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float32)
+
+    @property
+    def n_features(self) -> int:
+        return self.feature_log_prob.shape[1]
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        n_features: int = N_FEATURES,
+        alpha: float = 1.0,
+    ) -> "TicketClassifier":
+        classes, label_index = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+        docs, buckets = extract_features(texts, n_features)
+        counts = np.bincount(
+            label_index[docs] * n_features + buckets,
+            minlength=len(classes) * n_features,
+        ).reshape(len(classes), n_features)
+        smoothed = counts + alpha
+        feature_log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        class_counts = np.bincount(label_index, minlength=len(classes))
+        log_prior = np.log(class_counts) - np.log(class_counts.sum())
+        return cls(classes, log_prior, feature_log_prob)
+
+    def predict(self, texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """Labels and posterior confidence (0..1) for every text, in order."""
+        count = len(texts)
+        if count == 0:
+            return [], np.empty(0)
+        docs, buckets = extract_features(texts, self.n_features)
+        scores = np.empty((count, len(self.classes)))
+        for index in range(len(self.classes)):
+            scores[:, index] = self.log_prior[index] + np.bincount(
+                docs, weights=self.feature_log_prob[index, buckets], minlength=count
+            )
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return self.classes[best].tolist(), probabilities[np.arange(count), best]
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            classes=self.classes.astype(str),
+            log_prior=self.log_prior,
+            feature_log_prob=self.feature_log_prob.astype(np.float16),
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TicketClassifier":
+        with np.load(Path(path)) as payload:
+            return cls(
+                payload["classes"].tolist(),
+                payload["log_prior"],
+                payload["feature_log_prob"].astype(np.float32),
+            )
+
+
+def get_model_path() -> Path:
+    return storage.get_models_dir() / MODEL_FILENAME
+
+
+_LOADED: dict = {}
+
+
+def load_default_classifier() -> Optional[TicketClassifier]:
+    path = get_model_path()
+    if not path.exists():
+        return None
+    key = (str(path), path.stat().st_mtime_ns)
+    model = _LOADED.get(key)
+    if model is None:
+        try:
+            model = TicketClassifier.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        _LOADED.clear()
+        _LOADED[key] = model
+    return model
+
+
+def collect_training_data(runs_dir: Path | None = None) -> pd.DataFrame:
+    runs_dir = runs_dir or storage.get_runs_dir()
+    frames = []
+    for path in sorted(runs_dir.glob(f"*/artifacts/{CATEGORIES_ARTIFACT}")):
+        try:
+            frame = pd.read_csv(path, dtype="string")
+        except (OSError, ValueError):
+            continue
+        if {"text", "category", "source"} <= set(frame.columns):
+            frames.append(frame[["text", "category", "source"]])
+    if not frames:
+        return pd.DataFrame(columns=["text", "category", "source"], dtype="string")
+    data = pd.concat(frames, ignore_index=True).dropna()
+    data = data[data["source"].isin(TRAINABLE_SOURCES) & data["category"].str.strip().ne("")]
+    # The latest label wins when the same text was labelled more than once.
+    return data.drop_duplicates(subset="text", keep="last").reset_index(drop=True)
+
+
+def train_from_runs(min_examples: int = 20) -> Optional[TicketClassifier]:
+    data = collect_training_data()
+    if len(data) < min_examples or data["category"].nunique() < 2:
+        return None
+    model = TicketClassifier.train(data["text"].tolist(), data["category"].tolist())
+    model.save(get_model_path())
+    return model
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--min-examples", type=int, default=20)
+    args = parser.parse_args()
+    model = train_from_runs(args.min_examples)
+    if model is None:
+        print("Yeterli etiketli örnek yok; model kaydedilmedi.")
+        return
+    print(f"Model kaydedildi: {get_model_path()} (sınıflar: {', '.join(model.classes)})")
+
+
+if __name__ == "__main__":
+    main()
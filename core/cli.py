@@ -0,0 +1,276 @@
+"""Headless entry points for running audits without the Streamlit UI.
+
+Usage: python -m core.cli batch manifest.json --workers 8 --output summary.csv
+
+The manifest is a JSON list (or ``{"runs": [...]}``) of input sets::
+
+    [
+      {
+        "name": "tenant-a",
+        "demo_type": "edoc",
+        "inputs": {"invoices": "tenant-a/invoices.csv", ...},
+        "mapping": "tenant-a/mapping.json"
+      }
+    ]
+
+Relative paths are resolved against the manifest's folder. ``mapping`` may
+also be given inline as an object. Nothing here imports the UI packages.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from core import storage
+
+
+SUMMARY_COLUMNS = [
+    "name",
+    "demo_type",
+    "run_id",
+    "status",
+    "seconds",
+    "issues",
+    "high",
+    "medium",
+    "low",
+    "error",
+]
+ISSUE_SEVERITIES = ("high", "medium", "low")
+
+
+def load_manifest(path: Path) -> List[Dict[str, Any]]:
+    """Read a batch manifest and resolve its paths; raises ``ValueError``."""
+    with path.open("r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if isinstance(payload, dict):
+        payload = payload.get("runs")
+    if not isinstance(payload, list):
+        raise ValueError("Manifest must be a list of runs or {\"runs\": [...]}")
+
+    base = path.resolve().parent
+    entries: List[Dict[str, Any]] = []
+    for position, item in enumerate(payload):
+        if not isinstance(item, dict) or not isinstance(item.get("inputs"), dict):
+            raise ValueError(f"Manifest entry {position} needs an 'inputs' object")
+        if not item.get("demo_type"):
+            raise ValueError(f"Manifest entry {position} needs a 'demo_type'")
+        mapping = item.get("mapping") or {}
+        if isinstance(mapping, str):
+            mapping = str(base / mapping)
+        entries.append(
+            {
+                "name": str(item.get("name") or f"run-{position + 1}"),
+                "demo_type": str(item["demo_type"]),
+                "inputs": {
+                    name: str(base / value) for name, value in item["inputs"].items()
+                },
+                "mapping": mapping,
+            }
+        )
+    return entries
+
+
+def _load_entry_mapping(mapping: Dict[str, Any] | str) -> Dict[str, Any]:
+    if isinstance(mapping, dict):
+        return mapping
+    with Path(mapping).open("r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict):
+        raise ValueError(f"Mapping file is not an object: {mapping}")
+    return payload
+
+
+def _issue_counts(run_id: str) -> Dict[str, int]:
+    """Issues per severity, from the plugin summary when it wrote one."""
+    counts = {severity: 0 for severity in ISSUE_SEVERITIES}
+    summary_path = storage.ensure_run_dir(run_id) / "artifacts" / "summary.json"
+    if summary_path.exists():
+        with summary_path.open("r", encoding="utf-8") as handle:
+            by_severity = json.load(handle).get("counts_by_severity", {})
+        for severity in ISSUE_SEVERITIES:
+            counts[severity] = int(by_severity.get(severity, 0))
+        return counts
+    for step in storage.load_run(run_id).steps:
+        if step.severity in counts:
+            counts[step.severity] += 1
+    return counts
+
+
+def run_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one manifest entry; every failure is reported in the returned row."""
+    from core.engine import Engine
+
+    start = time.perf_counter()
+    run_id = entry.get("run_id") or str(uuid4())
+    row: Dict[str, Any] = {
+        "name": entry["name"],
+        "demo_type": entry["demo_type"],
+        "run_id": run_id,
+        "status": "done",
+        "error": "",
+    }
+    try:
+        mapping = _load_entry_mapping(entry.get("mapping") or {})
+        run_dir = storage.ensure_run_dir(run_id)
+        (run_dir / "mapping.json").write_text(
+            json.dumps(mapping, indent=2, ensure_ascii=True), encoding="utf-8"
+        )
+        inputs = {name: Path(value) for name, value in entry["inputs"].items()}
+        missing = [str(path) for path in inputs.values() if not path.exists()]
+        if missing:
+            raise FileNotFoundError("Missing input: " + ", ".join(missing))
+        Engine().run(entry["demo_type"], inputs, run_id=run_id)
+        counts = _issue_counts(run_id)
+        row.update(counts)
+        row["issues"] = sum(counts.values())
+    except Exception as exc:
+        row["status"] = "failed"
+        row["error"] = f"{type(exc).__name__}: {exc}"
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def _failed_row(entry: Dict[str, Any], exc: BaseException) -> Dict[str, Any]:
+    return {
+        "name": entry["name"],
+        "demo_type": entry["demo_type"],
+        "run_id": "",
+        "status": "failed",
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+def _run_shared(
+    entries: List[Dict[str, Any]],
+    rows: List[Dict[str, Any] | None],
+    workers: int,
+    context: Any,
+    runner: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> List[int]:
+    """Run every entry in one pool; returns the indexes lost to a broken pool."""
+    lost: List[int] = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(runner, entry): index for index, entry in enumerate(entries)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                rows[index] = future.result()
+            except BrokenProcessPool:
+                lost.append(index)
+            except Exception as exc:
+                rows[index] = _failed_row(entries[index], exc)
+    return sorted(lost)
+
+
+def _run_isolated(
+    entries: List[Dict[str, Any]],
+    indexes: List[int],
+    rows: List[Dict[str, Any] | None],
+    workers: int,
+    context: Any,
+    runner: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> None:
+    """Run each entry in a pool of its own, ``workers`` at a time.
+
+    A killed worker may have left a half-written run under the entry's run
+    id; it is removed before the rerun, and again if the rerun dies too.
+    """
+    for offset in range(0, len(indexes), workers):
+        pools = []
+        for index in indexes[offset : offset + workers]:
+            storage.delete_run(entries[index]["run_id"])
+            pool = ProcessPoolExecutor(max_workers=1, mp_context=context)
+            pools.append((index, pool, pool.submit(runner, entries[index])))
+        for index, pool, future in pools:
+            try:
+                rows[index] = future.result()
+            except Exception as exc:
+                storage.delete_run(entries[index]["run_id"])
+                rows[index] = _failed_row(entries[index], exc)
+            finally:
+                pool.shutdown()
+
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    workers: int | None = None,
+    runner: Callable[[Dict[str, Any]], Dict[str, Any]] = run_entry,
+) -> List[Dict[str, Any]]:
+    """Run the entries across a process pool; rows come back in manifest order.
+
+    A worker that dies (e.g. killed for memory) breaks the whole pool, and the
+    pool cannot tell which entry caused it. Every entry that had not finished
+    is then rerun under the same run id in a process of its own, so only the
+    crashing entry fails.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(entries) or 1))
+    # Run ids are fixed up front so a rerun replaces a crashed attempt's run.
+    entries = [{**entry, "run_id": entry.get("run_id") or str(uuid4())} for entry in entries]
+    rows: List[Dict[str, Any] | None] = [None] * len(entries)
+    storage.get_runs_dir()
+    context = multiprocessing.get_context("spawn")
+    lost = _run_shared(entries, rows, workers, context, runner)
+    if lost:
+        _run_isolated(entries, lost, rows, workers, context, runner)
+    return [row for row in rows if row is not None]
+
+
+def write_summary(path: Path, rows: List[Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SUMMARY_COLUMNS, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_summary(rows: List[Dict[str, Any]]) -> str:
+    """Plain-text table of the summary rows for the terminal."""
+    cells = [SUMMARY_COLUMNS] + [
+        [str(row.get(column, "")) for column in SUMMARY_COLUMNS] for row in rows
+    ]
+    widths = [max(len(line[index]) for line in cells) for index in range(len(SUMMARY_COLUMNS))]
+    return "\n".join(
+        "  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip()
+        for line in cells
+    )
+
+
+def _batch(args: argparse.Namespace) -> int:
+    entries = load_manifest(Path(args.manifest))
+    rows = run_batch(entries, args.workers)
+    output = Path(args.output) if args.output else (
+        storage.get_runs_dir() / f"batch_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    )
+    write_summary(output, rows)
+    print(format_summary(rows))
+    failed = sum(1 for row in rows if row["status"] != "done")
+    print(f"\n{len(rows) - failed} başarılı, {failed} başarısız. Özet: {output}")
+    return 1 if failed else 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch = commands.add_parser("batch", help="Run every input set in a manifest")
+    batch.add_argument("manifest", help="JSON manifest of input sets")
+    batch.add_argument("--workers", type=int, default=None, help="Processes (default: CPUs)")
+    batch.add_argument("--output", default=None, help="Summary CSV path")
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        return _batch(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import hashlib
 from dataclasses import dataclass
+import inspect
 import json
 from pathlib import Path
 from typing import Dict, List
@@ -10,7 +10,9 @@ from uuid import uuid4
 from core.audit import AuditTrailWriter
 from core.llm import get_default_llm
 from core.models import ArtifactRecord, InputFileRecord, StepRecord
-from core import storage
+from core.progress import STEP_FINISHED, ProgressEvent, RunCancelled, RunContext
+from core.settings import load_settings
+from core import cache, evidence, storage
 
 
 @dataclass
@@ -21,11 +23,7 @@ class RunResult:
 
 
 def _hash_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    return cache.file_digest(path)
 
 
 def _build_input_records(inputs: Dict[str, Path]) -> List[InputFileRecord]:
@@ -38,6 +36,10 @@ def _build_input_records(inputs: Dict[str, Path]) -> List[InputFileRecord]:
     return records
 
 
+def _accepts_context(plugin: object) -> bool:
+    return "context" in inspect.signature(plugin.analyze).parameters
+
+
 class Engine:
     def __init__(self, registry: Dict[str, object] | None = None) -> None:
         from plugins.ticket_triage.plugin import TicketTriagePlugin
@@ -55,27 +57,78 @@ class Engine:
         demo_type: str,
         inputs: Dict[str, Path],
         run_id: str | None = None,
+        context: RunContext | None = None,
     ) -> RunResult:
+        """Run one plugin and record its audit.
+
+        ``context`` carries progress events and the cancel token; a cancelled
+        run keeps its finished steps, is finalized with status ``cancelled``
+        and re-raises :class:`RunCancelled`.
+        """
         if demo_type not in self.registry:
             raise ValueError(f"Unknown demo_type: {demo_type}")
 
-        run_id = run_id or str(uuid4())
+        run_id = run_id or (context.run_id if context else str(uuid4()))
+        context = context or RunContext(run_id)
         input_records = _build_input_records(inputs)
-        self.audit_writer.create_run(run_id, demo_type, input_records)
+        settings = load_settings()
+        session = self.audit_writer.start_session(
+            run_id,
+            demo_type,
+            input_records,
+            checkpoint_seconds=settings.audit_checkpoint_seconds,
+        )
+
+        def record(steps: List[StepRecord]) -> None:
+            # Large evidence lists are spilled once, when a step is first seen.
+            session.append_steps(
+                [
+                    evidence.spill_step(run_id, step, settings.evidence_spill_threshold)
+                    for step in steps
+                    if not session.has_step(step.step_id)
+                ]
+            )
+
+        def record_step(event: ProgressEvent) -> None:
+            # Steps join the in-memory audit as they finish; audit.json is
+            # only rewritten at checkpoints and at finalize.
+            if event.kind == STEP_FINISHED and event.step is not None:
+                record([event.step])
+
+        context.subscribe(record_step)
 
         plugin = self.registry[demo_type]
         try:
-            result = plugin.analyze(inputs=inputs, llm=self.llm, run_id=run_id)
+            context.check()
+            if _accepts_context(plugin):
+                result = plugin.analyze(
+                    inputs=inputs, llm=self.llm, run_id=run_id, context=context
+                )
+            else:
+                result = plugin.analyze(inputs=inputs, llm=self.llm, run_id=run_id)
             if result.recommendations is not None:
                 rec_path = storage.ensure_run_dir(run_id) / "recommendations.json"
                 with rec_path.open("w", encoding="utf-8") as handle:
                     json.dump(result.recommendations, handle, indent=2, ensure_ascii=True)
-            for step in result.steps:
-                self.audit_writer.append_step(run_id, step)
-            self.audit_writer.finalize_run(
-                run_id, result.final_summary, result.artifacts
-            )
+            record(result.steps)
+            session.finalize(result.final_summary, result.artifacts)
             return RunResult(run_id=run_id, summary=result.final_summary, artifacts=result.artifacts)
+        except RunCancelled:
+            record(context.finished_steps)
+            cancelled_step = StepRecord(
+                title="Çalıştırma iptal edildi",
+                action="RUN_CANCELLED",
+                severity="info",
+                evidence=[f"completed_steps={len(context.finished_steps)}"]
+                + [f"rows[{name}]={count}" for name, count in context.rows.items()],
+                decision="Kullanıcı isteğiyle çalışma durduruldu",
+                requires_approval=False,
+                status="cancelled",
+                duration_ms=0,
+            )
+            session.append_step(cancelled_step)
+            session.finalize("Run cancelled", [], status="cancelled")
+            raise
         except Exception as exc:  # pragma: no cover - defensive path
             failed_step = StepRecord(
                 title="Çalıştırma başarısız",
@@ -87,6 +140,7 @@ class Engine:
                 status="failed",
                 duration_ms=0,
             )
-            self.audit_writer.append_step(run_id, failed_step)
-            self.audit_writer.finalize_run(run_id, f"Run failed: {exc}", [])
+            record(context.finished_steps)
+            session.append_step(failed_step)
+            session.finalize(f"Run failed: {exc}", [], status="failed")
             raise
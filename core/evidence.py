@@ -0,0 +1,83 @@
+"""Keep large step evidence out of ``audit.json``.
+
+A step whose evidence list is longer than the spill threshold keeps only a
+sample of its first items; the full list goes to a zstd-compressed Parquet
+file under ``runs/<id>/evidence/`` and the step records its count and the
+file's path relative to the run folder. Pages are read one row group at a
+time, so showing a page does not load the whole list.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core import storage
+from core.models import StepRecord
+
+
+EVIDENCE_DIRNAME = "evidence"
+SAMPLE_SIZE = 20
+ROW_GROUP_SIZE = 10_000
+
+
+def evidence_count(step: StepRecord) -> int:
+    """Total number of evidence items, spilled or not."""
+    return step.evidence_count if step.evidence_ref else len(step.evidence)
+
+
+def evidence_path(run_id: str, step: StepRecord) -> Path | None:
+    if not step.evidence_ref:
+        return None
+    return storage.ensure_run_dir(run_id) / step.evidence_ref
+
+
+def spill_step(run_id: str, step: StepRecord, threshold: int | None) -> StepRecord:
+    """``step`` with its evidence moved to a side file when above ``threshold``.
+
+    Steps at or below the threshold (or with spilling disabled) are returned
+    unchanged.
+    """
+    if threshold is None or len(step.evidence) <= threshold or step.evidence_ref:
+        return step
+    evidence_dir = storage.ensure_run_dir(run_id) / EVIDENCE_DIRNAME
+    evidence_dir.mkdir(parents=True, exist_ok=True)
+    path = evidence_dir / f"{step.step_id}.parquet"
+    table = pa.table({"evidence": pa.array(step.evidence, type=pa.string())})
+    pq.write_table(table, path, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+    return step.model_copy(
+        update={
+            "evidence": step.evidence[:SAMPLE_SIZE],
+            "evidence_count": len(step.evidence),
+            "evidence_ref": f"{EVIDENCE_DIRNAME}/{path.name}",
+        }
+    )
+
+
+def read_evidence(run_id: str, step: StepRecord, offset: int, limit: int) -> List[str]:
+    """Evidence items ``offset`` to ``offset + limit`` of ``step``."""
+    offset = max(0, offset)
+    path = evidence_path(run_id, step)
+    if path is None:
+        return step.evidence[offset : offset + limit]
+    if not path.exists():
+        return []
+
+    parquet = pq.ParquetFile(path)
+    items: List[str] = []
+    group_start = 0
+    end = offset + limit
+    for index in range(parquet.num_row_groups):
+        group_rows = parquet.metadata.row_group(index).num_rows
+        group_end = group_start + group_rows
+        if group_end > offset and group_start < end:
+            column = parquet.read_row_group(index, columns=["evidence"]).column(0)
+            lo = max(offset, group_start) - group_start
+            hi = min(end, group_end) - group_start
+            items.extend(column.slice(lo, hi - lo).to_pylist())
+        if group_end >= end:
+            break
+        group_start = group_end
+    return items
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List
 
@@ -49,3 +50,91 @@ def iter_csv_chunks(
         chunksize=chunksize,
     ):
         yield chunk
+
+
+def _find_record_end(handle, offset: int, parity: int, block_size: int) -> tuple[int, int]:
+    """Return the offset just past the first unquoted newline at/after ``offset``.
+
+    ``parity`` is the number of quote characters before ``offset`` modulo 2.
+    Returns ``(-1, parity)`` when the end of file is reached first.
+    """
+    handle.seek(offset)
+    position = offset
+    while True:
+        block = handle.read(block_size)
+        if not block:
+            return -1, parity
+        start = 0
+        newline = block.find(b"\n", start)
+        while newline != -1:
+            parity = (parity + block.count(b'"', start, newline)) % 2
+            if parity == 0:
+                return position + newline + 1, parity
+            start = newline + 1
+            newline = block.find(b"\n", start)
+        parity = (parity + block.count(b'"', start)) % 2
+        position += len(block)
+
+
+def find_csv_split_points(
+    path: Path,
+    parts: int,
+    block_size: int = 8 * 1024 * 1024,
+) -> List[int]:
+    """Split ``path`` into at most ``parts`` byte ranges on record boundaries.
+
+    The returned offsets start with the first data byte (just past the
+    header) and end with the file size. Newlines inside quoted fields are not
+    treated as boundaries: quote parity is tracked from the start of the file.
+    """
+    size = Path(path).stat().st_size
+    with Path(path).open("rb") as handle:
+        header_end, parity = _find_record_end(handle, 0, 0, block_size)
+        if header_end == -1:
+            return [size, size]
+        boundaries = [header_end]
+        span = size - header_end
+        scanned_to = header_end
+        for index in range(1, parts):
+            target = header_end + span * index // parts
+            if target <= boundaries[-1]:
+                continue
+            # Quote parity is carried forward so every byte is counted once.
+            handle.seek(scanned_to)
+            remaining = target - scanned_to
+            while remaining > 0:
+                block = handle.read(min(block_size, remaining))
+                if not block:
+                    break
+                parity = (parity + block.count(b'"')) % 2
+                remaining -= len(block)
+            boundary, parity = _find_record_end(handle, target, parity, block_size)
+            if boundary == -1 or boundary >= size:
+                break
+            boundaries.append(boundary)
+            scanned_to = boundary
+    boundaries.append(size)
+    return boundaries
+
+
+def read_csv_header(path: Path) -> bytes:
+    with Path(path).open("rb") as handle:
+        header_end, _ = _find_record_end(handle, 0, 0, 1024 * 1024)
+        handle.seek(0)
+        if header_end == -1:
+            return handle.read()
+        return handle.read(header_end)
+
+
+def read_csv_byte_range(
+    path: Path,
+    start: int,
+    end: int,
+    header: bytes,
+    usecols: List[str] | None = None,
+    dtype: Dict[str, str] | None = None,
+) -> pd.DataFrame:
+    with Path(path).open("rb") as handle:
+        handle.seek(start)
+        payload = handle.read(end - start)
+    return pd.read_csv(BytesIO(header + payload), usecols=usecols, dtype=dtype)
@@ -0,0 +1,243 @@
+"""Run ``Engine.run`` in the background so the UI request returns at once.
+
+Jobs go into a queue served by a fixed pool of worker threads. Each job's
+state, including the latest progress event, lives next to its audit in
+``runs/<id>/job.json``, so any page served by the owning process can poll
+it by run id and other processes can read it with :func:`read_job`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict
+from uuid import uuid4
+
+from core import storage
+from core.progress import (
+    ROWS_PROCESSED,
+    CancelToken,
+    ProgressEvent,
+    RunCancelled,
+    RunContext,
+)
+from core.schema import SchemaValidationError
+
+
+JOB_FILENAME = "job.json"
+DEFAULT_WORKERS = 2
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+FINAL_STATUSES = {DONE, FAILED, CANCELLED, INTERRUPTED}
+# Row counts arrive per chunk; job.json is rewritten at most this often for them.
+PROGRESS_WRITE_SECONDS = 0.5
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def get_job_path(run_id: str) -> Path:
+    return storage.ensure_run_dir(run_id) / JOB_FILENAME
+
+
+def read_job(run_id: str) -> Dict[str, Any] | None:
+    path = storage.get_runs_dir() / run_id / JOB_FILENAME
+    if not path.exists():
+        return None
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except json.JSONDecodeError:
+        return None
+
+
+def _write_job(run_id: str, payload: Dict[str, Any]) -> None:
+    path = get_job_path(run_id)
+    # Readers poll this file while it is written; replace it atomically.
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, ensure_ascii=True)
+    os.replace(tmp_path, path)
+
+
+def _default_engine():
+    from core.engine import Engine
+
+    return Engine()
+
+
+class JobManager:
+    """Queue of engine runs executed by at most ``workers`` threads."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        engine_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        self.workers = max(1, workers or DEFAULT_WORKERS)
+        self._engine_factory = engine_factory or _default_engine
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="clarity-job"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._tokens: Dict[str, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        demo_type: str,
+        inputs: Dict[str, Path],
+        run_id: str | None = None,
+    ) -> str:
+        run_id = run_id or str(uuid4())
+        with self._lock:
+            if run_id in self._futures and not self._futures[run_id].done():
+                raise ValueError(f"Job already active: {run_id}")
+            _write_job(
+                run_id,
+                {
+                    "run_id": run_id,
+                    "demo_type": demo_type,
+                    "status": QUEUED,
+                    "submitted_at": _now(),
+                    "started_at": None,
+                    "finished_at": None,
+                    "cancel_requested": False,
+                    "progress": None,
+                    "summary": None,
+                    "error": None,
+                    "messages": [],
+                },
+            )
+            self._tokens[run_id] = CancelToken()
+            self._futures[run_id] = self._pool.submit(
+                self._execute, run_id, demo_type, inputs
+            )
+        return run_id
+
+    def poll(self, run_id: str) -> Dict[str, Any] | None:
+        """Current job state, or ``None`` when ``run_id`` was never submitted.
+
+        An unfinished job this manager does not own (for example one left by
+        a restarted Streamlit server) is reported as ``interrupted``. Only the
+        returned state says so; ``job.json`` is left for its owner to finish.
+        """
+        job = read_job(run_id)
+        if job is None or job["status"] in FINAL_STATUSES:
+            return job
+        with self._lock:
+            tracked = run_id in self._futures
+        if not tracked:
+            job = {**job, "status": INTERRUPTED}
+        return job
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a queued job, or ask a running one to stop.
+
+        A running job stops at the plugin's next cancellation check and is
+        then reported as ``cancelled``. Returns ``True`` when the request was
+        accepted.
+        """
+        with self._lock:
+            future = self._futures.get(run_id)
+            token = self._tokens.get(run_id)
+        if future is None or token is None:
+            return False
+        if future.cancel():
+            self._update(run_id, status=CANCELLED, finished_at=_now())
+            return True
+        job = read_job(run_id)
+        if job is None or job["status"] in FINAL_STATUSES:
+            return False
+        token.cancel()
+        self._update(run_id, cancel_requested=True)
+        return True
+
+    def active_jobs(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._futures.values() if not future.done())
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _update(self, run_id: str, **changes: Any) -> Dict[str, Any]:
+        with self._lock:
+            job = read_job(run_id) or {"run_id": run_id}
+            job.update(changes)
+            _write_job(run_id, job)
+        return job
+
+    def _progress_writer(self, run_id: str):
+        last_write = 0.0
+
+        def on_event(event: ProgressEvent) -> None:
+            nonlocal last_write
+            now = time.monotonic()
+            if event.kind == ROWS_PROCESSED and now - last_write < PROGRESS_WRITE_SECONDS:
+                return
+            last_write = now
+            progress = {
+                "event": event.kind,
+                "action": event.action,
+                "title": event.title,
+                "steps_done": event.steps_done,
+            }
+            if event.kind == ROWS_PROCESSED:
+                progress["rows"] = event.total_rows
+            self._update(run_id, progress=progress)
+
+        return on_event
+
+    def _execute(self, run_id: str, demo_type: str, inputs: Dict[str, Path]) -> None:
+        self._update(run_id, status=RUNNING, started_at=_now())
+        context = RunContext(
+            run_id, subscriber=self._progress_writer(run_id), token=self._tokens[run_id]
+        )
+        try:
+            result = self._engine_factory().run(
+                demo_type, inputs, run_id=run_id, context=context
+            )
+        except RunCancelled:
+            self._update(run_id, status=CANCELLED, finished_at=_now())
+        except SchemaValidationError as exc:
+            self._update(
+                run_id,
+                status=FAILED,
+                finished_at=_now(),
+                error=str(exc),
+                messages=list(exc.messages),
+            )
+        except Exception as exc:
+            self._update(run_id, status=FAILED, finished_at=_now(), error=str(exc))
+        else:
+            self._update(run_id, status=DONE, finished_at=_now(), summary=result.summary)
+
+
+_MANAGER: JobManager | None = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager(workers: int | None = None) -> JobManager:
+    """Process-wide manager, shared by every Streamlit session.
+
+    The pool is rebuilt with a new size once the running jobs have drained.
+    """
+    global _MANAGER
+    size = max(1, workers or DEFAULT_WORKERS)
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = JobManager(size)
+        elif _MANAGER.workers != size and _MANAGER.active_jobs() == 0:
+            _MANAGER.shutdown(wait=False)
+            _MANAGER = JobManager(size)
+        return _MANAGER
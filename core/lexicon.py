@@ -0,0 +1,198 @@
+"""Keyword lexicon for the heuristic category and priority rules.
+
+Each group maps its keywords to a category label and a priority weight.
+The defaults below can be replaced by a ``lexicon.json`` in the project root:
+
+    {"groups": [{"name": "urgent", "category": null, "weight": 2,
+                 "keywords": ["acil", "urgent"]}]}
+
+All keywords are compiled into one regex, so a text is scanned once no
+matter how many keywords the lexicon holds.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+LEXICON_PATH = Path("lexicon.json")
+
+# Python lowers "İ" to "i" plus a combining dot; dropping the dot gives the
+# Turkish "i". Dotless "ı" is merged into "i" so keywords also match English
+# text written in capitals, which Turkish rules would lower to "ı".
+_COMBINING_DOT = "\u0307"
+
+
+@dataclass(frozen=True)
+class KeywordGroup:
+    name: str
+    keywords: Tuple[str, ...]
+    category: str | None = None
+    weight: int = 0
+
+
+DEFAULT_LEXICON = (
+    KeywordGroup(
+        "return", ("iade", "refund", "return"), category="return", weight=2
+    ),
+    KeywordGroup(
+        "delivery", ("kargo", "teslimat", "delivery", "shipping"), category="delivery"
+    ),
+    KeywordGroup(
+        "payment",
+        ("ödeme", "odeme", "para", "payment", "charge"),
+        category="payment",
+        weight=1,
+    ),
+    KeywordGroup("urgent", ("acil", "hemen", "urgent"), weight=2),
+)
+
+
+def fold_text(text: str) -> str:
+    """Lowercase ``text`` with Turkish dotted/dotless i rules."""
+    return text.lower().replace(_COMBINING_DOT, "").replace("ı", "i")
+
+
+def fold_series(texts: pd.Series) -> pd.Series:
+    lowered = texts.str.lower()
+    return lowered.str.replace(_COMBINING_DOT, "", regex=False).str.replace(
+        "ı", "i", regex=False
+    )
+
+
+class KeywordMatcher:
+    """Find which lexicon groups occur in a text with a single regex scan."""
+
+    def __init__(self, groups: Sequence[KeywordGroup]) -> None:
+        if len(groups) > 63:
+            raise ValueError("lexicon supports at most 63 groups")
+        self.groups = tuple(groups)
+        masks: Dict[str, int] = {}
+        for index, group in enumerate(self.groups):
+            for keyword in group.keywords:
+                folded = fold_text(keyword).strip()
+                if folded:
+                    masks[folded] = masks.get(folded, 0) | (1 << index)
+        # The scan takes the longest keyword at each match and does not look
+        # inside it again, so a keyword also stands for every keyword it
+        # contains. Keywords that merely overlap ("para" + "acil") count once.
+        self._masks = {
+            keyword: _contained_mask(keyword, masks) for keyword in masks
+        }
+        alternatives = sorted(masks, key=len, reverse=True)
+        self._pattern = (
+            re.compile("|".join(map(re.escape, alternatives)))
+            if alternatives
+            else None
+        )
+        self._weights = np.array([group.weight for group in self.groups], dtype="int64")
+
+    def mask(self, text: str) -> int:
+        """Bit mask of the groups found in ``text``."""
+        if self._pattern is None or not text:
+            return 0
+        result = 0
+        for keyword in self._pattern.findall(fold_text(text)):
+            result |= self._masks[keyword]
+        return result
+
+    def masks(self, texts: pd.Series) -> np.ndarray:
+        """Group masks for a whole column of strings in one pass.
+
+        Repeated texts are scanned once; missing values get an empty mask.
+        """
+        if self._pattern is None or len(texts) == 0:
+            return np.zeros(len(texts), dtype="int64")
+        codes, uniques = pd.factorize(texts.astype(object))
+        found = fold_series(pd.Series(uniques, dtype=object)).str.findall(self._pattern)
+        lengths = found.str.len().to_numpy(dtype="int64")
+        unique_masks = np.zeros(len(uniques) + 1, dtype="int64")
+        flat = [keyword for keywords in found for keyword in keywords]
+        if flat:
+            rows = np.repeat(np.arange(len(uniques)), lengths)
+            values = np.fromiter(
+                (self._masks[keyword] for keyword in flat), dtype="int64", count=len(flat)
+            )
+            np.bitwise_or.at(unique_masks, rows, values)
+        # Code -1 (missing) picks the trailing empty mask.
+        return unique_masks[codes]
+
+    def score(self, mask: int) -> int:
+        return sum(
+            group.weight
+            for index, group in enumerate(self.groups)
+            if mask >> index & 1
+        )
+
+    def scores(self, masks: np.ndarray) -> np.ndarray:
+        bits = (masks[:, None] >> np.arange(len(self.groups))) & 1
+        return bits @ self._weights
+
+    def category(self, mask: int, default: str = "general") -> str:
+        """Category of the first matching group that has one."""
+        for index, group in enumerate(self.groups):
+            if group.category and mask >> index & 1:
+                return group.category
+        return default
+
+
+def _contained_mask(keyword: str, masks: Dict[str, int]) -> int:
+    result = 0
+    for other, mask in masks.items():
+        if other in keyword:
+            result |= mask
+    return result
+
+
+def parse_lexicon(payload: object) -> List[KeywordGroup]:
+    groups = payload.get("groups") if isinstance(payload, dict) else None
+    if not isinstance(groups, list):
+        raise ValueError("lexicon must contain a 'groups' list")
+    parsed: List[KeywordGroup] = []
+    for item in groups:
+        if not isinstance(item, dict) or not isinstance(item.get("keywords"), list):
+            raise ValueError("each lexicon group needs a 'keywords' list")
+        parsed.append(
+            KeywordGroup(
+                name=str(item.get("name") or f"group{len(parsed)}"),
+                keywords=tuple(str(keyword) for keyword in item["keywords"]),
+                category=str(item["category"]) if item.get("category") else None,
+                weight=int(item.get("weight") or 0),
+            )
+        )
+    return parsed
+
+
+def load_lexicon(path: Path = LEXICON_PATH) -> Sequence[KeywordGroup]:
+    if not path.exists():
+        return DEFAULT_LEXICON
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            return parse_lexicon(json.load(handle))
+    except (OSError, ValueError, TypeError):
+        return DEFAULT_LEXICON
+
+
+_MATCHERS: dict = {}
+
+
+def default_matcher() -> KeywordMatcher:
+    """Matcher for the project lexicon, rebuilt only when the file changes.
+
+    Every call stats the file, so loops should fetch the matcher once.
+    """
+    path = LEXICON_PATH.resolve()
+    key = (str(path), path.stat().st_mtime_ns if path.exists() else None)
+    matcher = _MATCHERS.get(key)
+    if matcher is None:
+        matcher = KeywordMatcher(load_lexicon(path))
+        _MATCHERS.clear()
+        _MATCHERS[key] = matcher
+    return matcher
+
@@ -1,87 +1,441 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
-from typing import Optional
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
 
+from core import lexicon, pii, storage
 from core.settings import load_settings
 
 
-_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
 
-
-def _mask_pii(text: str) -> str:
-    return _EMAIL_RE.sub("[EMAIL_MASKED]", text)
+CATEGORIES = ("return", "delivery", "payment", "general")
+DEFAULT_MODEL = "gpt-3.5-turbo"
+# Bump when a prompt changes so cached answers to the old prompt are ignored.
+PROMPT_VERSIONS = {"categorize": 1, "improve_email": 1}
+LLM_CACHE_FILENAME = "llm_responses.sqlite3"
 
 
 def _heuristic_category(text: str) -> str:
-    lowered = text.lower()
-    if "iade" in lowered or "refund" in lowered or "return" in lowered:
-        return "return"
-    if "kargo" in lowered or "delivery" in lowered or "shipping" in lowered:
-        return "delivery"
-    if "odeme" in lowered or "payment" in lowered or "charge" in lowered:
-        return "payment"
-    return "general"
+    matcher = lexicon.default_matcher()
+    return matcher.category(matcher.mask(text))
+
+
+def _heuristic_categories(texts: Sequence[str]) -> List[str]:
+    """``_heuristic_category`` for each text, looking the lexicon up once."""
+    matcher = lexicon.default_matcher()
+    return [matcher.category(matcher.mask(text)) for text in texts]
+
+
+def _normalize_label(label: object) -> str:
+    value = str(label).strip().lower()
+    return value if value in CATEGORIES else "general"
+
+
+def build_batch_prompt(texts: Sequence[str]) -> str:
+    lines = [
+        "Categorize each numbered customer message into: "
+        + ", ".join(CATEGORIES)
+        + ". Return only a JSON array with one label per message, in order.",
+    ]
+    for index, text in enumerate(texts, start=1):
+        lines.append(f"{index}. " + " ".join(text.split()))
+    return "\n".join(lines)
+
+
+def parse_batch_labels(content: str, expected: int) -> List[str] | None:
+    match = _JSON_ARRAY_RE.search(content or "")
+    if match is None:
+        return None
+    try:
+        labels = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(labels, list) or len(labels) != expected:
+        return None
+    return [_normalize_label(label) for label in labels]
+
+
+class LLMResponseCache:
+    """SQLite store of LLM answers with TTL and least-recently-used eviction.
+
+    Keys hash (operation, model, prompt version, masked text), so only the
+    digest of the masked input and the model's answer are ever written.
+    """
+
+    EVICT_EVERY = 200
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_days: Optional[int] = 30,
+        max_entries: Optional[int] = 100_000,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+            )
+        self.evict()
+
+    @staticmethod
+    def make_key(operation: str, model: str, masked_text: str) -> str:
+        text_hash = hashlib.sha256(masked_text.encode("utf-8")).hexdigest()
+        version = PROMPT_VERSIONS.get(operation, 0)
+        return hashlib.sha256(
+            f"{operation}\0{model}\0{version}\0{text_hash}".encode("utf-8")
+        ).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        if not keys:
+            return {}
+        now = time.time()
+        oldest = now - self.ttl_seconds if self.ttl_seconds else 0.0
+        found: Dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock, self._conn:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                part = unique[start : start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM responses WHERE key IN ({placeholders}) "
+                    "AND created_at >= ?",
+                    (*part, oldest),
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()],
+            )
+            self._writes += len(items)
+            due = self._writes >= self.EVICT_EVERY
+        if due:
+            self.evict()
+
+    def put(self, key: str, value: str) -> None:
+        self.put_many({key: value})
+
+    def evict(self) -> None:
+        with self._lock, self._conn:
+            self._writes = 0
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,),
+                )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """Space calls out evenly so at most ``per_minute`` start per minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.interval = 60.0 / per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 
 class LLMClient:
-    def __init__(self, api_key: Optional[str] = None, use_openai: bool = False) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_openai: bool = False,
+        base_url: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        batch_size: int = 20,
+        max_workers: int = 4,
+        requests_per_minute: Optional[int] = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        cache: Optional[LLMResponseCache] = None,
+    ) -> None:
         self.api_key = api_key
         self.use_openai = use_openai
+        self.base_url = base_url
+        self.model = model
+        self.batch_size = max(batch_size, 1)
+        self.max_workers = max(max_workers, 1)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        self.cache = cache
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @property
+    def online(self) -> bool:
+        return bool(self.api_key and self.use_openai)
+
+    def cache_stats(self) -> Optional[Dict[str, int]]:
+        """Running hit/miss counts, or None while answers are not cached."""
+        if self.cache is None or not self.online:
+            return None
+        with self._stats_lock:
+            return {"hits": self._cache_hits, "misses": self._cache_misses}
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._stats_lock:
+            self._cache_hits += hits
+            self._cache_misses += misses
+
+    def _get_client(self):
+        # One client (and its connection pool) is shared by every request;
+        # the SDK retries 429/5xx/timeouts with backoff up to max_retries.
+        with self._client_lock:
+            if self._client is None:
+                from openai import OpenAI
+
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=self.max_retries,
+                )
+            return self._client
+
+    def _chat(self, messages: List[dict], temperature: float) -> str:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = self._get_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+        )
+        return response.choices[0].message.content or ""
+
+    def _cache_key(self, operation: str, masked_text: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(operation, self.model, masked_text)
+
+    def _cached(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        value = self.cache.get(key)
+        self._count(hits=int(value is not None), misses=int(value is None))
+        return value
 
     def categorize(self, text: str) -> str:
         if not self.api_key or not self.use_openai:
             return _heuristic_category(text)
+        key = self._cache_key("categorize", pii.mask_text(text))
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         try:
-            return self._openai_categorize(text)
+            label = self._openai_categorize(text)
         except Exception:
             return _heuristic_category(text)
+        if key is not None:
+            self.cache.put(key, label)
+        return label
+
+    def categorize_many(self, texts: Sequence[str]) -> List[str]:
+        """Categorize ``texts`` in order, ``batch_size`` messages per request.
+
+        Cached answers are served first. The remaining texts are batched and
+        the batches run concurrently on up to ``max_workers`` threads over the
+        shared client. A batch that fails or returns the wrong number of
+        labels falls back to the offline heuristic, like ``categorize``, and
+        is not cached.
+        """
+        return self.categorize_many_with_sources(texts)[0]
+
+    def categorize_many_with_sources(self, texts: Sequence[str]) -> tuple[List[str], List[str]]:
+        """Like ``categorize_many``, plus each label's source.
+
+        The source is ``"llm"`` for labels the model answered (now or from the
+        cache) and ``"heuristic"`` for offline or fallback guesses.
+        """
+        texts = list(texts)
+        if not self.api_key or not self.use_openai:
+            return _heuristic_categories(texts), ["heuristic"] * len(texts)
+        # Masked once for the whole call; keys and prompts both use it.
+        texts, _ = pii.mask_texts(texts)
+        labels: List[Optional[str]] = [None] * len(texts)
+        sources = ["llm"] * len(texts)
+        keys: List[Optional[str]] = [None] * len(texts)
+        if self.cache is not None:
+            keys = [self._cache_key("categorize", text) for text in texts]
+            found = self.cache.get_many(keys)
+            labels = [found.get(key) for key in keys]
+        pending = [position for position, label in enumerate(labels) if label is None]
+        if self.cache is not None:
+            self._count(hits=len(texts) - len(pending), misses=len(pending))
+
+        batches = [
+            pending[start : start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        batch_texts = [[texts[position] for position in batch] for batch in batches]
+        if len(batches) <= 1 or self.max_workers == 1:
+            results = [self._categorize_batch_safe(batch) for batch in batch_texts]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+                results = list(pool.map(self._categorize_batch_safe, batch_texts))
+
+        fresh: Dict[str, str] = {}
+        for batch, (batch_labels, answered) in zip(batches, results):
+            for position, label in zip(batch, batch_labels):
+                labels[position] = label
+                if not answered:
+                    sources[position] = "heuristic"
+                elif keys[position] is not None:
+                    fresh[keys[position]] = label
+        if fresh:
+            self.cache.put_many(fresh)
+        return labels, sources
+
+    def _categorize_batch_safe(self, texts: List[str]) -> tuple[List[str], bool]:
+        try:
+            labels = self._openai_categorize_batch(texts)
+        except Exception:
+            labels = None
+        if labels is None:
+            return _heuristic_categories(texts), False
+        return labels, True
+
+    def _openai_categorize_batch(self, masked: List[str]) -> List[str] | None:
+        content = self._chat(
+            [
+                {"role": "system", "content": "You are a classifier."},
+                {"role": "user", "content": build_batch_prompt(masked)},
+            ],
+            temperature=0,
+        )
+        return parse_batch_labels(content, len(masked))
 
     def improve_email(self, draft: str) -> str:
         if not self.api_key or not self.use_openai:
             return draft
+        key = self._cache_key("improve_email", pii.mask_text(draft))
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         try:
-            return self._openai_improve_email(draft)
+            improved = self._openai_improve_email(draft)
         except Exception:
             return draft
+        if key is not None:
+            self.cache.put(key, improved)
+        return improved
 
     def _openai_categorize(self, text: str) -> str:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key)
         prompt = (
             "Categorize this customer message into: return, delivery, payment, general. "
             "Return only the label.\nMessage: "
         )
-        masked = _mask_pii(text)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        masked = pii.mask_text(text)
+        content = self._chat(
+            [
                 {"role": "system", "content": "You are a classifier."},
                 {"role": "user", "content": f"{prompt}{masked}"},
             ],
             temperature=0,
         )
-        label = response.choices[0].message.content.strip().lower()
-        return label if label in {"return", "delivery", "payment", "general"} else "general"
+        return _normalize_label(content)
 
     def _openai_improve_email(self, draft: str) -> str:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=self.api_key)
-        masked = _mask_pii(draft)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
+        masked = pii.mask_text(draft)
+        content = self._chat(
+            [
                 {"role": "system", "content": "You improve support emails."},
                 {"role": "user", "content": masked},
             ],
             temperature=0.2,
         )
-        return response.choices[0].message.content.strip()
+        return content.strip()
 
 
 def get_default_llm() -> LLMClient:
     settings = load_settings()
-    return LLMClient(api_key=os.getenv("OPENAI_API_KEY"), use_openai=settings.use_openai)
+    return LLMClient(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        use_openai=settings.use_openai,
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        batch_size=settings.llm_batch_size or 1,
+        max_workers=settings.llm_workers or 1,
+        requests_per_minute=settings.llm_requests_per_minute,
+        cache=_default_cache(settings),
+    )
+
+
+_DEFAULT_CACHES: Dict[tuple, LLMResponseCache] = {}
+
+
+def _default_cache(settings) -> Optional[LLMResponseCache]:
+    if not settings.llm_cache_max_entries:
+        return None
+    path = storage.get_cache_dir() / LLM_CACHE_FILENAME
+    key = (str(path.resolve()), settings.llm_cache_ttl_days, settings.llm_cache_max_entries)
+    cache = _DEFAULT_CACHES.get(key)
+    if cache is None:
+        cache = LLMResponseCache(
+            path,
+            ttl_days=settings.llm_cache_ttl_days,
+            max_entries=settings.llm_cache_max_entries,
+        )
+        _DEFAULT_CACHES[key] = cache
+    return cache
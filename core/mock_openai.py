@@ -0,0 +1,131 @@
+"""OpenAI-compatible chat completions server for offline throughput tests.
+
+Usage: python -m core.mock_openai --port 8765 --latency-ms 100
+Then run the app with OPENAI_BASE_URL=http://127.0.0.1:8765/v1 and any
+OPENAI_API_KEY. Labels come from the offline heuristic.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+from core.llm import _heuristic_category
+
+
+_NUMBERED_RE = re.compile(r"^\d+\. (.*)$")
+
+
+def _reply_for(prompt: str) -> str:
+    lines = prompt.split("\n")
+    if lines[0].startswith("Categorize each numbered"):
+        labels = [
+            _heuristic_category(match.group(1))
+            for match in (_NUMBERED_RE.match(line) for line in lines[1:])
+            if match
+        ]
+        return json.dumps(labels)
+    if "Message: " in prompt:
+        return _heuristic_category(prompt.split("Message: ", 1)[1])
+    return prompt
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], latency_ms: int = 0, fail_every: int = 0):
+        super().__init__(address, _Handler)
+        self.latency_ms = latency_ms
+        self.fail_every = fail_every
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def next_request(self) -> int:
+        with self._count_lock:
+            self.request_count += 1
+            return self.request_count
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockOpenAIServer
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        number = self.server.next_request()
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+        if self.server.fail_every and number % self.server.fail_every == 0:
+            self._send(500, {"error": {"message": "injected failure"}})
+            return
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        messages = payload.get("messages") or [{}]
+        content = _reply_for(str(messages[-1].get("content", "")))
+        self._send(
+            200,
+            {
+                "id": f"chatcmpl-mock-{number}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "mock"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            },
+        )
+
+    def _send(self, status: int, body: dict) -> None:
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+def start_mock_server(
+    port: int = 0, latency_ms: int = 0, fail_every: int = 0
+) -> MockOpenAIServer:
+    """Serve on a background thread; call ``shutdown()`` when done."""
+    server = MockOpenAIServer(("127.0.0.1", port), latency_ms, fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+    server = MockOpenAIServer(("127.0.0.1", args.port), args.latency_ms, args.fail_every)
+    print(f"Mock OpenAI server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
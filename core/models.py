@@ -8,7 +8,10 @@ from pydantic import BaseModel, ConfigDict, Field
 
 
 Severity = Literal["info", "low", "medium", "high"]
-StepStatus = Literal["done", "needs_approval", "applied", "skipped", "failed"]
+StepStatus = Literal[
+    "done", "needs_approval", "applied", "skipped", "failed", "cancelled"
+]
+RunStatus = Literal["done", "failed", "cancelled"]
 
 
 class InputFileRecord(BaseModel):
@@ -39,6 +42,10 @@ class StepRecord(BaseModel):
     requires_approval: bool
     status: StepStatus
     duration_ms: int = 0
+    # Set when the full evidence list was spilled to a side file; ``evidence``
+    # then holds only a sample. See core.evidence.
+    evidence_count: Optional[int] = None
+    evidence_ref: Optional[str] = None
 
 
 class RunAudit(BaseModel):
@@ -52,3 +59,4 @@ class RunAudit(BaseModel):
     steps: List[StepRecord] = Field(default_factory=list)
     final_summary: Optional[str] = None
     artifacts: List[ArtifactRecord] = Field(default_factory=list)
+    status: Optional[RunStatus] = None
@@ -0,0 +1,130 @@
+"""Mask personal data in free text before it leaves the process or is stored.
+
+Every pattern except cards is an alternative of one compiled regex, so a text
+is scanned once for those kinds. Cards get a second pass over what is left:
+a digit run failing the Luhn check must not hide a TCKN or phone inside it.
+Texts without a digit or "@" cannot contain any of the patterns and are
+skipped; texts without "@" use a variant without the email alternative, which
+is the expensive one.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+
+PII_KINDS = ("email", "iban", "card", "tckn", "phone", "order")
+
+_PATTERNS = {
+    "email": r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "iban": r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){3,7}(?: ?[A-Z0-9]{1,3})?\b",
+    "card": r"(?<![\d-])(?:\d[ -]?){12,18}\d(?![\d-])",
+    "tckn": r"(?<!\d)[1-9]\d{10}(?!\d)",
+    "phone": (
+        r"(?<![\w+])(?:\+\d{1,3}[ .-]?)?(?:\(?0?\d{3}\)?[ .-]?)\d{3}[ .-]?\d{2}[ .-]?\d{2}(?!\d)"
+    ),
+    "order": r"(?i:\b(?:ord|sip|order|sipari[sş])\s*(?:no|numaras[ıi])?\s*[-:#_ ]?\s*\d{3,}\b)",
+}
+
+
+_FIRST_CHARS = r"(?=[\d+(A-ZoOsS])"
+# Emails can only start where a run of address characters reaching "@" starts.
+_EMAIL_START = r"(?<![A-Za-z0-9._%+-])(?=[A-Za-z0-9._%+-]+@)"
+
+
+def _compile(kinds: Tuple[str, ...], guard: str) -> re.Pattern:
+    # The leading guard rejects most positions with one cheap test before
+    # any alternative is tried.
+    alternatives = "|".join(f"(?P<{kind}>{_PATTERNS[kind]})" for kind in kinds)
+    return re.compile(f"{guard}(?:{alternatives})")
+
+
+# Alternation order decides overlaps: longer, checksummed numbers win first.
+_SINGLE_PASS_KINDS = tuple(kind for kind in PII_KINDS if kind != "card")
+_PII_RE = _compile(_SINGLE_PASS_KINDS, f"(?:{_EMAIL_START}|{_FIRST_CHARS})")
+_PII_NO_EMAIL_RE = _compile(_SINGLE_PASS_KINDS[1:], _FIRST_CHARS)
+_CARD_RE = _compile(("card",), r"(?=\d)")
+_CANDIDATE_RE = re.compile(r"[\d@]")
+
+
+def mask_token(kind: str) -> str:
+    return f"[{kind.upper()}_MASKED]"
+
+
+_TOKENS = {kind: mask_token(kind) for kind in PII_KINDS}
+
+
+def _luhn_valid(digits: str) -> bool:
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if index % 2:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+def _tckn_valid(digits: str) -> bool:
+    values = [ord(char) - 48 for char in digits]
+    odd = sum(values[0:9:2])
+    even = sum(values[1:8:2])
+    return (odd * 7 - even) % 10 == values[9] and sum(values[:10]) % 10 == values[10]
+
+
+def _replacer(counts: Counter):
+    def replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "card" and not _luhn_valid(text.replace(" ", "").replace("-", "")):
+            return text
+        if kind == "tckn" and not _tckn_valid(text):
+            return text
+        counts[kind] += 1
+        return _TOKENS[kind]
+
+    return replace
+
+
+def _mask(text: str, replace) -> str:
+    masked = (_PII_RE if "@" in text else _PII_NO_EMAIL_RE).sub(replace, text)
+    return _CARD_RE.sub(replace, masked)
+
+
+def mask_text(text: str, counts: Counter | None = None) -> str:
+    """``text`` with every recognised PII match replaced by a kind token."""
+    if not text or _CANDIDATE_RE.search(text) is None:
+        return text
+    return _mask(text, _replacer(Counter() if counts is None else counts))
+
+
+def mask_texts(texts: Iterable[str]) -> Tuple[List[str], Dict[str, int]]:
+    """Mask a batch of texts; returns the texts and matches per kind."""
+    counts: Counter = Counter()
+    replace = _replacer(counts)
+    search = _CANDIDATE_RE.search
+    masked = [
+        _mask(text, replace) if text and search(text) is not None else text
+        for text in texts
+    ]
+    return masked, {kind: counts[kind] for kind in PII_KINDS}
+
+
+def mask_series(values: pd.Series) -> Tuple[pd.Series, Dict[str, int]]:
+    """Mask a text column; missing values and the column dtype are kept."""
+    present = values.notna().to_numpy()
+    strings = values[present].astype(object).map(str)
+    masked, counts = mask_texts(strings.tolist())
+    result = values.astype(object).copy()
+    result[present] = masked
+    if isinstance(values.dtype, pd.StringDtype):
+        result = result.astype(values.dtype)
+    return result, counts
+
+
+def count_evidence(counts: Dict[str, int]) -> List[str]:
+    return [f"pii_masked[{kind}]={counts.get(kind, 0)}" for kind in PII_KINDS]
@@ -0,0 +1,131 @@
+"""Progress events and cooperative cancellation for a single run.
+
+The engine hands a :class:`RunContext` to the plugin. The plugin reports
+step boundaries and processed rows through it, and calls :meth:`RunContext.check`
+between chunks so a cancelled run stops at the next safe point.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+from core.models import StepRecord
+
+
+STEP_STARTED = "step_started"
+STEP_FINISHED = "step_finished"
+ROWS_PROCESSED = "rows_processed"
+
+
+class RunCancelled(Exception):
+    """Raised inside a run once its cancel token is set."""
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class ProgressEvent:
+    kind: str
+    run_id: str
+    action: str | None = None
+    title: str | None = None
+    rows: int = 0
+    total_rows: int = 0
+    steps_done: int = 0
+    step: StepRecord | None = None
+    timestamp: float = field(default_factory=time.time)
+
+
+Subscriber = Callable[[ProgressEvent], None]
+
+
+class _StepLog(list):
+    """Step list that reports every appended step as finished."""
+
+    def __init__(self, context: "RunContext") -> None:
+        super().__init__()
+        self._context = context
+
+    def append(self, step: StepRecord) -> None:
+        super().append(step)
+        self._context.step_finished(step)
+
+
+class RunContext:
+    """Event sink and cancel token shared by the engine and one plugin run.
+
+    Calls may come from several loader threads at once.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        subscriber: Subscriber | None = None,
+        token: CancelToken | None = None,
+    ) -> None:
+        self.run_id = run_id
+        self.subscribers: List[Subscriber] = [subscriber] if subscriber else []
+        self.token = token or CancelToken()
+        self.finished_steps: List[StepRecord] = []
+        self.rows: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def check(self) -> None:
+        if self.token.cancelled:
+            raise RunCancelled(self.run_id)
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.append(subscriber)
+
+    def step_log(self) -> List[StepRecord]:
+        """A list for the plugin's steps; ``append`` emits ``step_finished``."""
+        return _StepLog(self)
+
+    def step_started(self, action: str, title: str | None = None) -> None:
+        self.check()
+        self._emit(ProgressEvent(STEP_STARTED, self.run_id, action=action, title=title))
+
+    def step_finished(self, step: StepRecord) -> None:
+        with self._lock:
+            self.finished_steps.append(step)
+        self._emit(
+            ProgressEvent(
+                STEP_FINISHED, self.run_id, action=step.action, title=step.title, step=step
+            )
+        )
+
+    def rows_processed(self, action: str, rows: int) -> None:
+        """Count ``rows`` more rows for ``action``, then honour cancellation."""
+        with self._lock:
+            self.rows[action] = self.rows.get(action, 0) + rows
+            total = self.rows[action]
+        self._emit(
+            ProgressEvent(
+                ROWS_PROCESSED, self.run_id, action=action, rows=rows, total_rows=total
+            )
+        )
+        self.check()
+
+    def _emit(self, event: ProgressEvent) -> None:
+        if not self.subscribers:
+            return
+        with self._lock:
+            event.steps_done = len(self.finished_steps)
+        for subscriber in self.subscribers:
+            subscriber(event)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
 import re
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List
 
+import numpy as np
 import pandas as pd
 
+from core import cache
 from core import io as io_utils
 from core import storage
 from core.settings import Settings, load_settings
@@ -17,6 +22,8 @@ from core.settings import Settings, load_settings
 class InputSchema:
     required: Dict[str, str]
     optional: Dict[str, str]
+    # Storage dtype hints for string columns; unhinted ones are sampled.
+    storage: Dict[str, str] = field(default_factory=dict)
 
     def all_columns(self) -> Dict[str, str]:
         return {**self.required, **self.optional}
@@ -36,6 +43,13 @@ SCHEMAS: Dict[str, Dict[str, InputSchema]] = {
                 "order_id": "string",
                 "amount": "number",
             },
+            storage={
+                "ticket_id": "string",
+                "channel": "category",
+                "customer_text": "string",
+                "category": "category",
+                "order_id": "string",
+            },
         )
     },
     "edoc": {
@@ -52,6 +66,7 @@ SCHEMAS: Dict[str, Dict[str, InputSchema]] = {
                 "dn_id": "string",
             },
             optional={},
+            storage={"invoice_id": "string", "vendor": "category"},
         ),
         "purchase_orders": InputSchema(
             required={
@@ -72,6 +87,18 @@ SCHEMAS: Dict[str, Dict[str, InputSchema]] = {
 }
 
 
+MAX_ERROR_MESSAGES = 20
+MAX_ISSUE_ROWS = 5
+MAX_ISSUE_SAMPLES = 3
+# Files smaller than this are not worth the process start-up cost.
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+PARTITIONS_PER_WORKER = 2
+# Unhinted string columns whose sampled distinct/non-null ratio is at or
+# below this are stored as category.
+CATEGORY_MAX_RATIO = 0.5
+CARDINALITY_SAMPLE_SIZE = 10_000
+
+
 class SchemaValidationError(ValueError):
     def __init__(self, messages: List[str]) -> None:
         super().__init__("\n".join(messages))
@@ -232,16 +259,17 @@ def apply_mapping(df: pd.DataFrame, mapping: Dict[str, str] | None) -> pd.DataFr
     return df
 
 
-def _check_numeric(series: pd.Series) -> bool:
-    converted = pd.to_numeric(series, errors="coerce")
-    invalid = converted.isna() & series.notna() & series.astype(str).str.strip().ne("")
-    return not invalid.any()
-
-
-def _check_date(series: pd.Series) -> bool:
-    converted = pd.to_datetime(series, errors="coerce")
-    invalid = converted.isna() & series.notna() & series.astype(str).str.strip().ne("")
-    return not invalid.any()
+def _invalid_cells(original: pd.Series, converted: pd.Series) -> pd.Series | None:
+    candidates = converted.isna() & original.notna()
+    if not candidates.any():
+        return None
+    # Only cells that failed conversion are stripped, instead of copying the
+    # whole column through astype(str).
+    candidate_values = original[candidates].astype(str).str.strip()
+    invalid = candidate_values.ne("")
+    if not invalid.any():
+        return None
+    return candidate_values[invalid]
 
 
 def validate_columns(
@@ -265,18 +293,293 @@ def validate_columns(
         raise SchemaValidationError(messages)
 
 
-def validate_types(df: pd.DataFrame, schema: InputSchema) -> None:
-    messages: List[str] = []
-    for col, col_type in schema.all_columns().items():
-        if col not in df.columns:
-            continue
-        if col_type == "number" and not _check_numeric(df[col]):
-            messages.append(f"Şu kolonda sayı bekleniyordu: {col}")
-        if col_type == "date" and not _check_date(df[col]):
-            messages.append(f"Şu kolonda tarih bekleniyordu: {col}")
+TYPE_LABELS = {"number": "sayı", "date": "tarih"}
+
+# Day-first variants come before anything month-first: inputs are Turkish.
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d.%m.%Y",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+)
+MIXED_DATE_FORMAT = "mixed"
+DATE_SAMPLE_SIZE = 200
+
+
+def detect_date_format(series: pd.Series) -> str | None:
+    sample = series.dropna().astype(str).str.strip()
+    sample = sample[sample.ne("")].drop_duplicates().head(DATE_SAMPLE_SIZE)
+    if sample.empty:
+        return None
+    best_format, best_count = MIXED_DATE_FORMAT, 0
+    for date_format in DATE_FORMATS:
+        parsed = pd.to_datetime(sample, format=date_format, errors="coerce")
+        count = int(parsed.notna().sum())
+        if count == len(sample):
+            return date_format
+        if count > best_count:
+            best_format, best_count = date_format, count
+    return best_format
+
+
+def _to_datetime(values: pd.Index, date_format: str) -> pd.DatetimeIndex:
+    if date_format[:2] == "%d" and date_format[3:8] == "%m" + date_format[2] + "%Y":
+        # strptime-style parsing is slow for day-first formats; reorder the
+        # date part into ISO so pandas can use its fast ISO 8601 parser.
+        separator = re.escape(date_format[2])
+        rewritten = values.str.replace(
+            rf"^(\d{{2}}){separator}(\d{{2}}){separator}(\d{{4}})", r"\3-\2-\1", regex=True
+        )
+        parsed = pd.DatetimeIndex(
+            pd.to_datetime(rewritten, format="%Y-%m-%d" + date_format[8:], errors="coerce")
+        )
+        if parsed.isna().any():
+            failed = parsed.isna()
+            retried = pd.DatetimeIndex(
+                pd.to_datetime(values[failed], format=date_format, errors="coerce")
+            )
+            values_out = parsed.to_numpy().copy()
+            values_out[failed] = retried.to_numpy().astype(values_out.dtype)
+            parsed = pd.DatetimeIndex(values_out)
+        return parsed
+    return pd.DatetimeIndex(pd.to_datetime(values, format=date_format, errors="coerce"))
+
+
+def _parse_unique_dates(values: pd.Index, date_format: str) -> np.ndarray:
+    formats = [date_format] if date_format != MIXED_DATE_FORMAT else []
+    formats += [fmt for fmt in DATE_FORMATS if fmt != date_format]
+    remaining = np.ones(len(values), dtype=bool)
+    result: np.ndarray | None = None
+    for fmt in formats + [MIXED_DATE_FORMAT]:
+        if result is not None and not remaining.any():
+            break
+        parsed = _to_datetime(values[remaining], fmt)
+        if parsed.tz is not None:
+            parsed = parsed.tz_convert(None)
+        if result is None:
+            result = np.full(len(values), np.datetime64("NaT"), dtype=parsed.dtype)
+        positions = np.flatnonzero(remaining)[parsed.notna()]
+        result[positions] = parsed[parsed.notna()].to_numpy().astype(result.dtype)
+        remaining[positions] = False
+    return result
+
+
+def parse_dates(series: pd.Series, date_format: str | None) -> pd.Series:
+    """Parse ``series`` once per distinct value using ``date_format`` first.
+
+    Values that do not match fall back to the other known formats and finally
+    to pandas' per-element parser, so only the odd ones pay the slow path.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = pd.Index(uniques).astype(str).str.strip()
+    parsed = _parse_unique_dates(uniques, date_format or MIXED_DATE_FORMAT)
+    values = np.append(parsed, np.array(["NaT"], dtype=parsed.dtype))[codes]
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def date_format_evidence(df: pd.DataFrame, prefix: str = "") -> List[str]:
+    formats = df.attrs.get("date_formats", {})
+    return [f"{prefix}date_format[{col}]={fmt}" for col, fmt in formats.items()]
 
-    if messages:
-        raise SchemaValidationError(messages)
+
+@dataclass
+class TypeIssue:
+    column: str
+    col_type: str
+    count: int
+    rows: List[int]
+    samples: List[str]
+
+    def message(self, locate: bool = False, chunk_index: int | None = None) -> str:
+        text = f"Şu kolonda {TYPE_LABELS[self.col_type]} bekleniyordu: {self.column}"
+        if not locate:
+            return text
+        # Chunk frames keep the reader's running index, so row labels are
+        # 0-based data row offsets within the whole file.
+        location = f"satır {self.rows[0] + 1}, hatalı değer sayısı {self.count}"
+        if chunk_index is not None:
+            location = f"parça {chunk_index + 1}, " + location
+        if len(self.rows) > 1:
+            location += ", satırlar " + ", ".join(str(row + 1) for row in self.rows)
+        location += ", örnek: " + ", ".join(repr(value) for value in self.samples)
+        return f"{text} ({location})"
+
+
+def choose_string_storage(series: pd.Series) -> str:
+    sample = series.dropna().head(CARDINALITY_SAMPLE_SIZE)
+    if sample.empty:
+        return "string"
+    if sample.nunique() / len(sample) <= CATEGORY_MAX_RATIO:
+        return "category"
+    return "string"
+
+
+def _numeric_storage(col: str, values: pd.Series) -> pd.Series:
+    """Amounts are always Float64; only ``*_count`` columns stay Int64.
+
+    Narrow integer types are never used: sums of whole-number amounts would
+    wrap around and a fractional correction could not be written back.
+    """
+    if pd.api.types.is_integer_dtype(values.dtype) and not col.endswith("_count"):
+        return values.astype("Float64")
+    return values
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed chunks, keeping category columns categorical.
+
+    Chunks carry different category sets, which plain ``pd.concat`` would
+    widen to object; those columns are joined with ``union_categoricals``.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    columns = list(frames[0].columns)
+    categorical = [
+        col
+        for col in columns
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    df = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for col in categorical:
+        df[col] = pd.api.types.union_categoricals([frame[col] for frame in frames])
+    df = df[columns]
+    df.attrs = dict(frames[-1].attrs)
+    return df
+
+
+def memory_evidence(df: pd.DataFrame, name: str | None = None) -> List[str]:
+    label = f"memory_mb[{name}]" if name else "memory_mb"
+    megabytes = df.memory_usage(index=False, deep=True).sum() / (1024 * 1024)
+    return [f"{label}={megabytes:.2f}"]
+
+
+@dataclass
+class ValidationPlan:
+    rename_map: Dict[str, str]
+    typed_columns: List[tuple[str, str]]
+    string_columns: List[str] = field(default_factory=list)
+    storage_hints: Dict[str, str] = field(default_factory=dict)
+
+    def map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        rename_map = {
+            actual: expected
+            for actual, expected in self.rename_map.items()
+            if actual in df.columns
+        }
+        if rename_map:
+            return df.rename(columns=rename_map)
+        return df
+
+    def execute(
+        self,
+        df: pd.DataFrame,
+        convert: bool = True,
+        date_formats: Dict[str, str] | None = None,
+    ) -> tuple[pd.DataFrame, List[TypeIssue]]:
+        """Convert every typed column once and collect the cells that failed.
+
+        Converted columns are written back into ``df`` only when no column
+        failed, so a rejected frame is returned untouched. ``date_formats``
+        carries the per-column formats detected on earlier chunks of the same
+        file and is filled in as new date columns are seen.
+        """
+        if date_formats is None:
+            date_formats = {}
+        converted: Dict[str, pd.Series] = {}
+        issues: List[TypeIssue] = []
+        for col, col_type in self.typed_columns:
+            if col not in df.columns:
+                continue
+            if col_type == "number":
+                result = pd.to_numeric(df[col], errors="coerce")
+            else:
+                if col not in date_formats:
+                    detected = detect_date_format(df[col])
+                    if detected is not None:
+                        date_formats[col] = detected
+                result = parse_dates(df[col], date_formats.get(col))
+            invalid = _invalid_cells(df[col], result)
+            if invalid is not None:
+                issues.append(
+                    TypeIssue(
+                        column=col,
+                        col_type=col_type,
+                        count=len(invalid),
+                        rows=[int(row) for row in invalid.index[:MAX_ISSUE_ROWS]],
+                        samples=list(dict.fromkeys(invalid.tolist()))[:MAX_ISSUE_SAMPLES],
+                    )
+                )
+            elif convert:
+                converted[col] = result
+        if issues or not converted:
+            return df, issues
+        for col, values in converted.items():
+            df[col] = values
+        return df, issues
+
+    def compact(self, df: pd.DataFrame, storage_types: Dict[str, str]) -> pd.DataFrame:
+        """Store repetitive string columns as category and fix numeric dtypes.
+
+        ``storage_types`` is shared by the chunks of one file: a column's
+        storage is decided on the first chunk that has it and reused after.
+        """
+        for col in self.string_columns:
+            if col not in df.columns:
+                continue
+            if col not in storage_types:
+                storage_types[col] = self.storage_hints.get(col) or choose_string_storage(
+                    df[col]
+                )
+            if storage_types[col] == "category":
+                df[col] = df[col].astype("category")
+        for col, col_type in self.typed_columns:
+            if col_type == "number" and col in df.columns:
+                df[col] = _numeric_storage(col, df[col])
+        return df
+
+
+_PLAN_CACHE: Dict[tuple, ValidationPlan] = {}
+
+
+def compile_validation_plan(
+    schema: InputSchema, mapping: Dict[str, str] | None = None
+) -> ValidationPlan:
+    columns = schema.all_columns()
+    key = (
+        tuple(columns.items()),
+        tuple(sorted(schema.storage.items())),
+        tuple(sorted((mapping or {}).items(), key=lambda item: item[0])),
+    )
+    plan = _PLAN_CACHE.get(key)
+    if plan is None:
+        rename_map = {
+            actual: expected
+            for expected, actual in (mapping or {}).items()
+            if actual
+        }
+        typed_columns = [
+            (col, col_type) for col, col_type in columns.items() if col_type in TYPE_LABELS
+        ]
+        plan = ValidationPlan(
+            rename_map=rename_map,
+            typed_columns=typed_columns,
+            string_columns=[col for col, col_type in columns.items() if col_type == "string"],
+            storage_hints=dict(schema.storage),
+        )
+        _PLAN_CACHE[key] = plan
+    return plan
+
+
+def validate_types(df: pd.DataFrame, schema: InputSchema) -> None:
+    _, issues = compile_validation_plan(schema).execute(df, convert=False)
+    if issues:
+        raise SchemaValidationError([issue.message() for issue in issues])
 
 
 def _build_dtype_map(
@@ -303,16 +606,11 @@ def load_mapping(run_id: str) -> Dict[str, Dict[str, str]]:
     return payload if isinstance(payload, dict) else {}
 
 
-def load_csv_with_schema(
+def _resolve_usecols(
     path: Path,
     schema: InputSchema,
-    mapping: Dict[str, str] | None = None,
-    settings: Settings | None = None,
-) -> pd.DataFrame:
-    settings = settings or load_settings()
-    if mapping == {}:
-        mapping = None
-
+    mapping: Dict[str, str] | None,
+) -> List[str]:
     header = pd.read_csv(path, nrows=0)
     available_columns = list(header.columns)
     validate_columns(available_columns, schema, mapping)
@@ -327,45 +625,255 @@ def load_csv_with_schema(
             optional_actual.append(actual)
 
     usecols = [col for col in required_actual + optional_actual if col]
-    usecols = list(dict.fromkeys(usecols))
+    return list(dict.fromkeys(usecols))
+
+
+def iter_csv_with_schema(
+    path: Path,
+    schema: InputSchema,
+    mapping: Dict[str, str] | None = None,
+    settings: Settings | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield mapped, validated and type-converted chunks of ``path``.
+
+    Only one chunk is held at a time. When a chunk fails type validation the
+    generator stops yielding but keeps checking the remaining chunks, then
+    raises a single ``SchemaValidationError`` covering the whole file.
+    """
+    settings = settings or load_settings()
+    if mapping == {}:
+        mapping = None
+    chunk_size = chunk_size or settings.chunk_size
+
+    usecols = _resolve_usecols(path, schema, mapping)
     dtype_map = _build_dtype_map(schema, mapping, usecols)
+    plan = compile_validation_plan(schema, mapping)
 
-    if settings.chunk_size:
-        frames = []
-        for chunk in io_utils.iter_csv_chunks(
+    errors: List[str] = []
+    date_formats: Dict[str, str] = {}
+    storage_types: Dict[str, str] = {}
+    for chunk_index, chunk in enumerate(
+        io_utils.iter_csv_chunks(
             path,
             usecols=usecols,
             dtype=dtype_map,
             nrows=settings.max_rows,
-            chunksize=settings.chunk_size,
-        ):
-            chunk = apply_mapping(chunk, mapping)
-            validate_types(chunk, schema)
-            for col, col_type in schema.all_columns().items():
-                if col not in chunk.columns:
-                    continue
-                if col_type == "number":
-                    chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
-                if col_type == "date":
-                    chunk[col] = pd.to_datetime(chunk[col], errors="coerce")
-            frames.append(chunk)
-        if not frames:
-            return pd.DataFrame(columns=schema.all_columns().keys())
-        return pd.concat(frames, ignore_index=True)
+            chunksize=chunk_size,
+        )
+    ):
+        chunk = plan.map_columns(chunk)
+        chunk, issues = plan.execute(chunk, convert=not errors, date_formats=date_formats)
+        if issues:
+            location = chunk_index if chunk_size else None
+            errors.extend(
+                issue.message(locate=True, chunk_index=location) for issue in issues
+            )
+            continue
+        if errors:
+            continue
+        chunk = plan.compact(chunk, storage_types)
+        chunk.attrs["date_formats"] = dict(date_formats)
+        yield chunk
+
+    if errors:
+        _raise_collected(errors)
+
 
-    df = io_utils.read_csv_safely(
+def _raise_collected(errors: List[str]) -> None:
+    if len(errors) > MAX_ERROR_MESSAGES:
+        hidden = len(errors) - MAX_ERROR_MESSAGES
+        errors = errors[:MAX_ERROR_MESSAGES] + [f"... ve {hidden} hata daha"]
+    raise SchemaValidationError(errors)
+
+
+def _parse_partition(
+    path: Path,
+    start: int,
+    end: int,
+    header: bytes,
+    usecols: List[str],
+    dtype_map: Dict[str, str],
+    schema: InputSchema,
+    mapping: Dict[str, str] | None,
+    date_formats: Dict[str, str],
+    storage_types: Dict[str, str],
+) -> tuple[pd.DataFrame, List[TypeIssue], Dict[str, str]]:
+    plan = compile_validation_plan(schema, mapping)
+    chunk = io_utils.read_csv_byte_range(path, start, end, header, usecols, dtype_map)
+    chunk = plan.map_columns(chunk)
+    chunk, issues = plan.execute(chunk, date_formats=date_formats)
+    if not issues:
+        chunk = plan.compact(chunk, storage_types)
+    return chunk, issues, date_formats
+
+
+def load_csv_parallel(
+    path: Path,
+    schema: InputSchema,
+    mapping: Dict[str, str] | None,
+    settings: Settings,
+    workers: int,
+    on_chunk: Callable[[pd.DataFrame], None] | None = None,
+) -> pd.DataFrame:
+    """Parse byte ranges of one CSV in worker processes and join them in order.
+
+    Date formats are detected on the head of the file so every partition
+    parses the same way. Type errors name the partition ("parça") and the
+    row within it.
+    """
+    if mapping == {}:
+        mapping = None
+    usecols = _resolve_usecols(path, schema, mapping)
+    dtype_map = _build_dtype_map(schema, mapping, usecols)
+    plan = compile_validation_plan(schema, mapping)
+
+    date_formats: Dict[str, str] = {}
+    storage_types: Dict[str, str] = {}
+    head = pd.read_csv(
         path,
         usecols=usecols,
         dtype=dtype_map,
-        nrows=settings.max_rows,
+        nrows=max(DATE_SAMPLE_SIZE, CARDINALITY_SAMPLE_SIZE),
     )
-    df = apply_mapping(df, mapping)
-    validate_types(df, schema)
-    for col, col_type in schema.all_columns().items():
-        if col not in df.columns:
-            continue
-        if col_type == "number":
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-        if col_type == "date":
-            df[col] = pd.to_datetime(df[col], errors="coerce")
+    head = plan.map_columns(head)
+    plan.execute(head, convert=False, date_formats=date_formats)
+    plan.compact(head, storage_types)
+
+    header = io_utils.read_csv_header(path)
+    boundaries = io_utils.find_csv_split_points(path, workers * PARTITIONS_PER_WORKER)
+    max_rows = settings.max_rows
+
+    frames: List[pd.DataFrame] = []
+    errors: List[str] = []
+    row_count = 0
+    # spawn keeps workers independent of the caller's threads (Streamlit).
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    ranges = enumerate(zip(boundaries, boundaries[1:]))
+    futures: deque = deque()
+
+    def _submit_next() -> None:
+        partition = next(ranges, None)
+        if partition is None:
+            return
+        index, (start, end) = partition
+        futures.append(
+            (
+                index,
+                pool.submit(
+                    _parse_partition,
+                    path,
+                    start,
+                    end,
+                    header,
+                    usecols,
+                    dtype_map,
+                    schema,
+                    mapping,
+                    dict(date_formats),
+                    storage_types,
+                ),
+            )
+        )
+
+    try:
+        # Only ``workers`` partitions are in flight, so a row limit reached
+        # early stops the parsing of the rest.
+        for _ in range(workers):
+            _submit_next()
+        while futures:
+            index, future = futures.popleft()
+            chunk, issues, formats = future.result()
+            remaining = max_rows - row_count if max_rows else None
+            last = remaining is not None and len(chunk) >= remaining
+            if not last:
+                _submit_next()
+            if issues and remaining is not None and len(chunk) > remaining:
+                # The limit falls inside this partition; only its head counts.
+                issues = [issue for issue in issues if issue.rows[0] < remaining]
+                if not issues:
+                    chunk, issues = plan.execute(
+                        chunk.head(remaining).copy(), date_formats=formats
+                    )
+                    if not issues:
+                        chunk = plan.compact(chunk, storage_types)
+            if issues:
+                errors.extend(
+                    issue.message(locate=True, chunk_index=index) for issue in issues
+                )
+                if last:
+                    break
+                continue
+            if errors:
+                continue
+            for col, fmt in formats.items():
+                date_formats.setdefault(col, fmt)
+            if remaining is not None:
+                chunk = chunk.head(remaining)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            frames.append(chunk)
+            row_count += len(chunk)
+            if max_rows and row_count >= max_rows:
+                break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    if errors:
+        _raise_collected(errors)
+    if not frames:
+        df = pd.DataFrame(columns=schema.all_columns().keys())
+    else:
+        df = concat_frames(frames)
+    df.attrs["date_formats"] = dict(date_formats)
+    return df
+
+
+def load_csv_with_schema(
+    path: Path,
+    schema: InputSchema,
+    mapping: Dict[str, str] | None = None,
+    settings: Settings | None = None,
+    on_chunk: Callable[[pd.DataFrame], None] | None = None,
+) -> pd.DataFrame:
+    """Load ``path`` as a typed frame, from the parsed-input cache when possible.
+
+    ``on_chunk`` sees every typed chunk as it is produced (the whole frame on
+    a cache hit), so callers can compute side results without a second read.
+    """
+    settings = settings or load_settings()
+    if mapping == {}:
+        mapping = None
+
+    cache_key = None
+    if settings.cache_max_mb:
+        cache_key = cache.parsed_cache_key(
+            cache.file_digest(path),
+            schema.all_columns(),
+            mapping,
+            settings.max_rows,
+        )
+        cached = cache.load_parsed(cache_key)
+        if cached is not None:
+            if on_chunk is not None:
+                on_chunk(cached)
+            return cached
+
+    workers = settings.parse_workers
+    if workers and workers > 1 and Path(path).stat().st_size >= PARALLEL_MIN_BYTES:
+        df = load_csv_parallel(path, schema, mapping, settings, workers, on_chunk)
+    else:
+        frames = []
+        for chunk in iter_csv_with_schema(path, schema, mapping, settings):
+            if on_chunk is not None:
+                on_chunk(chunk)
+            frames.append(chunk)
+        if not frames:
+            df = pd.DataFrame(columns=schema.all_columns().keys())
+        else:
+            df = concat_frames(frames)
+
+    if cache_key is not None:
+        cache.store_parsed(cache_key, df, settings.cache_max_mb * 1024 * 1024)
     return df
@@ -14,6 +14,23 @@ class Settings:
     chunk_size: int | None = None
     ttl_days: int | None = None
     use_openai: bool = False
+    vectorized_rules: bool = True
+    cache_max_mb: int | None = 2048
+    load_workers: int | None = None
+    parse_workers: int | None = None
+    duplicate_memory_mb: int | None = None
+    llm_batch_size: int | None = 20
+    llm_workers: int | None = 4
+    llm_requests_per_minute: int | None = None
+    llm_cache_ttl_days: int | None = 30
+    llm_cache_max_entries: int | None = 100_000
+    classifier_min_confidence: int | None = 80
+    cluster_similarity: int | None = 60
+    cluster_representatives: bool = False
+    draft_llm_improve: bool = False
+    job_workers: int | None = 2
+    audit_checkpoint_seconds: int | None = 30
+    evidence_spill_threshold: int | None = 1000
 
 
 def load_settings() -> Settings:
@@ -28,7 +45,9 @@ def load_settings() -> Settings:
     if not isinstance(payload, dict):
         return Settings()
 
-    def _get_int(name: str) -> int | None:
+    def _get_int(name: str, default: int | None = None) -> int | None:
+        if name not in payload:
+            return default
         value = payload.get(name)
         if value is None:
             return None
@@ -38,17 +57,34 @@ def load_settings() -> Settings:
             return None
         return value if value > 0 else None
 
-    def _get_bool(name: str) -> bool:
+    def _get_bool(name: str, default: bool = False) -> bool:
         value = payload.get(name)
         if isinstance(value, bool):
             return value
-        return False
+        return default
 
     return Settings(
         max_rows=_get_int("max_rows"),
         chunk_size=_get_int("chunk_size"),
         ttl_days=_get_int("ttl_days"),
         use_openai=_get_bool("use_openai"),
+        vectorized_rules=_get_bool("vectorized_rules", default=True),
+        cache_max_mb=_get_int("cache_max_mb", default=2048),
+        load_workers=_get_int("load_workers"),
+        parse_workers=_get_int("parse_workers"),
+        duplicate_memory_mb=_get_int("duplicate_memory_mb"),
+        llm_batch_size=_get_int("llm_batch_size", default=20),
+        llm_workers=_get_int("llm_workers", default=4),
+        llm_requests_per_minute=_get_int("llm_requests_per_minute"),
+        llm_cache_ttl_days=_get_int("llm_cache_ttl_days", default=30),
+        llm_cache_max_entries=_get_int("llm_cache_max_entries", default=100_000),
+        classifier_min_confidence=_get_int("classifier_min_confidence", default=80),
+        cluster_similarity=_get_int("cluster_similarity", default=60),
+        cluster_representatives=_get_bool("cluster_representatives"),
+        draft_llm_improve=_get_bool("draft_llm_improve"),
+        job_workers=_get_int("job_workers", default=2),
+        audit_checkpoint_seconds=_get_int("audit_checkpoint_seconds", default=30),
+        evidence_spill_threshold=_get_int("evidence_spill_threshold", default=1000),
     )
 
 
@@ -58,6 +94,23 @@ def save_settings(settings: Settings) -> None:
         "chunk_size": settings.chunk_size,
         "ttl_days": settings.ttl_days,
         "use_openai": settings.use_openai,
+        "vectorized_rules": settings.vectorized_rules,
+        "cache_max_mb": settings.cache_max_mb,
+        "load_workers": settings.load_workers,
+        "parse_workers": settings.parse_workers,
+        "duplicate_memory_mb": settings.duplicate_memory_mb,
+        "llm_batch_size": settings.llm_batch_size,
+        "llm_workers": settings.llm_workers,
+        "llm_requests_per_minute": settings.llm_requests_per_minute,
+        "llm_cache_ttl_days": settings.llm_cache_ttl_days,
+        "llm_cache_max_entries": settings.llm_cache_max_entries,
+        "classifier_min_confidence": settings.classifier_min_confidence,
+        "cluster_similarity": settings.cluster_similarity,
+        "cluster_representatives": settings.cluster_representatives,
+        "draft_llm_improve": settings.draft_llm_improve,
+        "job_workers": settings.job_workers,
+        "audit_checkpoint_seconds": settings.audit_checkpoint_seconds,
+        "evidence_spill_threshold": settings.evidence_spill_threshold,
     }
     with SETTINGS_PATH.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, ensure_ascii=True)
@@ -1,16 +1,31 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
+from uuid import uuid4
 
 from core.models import RunAudit
 
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies.
+    fcntl = None
+
 
 INDEX_FILENAME = "index.json"
+INDEX_LOCK_FILENAME = "index.lock"
+AUDIT_LOG_FILENAME = "audit.log.jsonl"
 RUNS_DIRNAME = "runs"
+CACHE_DIRNAME = "_cache"
+MODELS_DIRNAME = "_models"
+
+_INDEX_LOCK = threading.Lock()
 
 
 def _project_root() -> Path:
@@ -23,6 +38,18 @@ def get_runs_dir() -> Path:
     return runs_dir
 
 
+def get_cache_dir() -> Path:
+    cache_dir = get_runs_dir() / CACHE_DIRNAME
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_models_dir() -> Path:
+    models_dir = get_runs_dir() / MODELS_DIRNAME
+    models_dir.mkdir(parents=True, exist_ok=True)
+    return models_dir
+
+
 def ensure_run_dir(run_id: str) -> Path:
     run_dir = get_runs_dir() / run_id
     (run_dir / "artifacts").mkdir(parents=True, exist_ok=True)
@@ -33,6 +60,10 @@ def get_audit_path(run_id: str) -> Path:
     return ensure_run_dir(run_id) / "audit.json"
 
 
+def get_audit_log_path(run_id: str) -> Path:
+    return ensure_run_dir(run_id) / AUDIT_LOG_FILENAME
+
+
 def _index_path() -> Path:
     return get_runs_dir() / INDEX_FILENAME
 
@@ -45,10 +76,32 @@ def load_index() -> List[Dict[str, Any]]:
         return json.load(handle)
 
 
+@contextmanager
+def _locked_index() -> Iterator[None]:
+    """Hold while reading, changing and saving the index.
+
+    Threads share the module lock; processes (batch workers, a second
+    server) take an exclusive ``flock`` on ``runs/index.lock``.
+    """
+    with _INDEX_LOCK:
+        if fcntl is None:
+            yield
+            return
+        with (get_runs_dir() / INDEX_LOCK_FILENAME).open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
 def save_index(entries: List[Dict[str, Any]]) -> None:
+    """Replace the index atomically, so readers never see a partial file."""
     index_path = _index_path()
-    with index_path.open("w", encoding="utf-8") as handle:
+    temp_path = index_path.with_name(f"{index_path.name}.{uuid4().hex}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
         json.dump(entries, handle, indent=2, ensure_ascii=True)
+    os.replace(temp_path, index_path)
 
 
 def upsert_index_entry(
@@ -57,29 +110,30 @@ def upsert_index_entry(
     started_at: datetime,
     finished_at: datetime | None = None,
 ) -> None:
-    entries = load_index()
-    updated = False
-    for entry in entries:
-        if entry.get("run_id") == run_id:
-            entry.update(
+    with _locked_index():
+        entries = load_index()
+        updated = False
+        for entry in entries:
+            if entry.get("run_id") == run_id:
+                entry.update(
+                    {
+                        "demo_type": demo_type,
+                        "started_at": started_at.isoformat(),
+                        "finished_at": finished_at.isoformat() if finished_at else None,
+                    }
+                )
+                updated = True
+                break
+        if not updated:
+            entries.append(
                 {
+                    "run_id": run_id,
                     "demo_type": demo_type,
                     "started_at": started_at.isoformat(),
                     "finished_at": finished_at.isoformat() if finished_at else None,
                 }
             )
-            updated = True
-            break
-    if not updated:
-        entries.append(
-            {
-                "run_id": run_id,
-                "demo_type": demo_type,
-                "started_at": started_at.isoformat(),
-                "finished_at": finished_at.isoformat() if finished_at else None,
-            }
-        )
-    save_index(entries)
+        save_index(entries)
 
 
 def list_runs() -> List[Dict[str, Any]]:
@@ -92,18 +146,18 @@ def list_runs() -> List[Dict[str, Any]]:
 
 
 def load_run(run_id: str) -> RunAudit:
-    audit_path = get_audit_path(run_id)
-    with audit_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-    return RunAudit.model_validate(payload)
+    from core.audit import load_audit
+
+    return load_audit(run_id)
 
 
 def delete_run(run_id: str) -> None:
     run_dir = get_runs_dir() / run_id
     if run_dir.exists():
         shutil.rmtree(run_dir)
-    entries = [entry for entry in load_index() if entry.get("run_id") != run_id]
-    save_index(entries)
+    with _locked_index():
+        entries = [entry for entry in load_index() if entry.get("run_id") != run_id]
+        save_index(entries)
 
 
 def clear_runs() -> None:
@@ -111,7 +165,8 @@ def clear_runs() -> None:
     if runs_dir.exists():
         shutil.rmtree(runs_dir)
     runs_dir.mkdir(parents=True, exist_ok=True)
-    save_index([])
+    with _locked_index():
+        save_index([])
 
 
 def _parse_timestamp(value: str | None) -> datetime | None:
@@ -127,19 +182,20 @@ def cleanup_old_runs(ttl_days: int) -> None:
     if ttl_days <= 0:
         return
     threshold = datetime.now(timezone.utc).timestamp() - (ttl_days * 86400)
-    entries = load_index()
-    remaining: List[Dict[str, Any]] = []
-    for entry in entries:
-        finished = _parse_timestamp(entry.get("finished_at"))
-        started = _parse_timestamp(entry.get("started_at"))
-        timestamp = finished or started
-        if timestamp and timestamp.timestamp() < threshold:
-            run_id = entry.get("run_id")
-            if run_id:
-                run_dir = get_runs_dir() / run_id
-                if run_dir.exists():
-                    shutil.rmtree(run_dir)
-            continue
-        remaining.append(entry)
-    if remaining != entries:
-        save_index(remaining)
+    with _locked_index():
+        entries = load_index()
+        remaining: List[Dict[str, Any]] = []
+        for entry in entries:
+            finished = _parse_timestamp(entry.get("finished_at"))
+            started = _parse_timestamp(entry.get("started_at"))
+            timestamp = finished or started
+            if timestamp and timestamp.timestamp() < threshold:
+                run_id = entry.get("run_id")
+                if run_id:
+                    run_dir = get_runs_dir() / run_id
+                    if run_dir.exists():
+                        shutil.rmtree(run_dir)
+                continue
+            remaining.append(entry)
+        if remaining != entries:
+            save_index(remaining)
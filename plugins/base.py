@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict, List
 
 from core.models import ArtifactRecord, StepRecord
+from core.progress import RunContext
 
 
 @dataclass
@@ -22,7 +23,14 @@ class BasePlugin(ABC):
     expected_inputs: List[str]
 
     @abstractmethod
-    def analyze(self, inputs: Dict[str, Path], llm, run_id: str) -> AnalysisResult:
+    def analyze(
+        self,
+        inputs: Dict[str, Path],
+        llm,
+        run_id: str,
+        context: RunContext | None = None,
+    ) -> AnalysisResult:
+        """Run the checks; report progress and honour cancellation via ``context``."""
         raise NotImplementedError
 
     @abstractmethod
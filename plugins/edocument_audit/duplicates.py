@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+def hash_ids(values: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+
+
+class HashedDuplicateTracker:
+    """Find repeated IDs from 64-bit hashes collected chunk by chunk.
+
+    Only eight bytes per ID are kept while the stream is read. Hash matches
+    are candidates; ``duplicates`` confirms them on the real values so a
+    collision can never produce a false finding.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: List[np.ndarray] = []
+
+    def add(self, values: pd.Series) -> None:
+        self._hashes.append(hash_ids(values.dropna()))
+
+    def candidate_hashes(self) -> np.ndarray:
+        if not self._hashes:
+            return np.empty(0, dtype="uint64")
+        hashes = np.sort(np.concatenate(self._hashes))
+        repeated = hashes[1:][hashes[1:] == hashes[:-1]]
+        return np.unique(repeated)
+
+    def duplicates(self, values: pd.Series) -> List[str]:
+        candidates = self.candidate_hashes()
+        if candidates.size == 0:
+            return []
+        values = values.dropna()
+        subset = values[np.isin(hash_ids(values), candidates)].astype(str)
+        return sorted(subset[subset.duplicated()].unique().tolist())
+
+
+class SpillingDuplicateDetector:
+    """Find repeated IDs by hash-partitioning them into temporary bucket files.
+
+    IDs are buffered in memory up to a quarter of ``memory_budget_bytes`` and
+    then appended to one of ``partitions`` bucket files. ``duplicates`` reads
+    the buckets back one at a time; a bucket that would not fit in the budget
+    is split again with a different hash key before it is loaded.
+
+    The budget covers this detector only; the caller's frames are not counted.
+    """
+
+    # Rough in-memory cost of one short ID inside a pandas object column.
+    BYTES_PER_ID_IN_MEMORY = 100
+    MAX_DEPTH = 4
+
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        partitions: int = 64,
+        directory: Path | None = None,
+    ) -> None:
+        self.memory_budget_bytes = memory_budget_bytes
+        self.partitions = partitions
+        self._dir = Path(tempfile.mkdtemp(prefix="dup-", dir=directory))
+        self._buffers: List[List[str]] = [[] for _ in range(partitions)]
+        self._buffered_bytes = 0
+        self.spilled_bytes = 0
+
+    def add(self, values: pd.Series) -> None:
+        values = values.dropna().astype(str)
+        if values.empty:
+            return
+        buckets = hash_ids(values) % np.uint64(self.partitions)
+        order = np.argsort(buckets, kind="stable")
+        sorted_values = values.to_numpy()[order]
+        bucket_ids, starts = np.unique(buckets[order], return_index=True)
+        ends = list(starts[1:]) + [len(order)]
+        for bucket, start, end in zip(bucket_ids.tolist(), starts.tolist(), ends):
+            chunk = sorted_values[start:end].tolist()
+            self._buffers[bucket].extend(chunk)
+            self._buffered_bytes += len(chunk) * self.BYTES_PER_ID_IN_MEMORY
+        if self._buffered_bytes * 4 > self.memory_budget_bytes:
+            self._flush()
+
+    def duplicates(self, values: pd.Series | None = None) -> List[str]:
+        self._flush()
+        found: List[str] = []
+        try:
+            for bucket in range(self.partitions):
+                found.extend(self._bucket_duplicates(self._bucket_path(bucket), depth=1))
+        finally:
+            self.close()
+        return sorted(found)
+
+    def close(self) -> None:
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _bucket_path(self, bucket: int, prefix: str = "bucket") -> Path:
+        return self._dir / f"{prefix}-{bucket:04d}.bin"
+
+    def _flush(self) -> None:
+        for bucket, buffered in enumerate(self._buffers):
+            if buffered:
+                self.spilled_bytes += _append_ids(self._bucket_path(bucket), buffered)
+                self._buffers[bucket] = []
+        self._buffered_bytes = 0
+
+    def _bucket_duplicates(self, path: Path, depth: int) -> List[str]:
+        if not path.exists():
+            return []
+        size = path.stat().st_size
+        estimated_ids = max(size // 16, 1)
+        fits = estimated_ids * self.BYTES_PER_ID_IN_MEMORY <= self.memory_budget_bytes
+        if fits or depth >= self.MAX_DEPTH:
+            values = pd.Series(_read_ids(path), dtype=object)
+            path.unlink()
+            return values[values.duplicated()].unique().tolist()
+
+        # Too large for the budget: re-partition with a depth-specific key.
+        hash_key = f"dup-partition-{depth:02d}"
+        prefix = f"{path.stem}-{depth}"
+        with path.open("rb") as handle:
+            while True:
+                block = handle.read(max(self.memory_budget_bytes // 4, 1))
+                if not block:
+                    break
+                while not block.endswith(b"\0"):
+                    extra = handle.read(1)
+                    if not extra:
+                        break
+                    block += extra
+                values = pd.Series(block.rstrip(b"\0").decode("utf-8").split("\0"))
+                buckets = pd.util.hash_pandas_object(
+                    values, index=False, hash_key=hash_key
+                ).to_numpy() % np.uint64(self.partitions)
+                for bucket in np.unique(buckets).tolist():
+                    _append_ids(
+                        self._bucket_path(bucket, prefix),
+                        values[buckets == bucket].tolist(),
+                    )
+        path.unlink()
+        found: List[str] = []
+        for bucket in range(self.partitions):
+            found.extend(
+                self._bucket_duplicates(self._bucket_path(bucket, prefix), depth + 1)
+            )
+        return found
+
+
+def _append_ids(path: Path, values: List[str]) -> int:
+    payload = "\0".join(values).encode("utf-8") + b"\0"
+    with path.open("ab") as handle:
+        handle.write(payload)
+    return len(payload)
+
+
+def _read_ids(path: Path) -> List[str]:
+    data = path.read_bytes()
+    if not data:
+        return []
+    return data.rstrip(b"\0").decode("utf-8").split("\0")
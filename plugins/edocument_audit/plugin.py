@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import json
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 import pandas as pd
 from reportlab.lib import colors
@@ -11,13 +14,17 @@ from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
-from core import io as io_utils
 from core import storage
 from core.models import ArtifactRecord, StepRecord
+from core.progress import RunContext
 from core import schema
 from core.settings import load_settings
 from plugins.base import AnalysisResult, BasePlugin
-from plugins.edocument_audit import rules
+from plugins.edocument_audit import rules, vectorized_rules
+from plugins.edocument_audit.duplicates import (
+    HashedDuplicateTracker,
+    SpillingDuplicateDetector,
+)
 
 
 class EDocumentAuditPlugin(BasePlugin):
@@ -25,7 +32,14 @@ class EDocumentAuditPlugin(BasePlugin):
     description = "Audit e-Documents with rule checks and 3-way match."
     expected_inputs = ["invoices", "purchase_orders", "delivery_notes"]
 
-    def analyze(self, inputs: Dict[str, Path], llm, run_id: str) -> AnalysisResult:
+    def analyze(
+        self,
+        inputs: Dict[str, Path],
+        llm,
+        run_id: str,
+        context: RunContext | None = None,
+    ) -> AnalysisResult:
+        context = context or RunContext(run_id)
         for required in self.expected_inputs:
             if required not in inputs:
                 raise ValueError(f"Eksik girdi: {required}")
@@ -34,53 +48,60 @@ class EDocumentAuditPlugin(BasePlugin):
         artifacts_dir = run_dir / "artifacts"
         artifacts_dir.mkdir(parents=True, exist_ok=True)
 
-        steps: List[StepRecord] = []
+        steps: List[StepRecord] = context.step_log()
         issues: List[rules.Issue] = []
         recommendations: List[dict] = []
 
         settings = load_settings()
+        rule_set = vectorized_rules if settings.vectorized_rules else rules
+        context.step_started("LOAD_INPUTS", "Girdiler yüklendi")
         start = time.monotonic()
         mapping = schema.load_mapping(run_id)
-        invoices = schema.load_csv_with_schema(
-            inputs["invoices"],
-            schema.get_input_schema("edoc", "invoices"),
-            mapping.get("invoices"),
-            settings,
-        )
-        purchase_orders = schema.load_csv_with_schema(
-            inputs["purchase_orders"],
-            schema.get_input_schema("edoc", "purchase_orders"),
-            mapping.get("purchase_orders"),
-            settings,
-        )
-        delivery_notes = schema.load_csv_with_schema(
-            inputs["delivery_notes"],
-            schema.get_input_schema("edoc", "delivery_notes"),
-            mapping.get("delivery_notes"),
-            settings,
-        )
-        steps.append(
-            StepRecord(
-                title="Girdiler yüklendi",
-                action="LOAD_INPUTS",
-                severity="info",
-                evidence=[
-                    f"invoices={len(invoices)}",
-                    f"purchase_orders={len(purchase_orders)}",
-                    f"delivery_notes={len(delivery_notes)}",
-                ],
-                decision="Girdiler başarıyla yüklendi",
-                requires_approval=False,
-                status="done",
-                duration_ms=int((time.monotonic() - start) * 1000),
+        duplicate_tracker = self._duplicate_tracker(settings)
+        try:
+            loaded, load_timings = self._load_inputs(
+                inputs, mapping, settings, duplicate_tracker, context
             )
-        )
-
-        start = time.monotonic()
-        if settings.chunk_size:
-            duplicate_ids = self._find_duplicates_chunked(
-                inputs["invoices"], mapping.get("invoices"), settings
+            invoices = loaded["invoices"]
+            purchase_orders = loaded["purchase_orders"]
+            delivery_notes = loaded["delivery_notes"]
+            steps.append(
+                StepRecord(
+                    title="Girdiler yüklendi",
+                    action="LOAD_INPUTS",
+                    severity="info",
+                    evidence=[
+                        f"invoices={len(invoices)}",
+                        f"purchase_orders={len(purchase_orders)}",
+                        f"delivery_notes={len(delivery_notes)}",
+                    ]
+                    + [f"load_ms[{name}]={ms}" for name, ms in load_timings.items()]
+                    + [
+                        item
+                        for name in ("invoices", "purchase_orders", "delivery_notes")
+                        for item in schema.memory_evidence(loaded[name], name)
+                    ]
+                    + schema.date_format_evidence(invoices, prefix="invoices."),
+                    decision="Girdiler başarıyla yüklendi",
+                    requires_approval=False,
+                    status="done",
+                    duration_ms=int((time.monotonic() - start) * 1000),
+                )
             )
+
+            context.step_started("DUPLICATE_CHECK", "Mükerrer fatura kontrolü")
+            start = time.monotonic()
+            if isinstance(duplicate_tracker, SpillingDuplicateDetector):
+                # Fed from the invoice chunks only; the column is not needed.
+                duplicate_ids = duplicate_tracker.duplicates()
+            elif duplicate_tracker is not None:
+                duplicate_ids = duplicate_tracker.duplicates(invoices["invoice_id"])
+        finally:
+            # The spill directory must go even when the run stops before
+            # duplicates() (error or cancellation); close() is idempotent.
+            if isinstance(duplicate_tracker, SpillingDuplicateDetector):
+                duplicate_tracker.close()
+        if duplicate_tracker is not None:
             duplicate_issues = [
                 rules.Issue(
                     issue_id=f"dup-{invoice_id}",
@@ -92,7 +113,7 @@ class EDocumentAuditPlugin(BasePlugin):
                 for invoice_id in duplicate_ids
             ]
         else:
-            duplicate_issues = rules.find_duplicate_invoices(invoices)
+            duplicate_issues = rule_set.find_duplicate_invoices(invoices)
         issues.extend(duplicate_issues)
         steps.append(
             StepRecord(
@@ -107,8 +128,9 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         )
 
+        context.step_started("TOTAL_CHECK", "Toplam hesap kontrolü")
         start = time.monotonic()
-        total_issues, total_fixes = rules.find_total_mismatch(invoices)
+        total_issues, total_fixes = rule_set.find_total_mismatch(invoices)
         issues.extend(total_issues)
         for fix in total_fixes:
             recommendations.append(
@@ -134,8 +156,9 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         )
 
+        context.step_started("VAT_CHECK", "KDV hesap kontrolü")
         start = time.monotonic()
-        vat_issues, vat_fixes = rules.find_vat_mismatch(invoices)
+        vat_issues, vat_fixes = rule_set.find_vat_mismatch(invoices)
         issues.extend(vat_issues)
         for fix in vat_fixes:
             recommendations.append(
@@ -159,8 +182,9 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         )
 
+        context.step_started("LINK_CHECK", "PO/DN varlık kontrolü")
         start = time.monotonic()
-        missing_links = rules.find_missing_po_dn(
+        missing_links = rule_set.find_missing_po_dn(
             invoices, purchase_orders, delivery_notes
         )
         issues.extend(missing_links)
@@ -177,8 +201,9 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         )
 
+        context.step_started("THREE_WAY_MATCH", "3 taraflı mutabakat")
         start = time.monotonic()
-        three_way_issues = rules.find_three_way_mismatch(
+        three_way_issues = rule_set.find_three_way_mismatch(
             invoices, purchase_orders, delivery_notes
         )
         issues.extend(three_way_issues)
@@ -197,10 +222,11 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         )
 
-        allowed_vendors = self._load_vendors(inputs.get("vendors"))
+        allowed_vendors = loaded["vendors"]
         if allowed_vendors is not None:
+            context.step_started("VENDOR_CHECK", "Tedarikçi doğrulama")
             start = time.monotonic()
-            vendor_issues = rules.find_unapproved_vendors(invoices, allowed_vendors)
+            vendor_issues = rule_set.find_unapproved_vendors(invoices, allowed_vendors)
             issues.extend(vendor_issues)
             steps.append(
                 StepRecord(
@@ -219,10 +245,11 @@ class EDocumentAuditPlugin(BasePlugin):
                 )
             )
 
-        allowed_rates = self._load_allowed_rates(inputs.get("allowed_vat_rates"))
+        allowed_rates = loaded["allowed_vat_rates"]
         if allowed_rates is not None:
+            context.step_started("VAT_RATE_CHECK", "KDV oranı doğrulama")
             start = time.monotonic()
-            rate_issues = rules.find_disallowed_vat_rates(invoices, allowed_rates)
+            rate_issues = rule_set.find_disallowed_vat_rates(invoices, allowed_rates)
             issues.extend(rate_issues)
             steps.append(
                 StepRecord(
@@ -241,6 +268,7 @@ class EDocumentAuditPlugin(BasePlugin):
                 )
             )
 
+        context.check()
         issues_df = pd.DataFrame([issue.__dict__ for issue in issues])
         issues_path = artifacts_dir / "issues.csv"
         issues_df.to_csv(issues_path, index=False)
@@ -325,30 +353,78 @@ class EDocumentAuditPlugin(BasePlugin):
             )
         return {"counts_by_severity": counts, "top_issues": top}
 
-    def _find_duplicates_chunked(
+    @staticmethod
+    def _duplicate_tracker(
+        settings,
+    ) -> HashedDuplicateTracker | SpillingDuplicateDetector | None:
+        """Detector fed while the invoices load; ``None`` means check the frame.
+
+        ``duplicate_memory_mb`` bounds the detector only. The invoices frame
+        itself is still loaded whole for the other checks.
+        """
+        if settings.duplicate_memory_mb:
+            return SpillingDuplicateDetector(
+                settings.duplicate_memory_mb * 1024 * 1024,
+                directory=storage.get_cache_dir(),
+            )
+        if not settings.chunk_size:
+            return None
+        return HashedDuplicateTracker()
+
+    def _load_inputs(
         self,
-        path: Path,
-        mapping: Dict[str, str] | None,
+        inputs: Dict[str, Path],
+        mapping: Dict[str, Dict[str, str]],
         settings,
-    ) -> List[str]:
-        invoice_col = mapping.get("invoice_id") if mapping else "invoice_id"
-        seen = set()
-        duplicates = set()
-        for chunk in io_utils.iter_csv_chunks(
-            path,
-            usecols=[invoice_col],
-            dtype={invoice_col: "string"},
-            nrows=settings.max_rows,
-            chunksize=settings.chunk_size,
-        ):
-            if invoice_col not in chunk.columns:
-                continue
-            for value in chunk[invoice_col].dropna().astype(str):
-                if value in seen:
-                    duplicates.add(value)
-                else:
-                    seen.add(value)
-        return sorted(duplicates)
+        duplicate_tracker: HashedDuplicateTracker | SpillingDuplicateDetector | None = None,
+        context: RunContext | None = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        tasks: Dict[str, Callable[[], Any]] = {
+            name: partial(
+                schema.load_csv_with_schema,
+                inputs[name],
+                schema.get_input_schema("edoc", name),
+                mapping.get(name),
+                settings,
+            )
+            for name in self.expected_inputs
+        }
+        def _on_chunk(name: str, chunk: pd.DataFrame) -> None:
+            if name == "invoices" and duplicate_tracker is not None:
+                # Duplicate IDs are hashed as the invoice chunks stream past,
+                # so the file is read only once.
+                duplicate_tracker.add(chunk["invoice_id"])
+            if context is not None:
+                context.rows_processed(name, len(chunk))
+
+        if duplicate_tracker is not None or context is not None:
+            for name in self.expected_inputs:
+                tasks[name] = partial(tasks[name], on_chunk=partial(_on_chunk, name))
+        tasks["vendors"] = partial(self._load_vendors, inputs.get("vendors"))
+        tasks["allowed_vat_rates"] = partial(
+            self._load_allowed_rates, inputs.get("allowed_vat_rates")
+        )
+
+        def _timed(task: Callable[[], Any]) -> Tuple[Any, int]:
+            task_start = time.monotonic()
+            value = task()
+            return value, int((time.monotonic() - task_start) * 1000)
+
+        # Threads rather than processes: the CSV parser releases the GIL and
+        # the typed frames would otherwise have to be pickled back.
+        workers = settings.load_workers or min(len(tasks), os.cpu_count() or 1)
+        results: Dict[str, Any] = {}
+        timings: Dict[str, int] = {}
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="edoc-load")
+        try:
+            futures = {name: pool.submit(_timed, task) for name, task in tasks.items()}
+            for name, future in futures.items():
+                results[name], elapsed_ms = future.result()
+                if name in self.expected_inputs or inputs.get(name) is not None:
+                    timings[name] = elapsed_ms
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return results, timings
 
     def _load_vendors(self, path: Path | None) -> List[str] | None:
         if path is None:
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from plugins.edocument_audit.rules import (
+    TOLERANCE,
+    FixRecommendation,
+    Issue,
+    find_duplicate_invoices,
+    normalize_rate,
+)
+
+__all__ = [
+    "find_duplicate_invoices",
+    "find_total_mismatch",
+    "find_vat_mismatch",
+    "find_missing_po_dn",
+    "find_three_way_mismatch",
+    "find_unapproved_vendors",
+    "find_disallowed_vat_rates",
+]
+
+
+# round(x, 2) moves a value by at most half a cent; anything closer than this
+# margin to the tolerance is re-checked with the exact row-wise arithmetic.
+_ROUNDING_MARGIN = 0.006
+
+
+def _float_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df.columns:
+        return np.zeros(len(df), dtype="float64")
+    values = pd.to_numeric(df[column], errors="coerce")
+    return values.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _str_values(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(["None"] * len(df), index=df.index, dtype=object)
+    return df[column].astype("string").fillna("<NA>").astype(object)
+
+
+def find_total_mismatch(df: pd.DataFrame) -> Tuple[List[Issue], List[FixRecommendation]]:
+    issues: List[Issue] = []
+    fixes: List[FixRecommendation] = []
+    subtotal = _float_values(df, "subtotal")
+    vat_amount = _float_values(df, "vat_amount")
+    total = _float_values(df, "total")
+    with np.errstate(invalid="ignore"):
+        candidates = np.abs(total - (subtotal + vat_amount)) > TOLERANCE - _ROUNDING_MARGIN
+    positions = np.flatnonzero(candidates)
+    if positions.size == 0:
+        return issues, fixes
+
+    invoice_ids = _str_values(df, "invoice_id").to_numpy()[positions].tolist()
+    for invoice_id, row_subtotal, row_vat, row_total in zip(
+        invoice_ids,
+        subtotal[positions].tolist(),
+        vat_amount[positions].tolist(),
+        total[positions].tolist(),
+    ):
+        expected_total = round(row_subtotal + row_vat, 2)
+        if abs(row_total - expected_total) <= TOLERANCE:
+            continue
+        issues.append(
+            Issue(
+                issue_id=f"total-{invoice_id}",
+                invoice_id=invoice_id,
+                severity="medium",
+                rule="TOTAL_MISMATCH",
+                details=f"toplam={row_total} beklenen={expected_total}",
+                suggested_fix=f"Toplamı {expected_total} olarak düzelt",
+            )
+        )
+        fixes.append(
+            FixRecommendation(
+                invoice_id=invoice_id,
+                field="total",
+                suggested_value=expected_total,
+                reason="subtotal + vat_amount",
+            )
+        )
+    return issues, fixes
+
+
+def find_vat_mismatch(df: pd.DataFrame) -> Tuple[List[Issue], List[FixRecommendation]]:
+    issues: List[Issue] = []
+    fixes: List[FixRecommendation] = []
+    subtotal = _float_values(df, "subtotal")
+    vat_rate = _float_values(df, "vat_rate")
+    vat_amount = _float_values(df, "vat_amount")
+    with np.errstate(invalid="ignore"):
+        candidates = np.abs(vat_amount - subtotal * vat_rate) > TOLERANCE - _ROUNDING_MARGIN
+    positions = np.flatnonzero(candidates)
+    if positions.size == 0:
+        return issues, fixes
+
+    invoice_ids = _str_values(df, "invoice_id").to_numpy()[positions].tolist()
+    for invoice_id, row_subtotal, row_rate, row_vat in zip(
+        invoice_ids,
+        subtotal[positions].tolist(),
+        vat_rate[positions].tolist(),
+        vat_amount[positions].tolist(),
+    ):
+        expected_vat = round(row_subtotal * row_rate, 2)
+        if abs(row_vat - expected_vat) <= TOLERANCE:
+            continue
+        issues.append(
+            Issue(
+                issue_id=f"vat-{invoice_id}",
+                invoice_id=invoice_id,
+                severity="medium",
+                rule="VAT_MISMATCH",
+                details=f"kdv_tutarı={row_vat} beklenen={expected_vat}",
+                suggested_fix=f"KDV tutarını {expected_vat} olarak düzelt",
+            )
+        )
+        fixes.append(
+            FixRecommendation(
+                invoice_id=invoice_id,
+                field="vat_amount",
+                suggested_value=expected_vat,
+                reason="subtotal * vat_rate",
+            )
+        )
+    return issues, fixes
+
+
+def find_missing_po_dn(
+    invoices: pd.DataFrame, purchase_orders: pd.DataFrame, delivery_notes: pd.DataFrame
+) -> List[Issue]:
+    invoice_ids = _str_values(invoices, "invoice_id")
+    po_values = _str_values(invoices, "po_id")
+    dn_values = _str_values(invoices, "dn_id")
+    missing_po = (po_values != "") & ~po_values.isin(purchase_orders["po_id"].astype(str))
+    missing_dn = (dn_values != "") & ~dn_values.isin(delivery_notes["dn_id"].astype(str))
+    missing_po = missing_po.to_numpy(dtype=bool)
+    missing_dn = missing_dn.to_numpy(dtype=bool)
+
+    issues: List[Issue] = []
+    positions = np.flatnonzero(missing_po | missing_dn)
+    if positions.size == 0:
+        return issues
+    for position, invoice_id, po_id, dn_id in zip(
+        positions.tolist(),
+        invoice_ids.to_numpy()[positions].tolist(),
+        po_values.to_numpy()[positions].tolist(),
+        dn_values.to_numpy()[positions].tolist(),
+    ):
+        if missing_po[position]:
+            issues.append(
+                Issue(
+                    issue_id=f"po-{invoice_id}",
+                    invoice_id=invoice_id,
+                    severity="high",
+                    rule="MISSING_PO",
+                    details=f"po_id {po_id} satınalma listesinde bulunamadı",
+                )
+            )
+        if missing_dn[position]:
+            issues.append(
+                Issue(
+                    issue_id=f"dn-{invoice_id}",
+                    invoice_id=invoice_id,
+                    severity="high",
+                    rule="MISSING_DN",
+                    details=f"dn_id {dn_id} irsaliye listesinde bulunamadı",
+                )
+            )
+    return issues
+
+
+def _count_lookup(df: pd.DataFrame, key: str, value: str, name: str) -> pd.DataFrame:
+    lookup = pd.DataFrame(
+        {key: _str_values(df, key).to_numpy(), name: _float_values(df, value)}
+    )
+    return lookup.drop_duplicates(subset=[key], keep="last")
+
+
+def find_three_way_mismatch(
+    invoices: pd.DataFrame, purchase_orders: pd.DataFrame, delivery_notes: pd.DataFrame
+) -> List[Issue]:
+    frame = pd.DataFrame(
+        {
+            "_position": np.arange(len(invoices)),
+            "invoice_id": _str_values(invoices, "invoice_id").to_numpy(),
+            "po_id": _str_values(invoices, "po_id").to_numpy(),
+            "dn_id": _str_values(invoices, "dn_id").to_numpy(),
+        }
+    )
+    po_lookup = _count_lookup(purchase_orders, "po_id", "item_count", "po_count")
+    dn_lookup = _count_lookup(delivery_notes, "dn_id", "delivered_item_count", "dn_count")
+    matched = frame.merge(po_lookup, on="po_id", how="inner").merge(
+        dn_lookup, on="dn_id", how="inner"
+    )
+    matched = matched[
+        (matched["po_count"] - matched["dn_count"]).abs().to_numpy() > 0
+    ].sort_values("_position", kind="stable")
+
+    issues: List[Issue] = []
+    for invoice_id, po_count, dn_count in zip(
+        matched["invoice_id"].tolist(),
+        matched["po_count"].tolist(),
+        matched["dn_count"].tolist(),
+    ):
+        issues.append(
+            Issue(
+                issue_id=f"3way-{invoice_id}",
+                invoice_id=invoice_id,
+                severity="medium",
+                rule="THREE_WAY_MISMATCH",
+                details=f"po_kalem={po_count} dn_kalem={dn_count}",
+            )
+        )
+    return issues
+
+
+def find_unapproved_vendors(
+    invoices: pd.DataFrame, allowed_vendors: List[str] | None
+) -> List[Issue]:
+    if not allowed_vendors:
+        return []
+    allowed = {vendor.strip().lower() for vendor in allowed_vendors if vendor}
+    if "vendor" not in invoices.columns:
+        return []
+    vendors = invoices["vendor"].astype(object).where(invoices["vendor"].notna(), "")
+    vendors = vendors.astype(str).str.strip()
+    flagged = (vendors != "") & ~vendors.str.lower().isin(allowed)
+    positions = np.flatnonzero(flagged.to_numpy(dtype=bool))
+
+    issues: List[Issue] = []
+    for invoice_id, vendor in zip(
+        _str_values(invoices, "invoice_id").to_numpy()[positions].tolist(),
+        vendors.to_numpy()[positions].tolist(),
+    ):
+        issues.append(
+            Issue(
+                issue_id=f"vendor-{invoice_id}",
+                invoice_id=invoice_id,
+                severity="high",
+                rule="VENDOR_NOT_ALLOWED",
+                details=f"Tedarikçi izinli listede değil: {vendor}",
+            )
+        )
+    return issues
+
+
+def find_disallowed_vat_rates(
+    invoices: pd.DataFrame, allowed_rates: List[float] | None
+) -> List[Issue]:
+    if not allowed_rates:
+        return []
+    normalized_rates = {normalize_rate(rate) for rate in allowed_rates}
+    normalized_rates.discard(None)
+    if not normalized_rates or "vat_rate" not in invoices.columns:
+        return []
+
+    # VAT rates have very few distinct values, so normalizing the uniques with
+    # the row-wise helper keeps the rounding identical at negligible cost.
+    codes, uniques = pd.factorize(invoices["vat_rate"], use_na_sentinel=True)
+    normalized = [normalize_rate(value) for value in uniques]
+    disallowed = np.array(
+        [value is not None and value not in normalized_rates for value in normalized]
+        + [False],
+        dtype=bool,
+    )
+    positions = np.flatnonzero(disallowed[codes])
+
+    issues: List[Issue] = []
+    for invoice_id, code in zip(
+        _str_values(invoices, "invoice_id").to_numpy()[positions].tolist(),
+        codes[positions].tolist(),
+    ):
+        issues.append(
+            Issue(
+                issue_id=f"vat-rate-{invoice_id}",
+                invoice_id=invoice_id,
+                severity="medium",
+                rule="VAT_RATE_NOT_ALLOWED",
+                details=f"KDV oranı izinli listede değil: {normalized[code]}",
+            )
+        )
+    return issues
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.lexicon import fold_text
+from plugins.ticket_triage.rules import normalize_text
+
+__all__ = ["ClusterResult", "cluster_texts", "lsh_bands"]
+
+
+SHINGLE_SIZE = 4
+NUM_PERM = 64
+_SEED = 20240601
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_BAND_MULTIPLIER = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+@dataclass
+class ClusterResult:
+    """Cluster id for every text, numbered in order of first appearance."""
+
+    labels: np.ndarray
+    sizes: np.ndarray
+
+    @property
+    def row_sizes(self) -> np.ndarray:
+        return self.sizes[self.labels]
+
+    def representatives(self) -> np.ndarray:
+        """Position of the first text of every cluster."""
+        return np.unique(self.labels, return_index=True)[1]
+
+
+def lsh_bands(threshold: float, num_perm: int = NUM_PERM) -> tuple[int, int]:
+    """(bands, rows) whose LSH threshold is the highest one not above ``threshold``.
+
+    Erring low finds more candidate pairs; candidates are then checked
+    against ``threshold`` on their signatures.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def _shingle_hashes(texts: Sequence[str], size: int) -> tuple[np.ndarray, np.ndarray]:
+    """(document index, hash) for every character shingle, grouped by document."""
+    # Texts shorter than one shingle are padded so they still get a shingle.
+    padded = [text.ljust(size) if text else "" for text in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32)
+    windows = len(codes) - size + 1
+    if windows <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint32)
+    codes = codes.astype(np.uint64)
+    hashes = np.zeros(windows, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _MULTIPLIER + codes[offset : offset + windows]
+    ends = np.cumsum(lengths)
+    doc_ids = np.repeat(np.arange(len(padded), dtype=np.int64), lengths)[:windows]
+    valid = ends[doc_ids] - np.arange(windows) >= size
+    hashes = hashes[valid]
+    hashes ^= hashes >> np.uint64(29)
+    # 32-bit shingle hashes halve the memory traffic of the permutations.
+    return doc_ids[valid], ((hashes * _MULTIPLIER) >> np.uint64(32)).astype(np.uint32)
+
+
+def _signatures(
+    doc_ids: np.ndarray, hashes: np.ndarray, count: int, num_perm: int
+) -> np.ndarray:
+    signatures = np.full((num_perm, count), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if len(hashes) == 0:
+        return signatures.T
+    rng = np.random.default_rng(_SEED)
+    multipliers = rng.integers(1, 2**32, size=num_perm, dtype=np.uint32) | np.uint32(1)
+    offsets = rng.integers(0, 2**32, size=num_perm, dtype=np.uint32)
+    starts = np.flatnonzero(np.r_[True, doc_ids[1:] != doc_ids[:-1]])
+    docs = doc_ids[starts]
+    permuted = np.empty_like(hashes)
+    for index in range(num_perm):
+        np.multiply(hashes, multipliers[index], out=permuted)
+        permuted += offsets[index]
+        signatures[index, docs] = np.minimum.reduceat(permuted, starts)
+    return np.ascontiguousarray(signatures.T)
+
+
+def _connected_labels(count: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    labels = np.arange(count)
+    while len(left):
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        # Point every label at its own root so chains collapse quickly.
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return labels
+
+
+def cluster_texts(
+    texts: Sequence[str],
+    threshold: float = 0.7,
+    num_perm: int = NUM_PERM,
+    shingle_size: int = SHINGLE_SIZE,
+) -> ClusterResult:
+    """Group texts whose shingle Jaccard similarity is about ``threshold`` or more.
+
+    MinHash signatures are bucketed per LSH band, so only texts sharing a
+    bucket are compared and the work grows roughly linearly with the input.
+    """
+    if len(texts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return ClusterResult(labels=empty, sizes=empty)
+    normalized = [normalize_text(fold_text(text)) for text in texts]
+    codes, uniques = pd.factorize(pd.Series(normalized, dtype=object))
+    documents: List[str] = list(uniques)
+    doc_ids, hashes = _shingle_hashes(documents, shingle_size)
+    signatures = _signatures(doc_ids, hashes, len(documents), num_perm)
+
+    bands, rows = lsh_bands(threshold, num_perm)
+    left_parts, right_parts = [], []
+    for band in range(bands):
+        block = signatures[:, band * rows : (band + 1) * rows]
+        keys = np.zeros(len(documents), dtype=np.uint64)
+        for column in range(rows):
+            keys = keys * _BAND_MULTIPLIER + block[:, column].astype(np.uint64)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        partner = first[inverse]
+        paired = np.flatnonzero(partner != np.arange(len(documents)))
+        left_parts.append(paired)
+        right_parts.append(partner[paired])
+    left = np.concatenate(left_parts) if left_parts else np.empty(0, dtype=np.int64)
+    right = np.concatenate(right_parts) if right_parts else np.empty(0, dtype=np.int64)
+    if len(left):
+        pairs = np.sort(left * len(documents) + right)
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+        left, right = pairs // len(documents), pairs % len(documents)
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        keep = similarity >= threshold
+        left, right = left[keep], right[keep]
+
+    doc_labels = _connected_labels(len(documents), left, right)
+    labels, _ = pd.factorize(doc_labels[codes])
+    labels = labels.astype(np.int64)
+    return ClusterResult(labels=labels, sizes=np.bincount(labels))
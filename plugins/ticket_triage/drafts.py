@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import pandas as pd
+
+__all__ = ["DraftStats", "render_body", "write_drafts"]
+
+
+DRAFTS_FILENAME = "reply_drafts.jsonl"
+PLACEHOLDER = "$ticket_id"
+
+CATEGORY_LINES = {
+    "return": "İade talebinizi aldık ve süreci başlatmak için inceliyoruz.",
+    "delivery": "Kargo ve teslimatla ilgili talebinizi aldık, gönderinizi kontrol ediyoruz.",
+    "payment": "Ödemeyle ilgili talebinizi aldık, işlem kayıtlarını inceliyoruz.",
+}
+DEFAULT_CATEGORY_LINE = "Talebinizi aldık ve inceliyoruz."
+FIELD_LABELS = {"order_id": "sipariş numaranız", "amount": "işlem tutarı"}
+HIGH_PRIORITY_LINE = "Talebiniz öncelikli olarak ele alınıyor."
+
+_TEMPLATE = Template(
+    "Merhaba,\n\n"
+    "Talep numaranız: $placeholder\n"
+    "$category_line\n"
+    "$missing_block"
+    "$priority_line"
+    "\nTeşekkürler,\nDestek Ekibi"
+)
+
+
+@dataclass
+class DraftStats:
+    drafts: int
+    templates: int
+    improved: int
+    seconds: float
+
+    @property
+    def per_second(self) -> float:
+        return self.drafts / self.seconds if self.seconds > 0 else float(self.drafts)
+
+
+def render_body(category: str, missing: Tuple[str, ...], severity: str) -> str:
+    """Reply text for one template key, with ``$ticket_id`` left in place."""
+    missing_block = ""
+    if missing:
+        fields = ", ".join(FIELD_LABELS.get(field, field) for field in missing)
+        missing_block = (
+            f"İşleme devam edebilmemiz için lütfen şu bilgileri paylaşın: {fields}.\n"
+        )
+    return _TEMPLATE.substitute(
+        placeholder=PLACEHOLDER,
+        category_line=CATEGORY_LINES.get(category, DEFAULT_CATEGORY_LINE),
+        missing_block=missing_block,
+        priority_line=f"{HIGH_PRIORITY_LINE}\n" if severity == "high" else "",
+    )
+
+
+def _improve(bodies: Dict[tuple, str], llm, workers: int) -> int:
+    """Run ``llm.improve_email`` over the bodies on at most ``workers`` threads.
+
+    An answer that lost or duplicated the ticket id placeholder is dropped.
+    """
+    keys = list(bodies)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        answers = list(pool.map(lambda key: llm.improve_email(bodies[key]), keys))
+    improved = 0
+    for key, answer in zip(keys, answers):
+        if answer != bodies[key] and answer.count(PLACEHOLDER) == 1:
+            bodies[key] = answer
+            improved += 1
+    return improved
+
+
+def write_drafts(
+    path: Path,
+    ticket_ids: Sequence,
+    categories: Sequence[str],
+    missing: Dict[int, List[str]],
+    severities: Sequence[str],
+    llm=None,
+    workers: int = 1,
+) -> DraftStats:
+    """Stream one reply draft per ticket into a JSONL file.
+
+    Drafts are rendered from one template per (category, missing fields,
+    severity) combination. With ``llm``, each template is improved once.
+    Lines are written as they are rendered.
+    """
+    start = time.perf_counter()
+    keys = [
+        (
+            str(categories[position]),
+            tuple(missing.get(position, ())),
+            str(severities[position]),
+        )
+        for position in range(len(ticket_ids))
+    ]
+    bodies = {key: render_body(*key) for key in dict.fromkeys(keys)}
+    improved = _improve(bodies, llm, workers) if llm is not None and bodies else 0
+    lines = {key: _line_parts(key, body) for key, body in bodies.items()}
+
+    with path.open("w", encoding="utf-8") as handle:
+        for ticket_id, key in zip(_as_strings(ticket_ids), keys):
+            head, middle, tail = lines[key]
+            # Only the ticket id varies, so it is the only part encoded here.
+            encoded = json.dumps(ticket_id, ensure_ascii=False)
+            handle.write(f"{head}{encoded}{middle}{encoded[1:-1]}{tail}")
+    return DraftStats(
+        drafts=len(keys),
+        templates=len(bodies),
+        improved=improved,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _line_parts(key: tuple, body: str) -> Tuple[str, str, str]:
+    """A JSONL record for ``key`` split around the two ticket id slots."""
+    before, _, after = Template(body).safe_substitute(ticket_id="\0").partition("\0")
+    fields = json.dumps(
+        {"category": key[0], "missing": list(key[1]), "severity": key[2]},
+        ensure_ascii=False,
+    )
+    head = '{"ticket_id": '
+    middle = ", " + fields[1:-1] + ', "draft": ' + json.dumps(before, ensure_ascii=False)[:-1]
+    tail = json.dumps(after, ensure_ascii=False)[1:] + "}\n"
+    return head, middle, tail
+
+
+def _as_strings(values: Iterable) -> Iterable[str]:
+    for value in values:
+        yield "unknown" if pd.isna(value) else str(value)
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
 import time
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 from reportlab.lib import colors
 
 from core.models import ArtifactRecord, StepRecord
+from core.progress import RunContext
 from core import storage
-from core import schema
+from core import classifier, lexicon, pii, schema
 from core.settings import load_settings
 from plugins.base import AnalysisResult, BasePlugin
-from plugins.ticket_triage import rules
+from plugins.ticket_triage import clustering, drafts, rules, vectorized_rules
 
 
 class TicketTriagePlugin(BasePlugin):
@@ -23,7 +28,14 @@ class TicketTriagePlugin(BasePlugin):
     description = "Analyze support tickets for category, missing info, and priority."
     expected_inputs = ["tickets"]
 
-    def analyze(self, inputs: Dict[str, Path], llm, run_id: str) -> AnalysisResult:
+    def analyze(
+        self,
+        inputs: Dict[str, Path],
+        llm,
+        run_id: str,
+        context: RunContext | None = None,
+    ) -> AnalysisResult:
+        context = context or RunContext(run_id)
         if "tickets" not in inputs:
             raise ValueError("tickets girdisi gerekli")
 
@@ -31,9 +43,10 @@ class TicketTriagePlugin(BasePlugin):
         artifacts_dir = run_dir / "artifacts"
         artifacts_dir.mkdir(parents=True, exist_ok=True)
 
-        steps: List[StepRecord] = []
+        steps: List[StepRecord] = context.step_log()
         recommendations: List[dict] = []
 
+        context.step_started("LOAD_TICKETS", "Kayıtlar yüklendi")
         start = time.monotonic()
         mapping = schema.load_mapping(run_id).get("tickets")
         settings = load_settings()
@@ -42,13 +55,16 @@ class TicketTriagePlugin(BasePlugin):
             schema.get_input_schema("ticket", "tickets"),
             mapping,
             settings,
+            on_chunk=lambda chunk: context.rows_processed("tickets", len(chunk)),
         )
         steps.append(
             StepRecord(
                 title="Kayıtlar yüklendi",
                 action="LOAD_TICKETS",
                 severity="info",
-                evidence=[f"rows={len(df)}"],
+                evidence=[f"rows={len(df)}"]
+                + schema.memory_evidence(df)
+                + schema.date_format_evidence(df),
                 decision="Kayıtlar başarıyla yüklendi",
                 requires_approval=False,
                 status="done",
@@ -56,25 +72,155 @@ class TicketTriagePlugin(BasePlugin):
             )
         )
 
+        if "customer_text" in df.columns:
+            context.step_started("MASK_PII", "Kişisel veri maskeleme")
+            start = time.monotonic()
+            # Masked once here, so the LLM, the clusters and every artifact
+            # only ever see masked text.
+            df["customer_text"], pii_counts = pii.mask_series(df["customer_text"])
+            masked_total = sum(pii_counts.values())
+            steps.append(
+                StepRecord(
+                    title="Kişisel veri maskeleme",
+                    action="MASK_PII",
+                    severity="info",
+                    evidence=pii.count_evidence(pii_counts),
+                    decision=(
+                        f"{masked_total} kişisel veri maskelendi"
+                        if masked_total
+                        else "Kişisel veri bulunamadı"
+                    ),
+                    requires_approval=False,
+                    status="done",
+                    duration_ms=int((time.monotonic() - start) * 1000),
+                )
+            )
+
+        clusters = None
+        clusters_path = artifacts_dir / "clusters.csv"
+        if settings.cluster_similarity is not None:
+            context.step_started("CLUSTER_TICKETS", "Benzer talepler")
+            start = time.monotonic()
+            ticket_texts = vectorized_rules.ticket_texts(df).tolist()
+            clusters = clustering.cluster_texts(
+                ticket_texts, settings.cluster_similarity / 100
+            )
+            self._write_csv(
+                clusters_path,
+                {
+                    "ticket_id": self._ticket_ids(df),
+                    "cluster_id": clusters.labels.tolist(),
+                    "cluster_size": clusters.row_sizes.tolist(),
+                },
+            )
+            repeated = int((clusters.sizes > 1).sum())
+            steps.append(
+                StepRecord(
+                    title="Benzer talepler",
+                    action="CLUSTER_TICKETS",
+                    severity="info",
+                    evidence=self._cluster_evidence(clusters, ticket_texts),
+                    decision=(
+                        f"{repeated} benzer talep grubu bulundu"
+                        if repeated
+                        else "Benzer talep bulunamadı"
+                    ),
+                    requires_approval=False,
+                    status="done",
+                    duration_ms=int((time.monotonic() - start) * 1000),
+                )
+            )
+        # Cluster ids replace texts as the categorization key when only one
+        # representative per cluster should be classified.
+        cluster_keys = (
+            clusters.labels
+            if clusters is not None and settings.cluster_representatives
+            else None
+        )
+
+        context.step_started("CATEGORIZE", "Kategori tahmini")
         start = time.monotonic()
+        # One fused pass computes what the three steps below report.
+        triaged = vectorized_rules.triage(df) if settings.vectorized_rules else None
+        cache_before = self._llm_cache_stats(llm)
+        ticket_ids = self._ticket_ids(df) if triaged is not None else []
+        model = self._classifier(settings)
+        min_confidence = (
+            settings.classifier_min_confidence / 100 if model is not None else None
+        )
         predicted_count = 0
+        distinct_count = 0
         categories: List[str] = []
-        for _, row in df.iterrows():
-            current = row.get("category")
-            text = str(row.get("customer_text") or "")
-            if pd.isna(current) or current == "":
-                predicted = rules.categorize_text(text, llm)
-                predicted_count += 1
-                categories.append(predicted)
-            else:
-                categories.append(str(current))
+        sources: List[str] = []
+        if triaged is not None:
+            categories = self._current_categories(df)
+            sources = ["input"] * len(df)
+            positions = np.flatnonzero(triaged.needs_category)
+            # Each distinct normalized text is classified once and its label
+            # is broadcast back to every row carrying it.
+            texts = triaged.texts.iloc[positions]
+            keys = (
+                texts.map(rules.normalize_text)
+                if cluster_keys is None
+                else cluster_keys[positions]
+            )
+            codes, uniques = pd.factorize(keys)
+            first_rows = np.unique(codes, return_index=True)[1]
+            labels, label_sources = rules.categorize_many(
+                texts.iloc[first_rows].tolist(), llm, model, min_confidence
+            )
+            for position, code in zip(positions, codes):
+                categories[position] = labels[code]
+                sources[position] = label_sources[code]
+            predicted_count = len(positions)
+            distinct_count = len(uniques)
+            category_texts = triaged.texts.tolist()
+        else:
+            labels_by_key: Dict[Any, tuple[str, str]] = {}
+            category_texts = []
+            for position, (_, row) in enumerate(df.iterrows()):
+                current = row.get("category")
+                text = str(row.get("customer_text") or "")
+                category_texts.append(text)
+                ticket_ids.append(row.get("ticket_id", "unknown"))
+                if pd.isna(current) or current == "":
+                    key = (
+                        rules.normalize_text(text)
+                        if cluster_keys is None
+                        else cluster_keys[position]
+                    )
+                    if key not in labels_by_key:
+                        context.check()
+                        labels, label_sources = rules.categorize_many(
+                            [text], llm, model, min_confidence
+                        )
+                        labels_by_key[key] = (labels[0], label_sources[0])
+                    predicted_count += 1
+                    label, source = labels_by_key[key]
+                    categories.append(label)
+                    sources.append(source)
+                else:
+                    categories.append(str(current))
+                    sources.append("input")
+            distinct_count = len(labels_by_key)
         df["predicted_category"] = categories
+        categories_path = artifacts_dir / classifier.CATEGORIES_ARTIFACT
+        self._write_categories(
+            categories_path, ticket_ids, category_texts, categories, sources
+        )
         steps.append(
             StepRecord(
                 title="Kategori tahmini",
                 action="CATEGORIZE",
                 severity="info",
-                evidence=[f"predicted_missing={predicted_count}"],
+                evidence=[
+                    f"predicted_missing={predicted_count}",
+                    f"distinct_texts={distinct_count}",
+                    f"dedup_ratio={self._dedup_ratio(predicted_count, distinct_count):.2f}",
+                ]
+                + (["categorized_per=cluster"] if cluster_keys is not None else [])
+                + self._classifier_evidence(model, sources)
+                + self._llm_cache_evidence(cache_before, self._llm_cache_stats(llm)),
                 decision="Kategori önerileri eklendi",
                 requires_approval=False,
                 status="done",
@@ -82,12 +228,27 @@ class TicketTriagePlugin(BasePlugin):
             )
         )
 
+        context.step_started("MISSING_INFO", "Eksik bilgi kontrolü")
         start = time.monotonic()
         missing_evidence: List[str] = []
-        for _, row in df.iterrows():
-            missing = rules.missing_fields(row)
+        if triaged is not None:
+            missing_by_position = triaged.missing_lists()
+            missing_rows = [
+                (ticket_ids[position], missing)
+                for position, missing in missing_by_position.items()
+            ]
+        else:
+            missing_rows = [
+                (row.get("ticket_id", "unknown"), rules.missing_fields(row))
+                for _, row in df.iterrows()
+            ]
+            missing_by_position = {
+                position: missing
+                for position, (_, missing) in enumerate(missing_rows)
+                if missing
+            }
+        for ticket_id, missing in missing_rows:
             if missing:
-                ticket_id = row.get("ticket_id", "unknown")
                 missing_evidence.append(
                     f"ticket_id={ticket_id} missing={','.join(missing)}"
                 )
@@ -114,15 +275,30 @@ class TicketTriagePlugin(BasePlugin):
             )
         )
 
+        context.step_started("PRIORITY_SCORE", "Öncelik skoru")
         start = time.monotonic()
         severity_counts = {"high": 0, "medium": 0, "low": 0}
         high_priority_ids: List[str] = []
-        for _, row in df.iterrows():
-            amount = row.get("amount")
-            score, severity = rules.priority_score(str(row.get("customer_text") or ""), amount)
-            severity_counts[severity] += 1
-            if severity == "high":
-                high_priority_ids.append(str(row.get("ticket_id", "unknown")))
+        if triaged is not None:
+            severities = triaged.severities
+            labels, counts = np.unique(triaged.severities, return_counts=True)
+            severity_counts.update(zip(labels.tolist(), counts.tolist()))
+            high_priority_ids = [
+                str(ticket_ids[position])
+                for position in np.flatnonzero(triaged.severities == "high")
+            ]
+        else:
+            severities = []
+            matcher = lexicon.default_matcher()
+            for _, row in df.iterrows():
+                amount = row.get("amount")
+                score, severity = rules.priority_score(
+                    str(row.get("customer_text") or ""), amount, matcher
+                )
+                severities.append(severity)
+                severity_counts[severity] += 1
+                if severity == "high":
+                    high_priority_ids.append(str(row.get("ticket_id", "unknown")))
         decision = (
             f"High={severity_counts['high']} Medium={severity_counts['medium']} Low={severity_counts['low']}"
         )
@@ -141,11 +317,45 @@ class TicketTriagePlugin(BasePlugin):
             )
         )
 
+        context.step_started("DRAFT_REPLIES", "Yanıt taslakları")
+        start = time.monotonic()
+        drafts_path = artifacts_dir / drafts.DRAFTS_FILENAME
+        improver = (
+            llm if settings.draft_llm_improve and getattr(llm, "online", False) else None
+        )
+        draft_stats = drafts.write_drafts(
+            drafts_path,
+            ticket_ids,
+            categories,
+            missing_by_position,
+            severities,
+            llm=improver,
+            workers=settings.llm_workers or 1,
+        )
+        steps.append(
+            StepRecord(
+                title="Yanıt taslakları",
+                action="DRAFT_REPLIES",
+                severity="info",
+                evidence=[
+                    f"drafts={draft_stats.drafts}",
+                    f"templates={draft_stats.templates}",
+                    f"llm_improved_templates={draft_stats.improved}",
+                    f"drafts_per_second={draft_stats.per_second:.0f}",
+                ],
+                decision=f"{draft_stats.drafts} talep için yanıt taslağı hazırlandı",
+                requires_approval=False,
+                status="done",
+                duration_ms=int((time.monotonic() - start) * 1000),
+            )
+        )
+
         summary = (
             f"İncelenen kayıt: {len(df)}. Eksik bilgi: {len(missing_evidence)}. "
             f"Yüksek öncelik: {severity_counts['high']}."
         )
 
+        context.check()
         report_path = run_dir / "report.pdf"
         self._write_report(report_path, summary, severity_counts, missing_evidence, len(df))
 
@@ -155,7 +365,11 @@ class TicketTriagePlugin(BasePlugin):
         artifacts = [
             ArtifactRecord(type="pdf", path=str(report_path)),
             ArtifactRecord(type="email", path=str(email_path)),
+            ArtifactRecord(type="csv", path=str(categories_path)),
+            ArtifactRecord(type="jsonl", path=str(drafts_path)),
         ]
+        if clusters is not None:
+            artifacts.append(ArtifactRecord(type="csv", path=str(clusters_path)))
 
         return AnalysisResult(
             steps=steps,
@@ -164,6 +378,107 @@ class TicketTriagePlugin(BasePlugin):
             recommendations=recommendations,
         )
 
+    @staticmethod
+    def _dedup_ratio(predicted_count: int, distinct_count: int) -> float:
+        if predicted_count == 0:
+            return 0.0
+        return 1 - distinct_count / predicted_count
+
+    @staticmethod
+    def _llm_cache_stats(llm) -> Dict[str, int] | None:
+        stats = getattr(llm, "cache_stats", None)
+        return stats() if callable(stats) else None
+
+    @staticmethod
+    def _llm_cache_evidence(
+        before: Dict[str, int] | None, after: Dict[str, int] | None
+    ) -> List[str]:
+        if before is None or after is None:
+            return []
+        return [
+            f"llm_cache_hits={after['hits'] - before['hits']}",
+            f"llm_cache_misses={after['misses'] - before['misses']}",
+        ]
+
+    @staticmethod
+    def _classifier(settings) -> classifier.TicketClassifier | None:
+        if settings.classifier_min_confidence is None:
+            return None
+        return classifier.load_default_classifier()
+
+    @staticmethod
+    def _classifier_evidence(model, sources: List[str]) -> List[str]:
+        if model is None:
+            return []
+        counts = Counter(sources)
+        return [
+            f"classifier_labelled={counts['classifier']}",
+            f"sent_to_llm={counts['llm'] + counts['heuristic']}",
+        ]
+
+    @staticmethod
+    def _write_categories(
+        path: Path,
+        ticket_ids: List[Any],
+        texts: List[str],
+        categories: List[str],
+        sources: List[str],
+    ) -> None:
+        # Training data for core.classifier; texts were masked on load.
+        TicketTriagePlugin._write_csv(
+            path,
+            {
+                "ticket_id": ticket_ids,
+                "text": texts,
+                "category": categories,
+                "source": sources,
+            },
+        )
+
+    @staticmethod
+    def _write_csv(path: Path, columns: Dict[str, List[Any]]) -> None:
+        arrays = {}
+        for name, values in columns.items():
+            if values and isinstance(values[0], int):
+                arrays[name] = pa.array(values, pa.int64())
+            else:
+                arrays[name] = pa.array(
+                    [None if pd.isna(value) else str(value) for value in values],
+                    pa.string(),
+                )
+        pa_csv.write_csv(pa.table(arrays), path)
+
+    @staticmethod
+    def _cluster_evidence(
+        clusters: clustering.ClusterResult, texts: List[str], limit: int = 5
+    ) -> List[str]:
+        repeated = np.flatnonzero(clusters.sizes > 1)
+        evidence = [
+            f"clusters={len(clusters.sizes)}",
+            f"near_duplicate_tickets={int(clusters.sizes[repeated].sum())}",
+            f"largest_cluster={int(clusters.sizes.max()) if len(clusters.sizes) else 0}",
+        ]
+        representatives = clusters.representatives()
+        largest = repeated[np.argsort(-clusters.sizes[repeated], kind="stable")][:limit]
+        for cluster_id in largest:
+            sample = texts[representatives[cluster_id]][:60]
+            evidence.append(
+                f"cluster_id={cluster_id} size={clusters.sizes[cluster_id]} sample={sample}"
+            )
+        return evidence
+
+    @staticmethod
+    def _ticket_ids(df: pd.DataFrame) -> List[Any]:
+        if "ticket_id" not in df.columns:
+            return ["unknown"] * len(df)
+        return df["ticket_id"].astype(object).tolist()
+
+    @staticmethod
+    def _current_categories(df: pd.DataFrame) -> List[str]:
+        if "category" not in df.columns:
+            return [""] * len(df)
+        return [str(value) for value in df["category"].astype(object).tolist()]
+
     def apply(
         self, inputs: Dict[str, Path], recommendations: List[dict], run_id: str
     ) -> List[ArtifactRecord]:
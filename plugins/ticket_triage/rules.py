@@ -4,6 +4,8 @@ from typing import List, Tuple
 
 import pandas as pd
 
+from core import lexicon
+
 
 def categorize_text(text: str, llm) -> str:
     if llm is None:
@@ -11,6 +13,47 @@ def categorize_text(text: str, llm) -> str:
     return llm.categorize(text)
 
 
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so copy-paste variants share one classification."""
+    return " ".join(text.split())
+
+
+def categorize_many(
+    texts: List[str],
+    llm,
+    classifier=None,
+    min_confidence: float | None = None,
+) -> Tuple[List[str], List[str]]:
+    """Label ``texts`` and say where each label came from.
+
+    With a local classifier, only texts it scores below ``min_confidence``
+    go to ``llm``; the rest keep the classifier's label.
+    """
+    labels: List[str] = [""] * len(texts)
+    sources: List[str] = [""] * len(texts)
+    pending = list(range(len(texts)))
+    if classifier is not None and min_confidence is not None and texts:
+        predicted, confidence = classifier.predict(texts)
+        pending = []
+        for position, (label, score) in enumerate(zip(predicted, confidence)):
+            if score >= min_confidence:
+                labels[position] = label
+                sources[position] = "classifier"
+            else:
+                pending.append(position)
+    if pending:
+        pending_texts = [texts[position] for position in pending]
+        if llm is None:
+            fallback = ["general"] * len(pending)
+            fallback_sources = ["heuristic"] * len(pending)
+        else:
+            fallback, fallback_sources = llm.categorize_many_with_sources(pending_texts)
+        for position, label, source in zip(pending, fallback, fallback_sources):
+            labels[position] = label
+            sources[position] = source
+    return labels, sources
+
+
 def safe_float(value) -> float | None:
     if value is None:
         return None
@@ -46,15 +89,12 @@ def missing_fields(row: pd.Series) -> List[str]:
     return missing
 
 
-def priority_score(text: str, amount: float | None) -> Tuple[int, str]:
-    lowered = (text or "").lower()
-    score = 0
-    if "iade" in lowered or "refund" in lowered or "return" in lowered:
-        score += 2
-    if "acil" in lowered or "urgent" in lowered or "hemen" in lowered:
-        score += 2
-    if "para" in lowered or "payment" in lowered or "charge" in lowered:
-        score += 1
+def priority_score(
+    text: str, amount: float | None, matcher: lexicon.KeywordMatcher | None = None
+) -> Tuple[int, str]:
+    """Score one ticket; pass ``matcher`` when scoring many rows in a loop."""
+    matcher = matcher or lexicon.default_matcher()
+    score = matcher.score(matcher.mask(text or ""))
     amount_value = safe_float(amount)
     if amount_value is not None and amount_value > 1000:
         score += 1
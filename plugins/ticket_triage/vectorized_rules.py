@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from core import lexicon
+from plugins.ticket_triage.rules import safe_float
+
+__all__ = [
+    "TriageFrame",
+    "missing_field_masks",
+    "priority_scores",
+    "ticket_texts",
+    "triage",
+]
+
+
+AMOUNT_THRESHOLD = 1000
+REQUIRED_FIELDS = ("order_id", "amount")
+
+
+@dataclass
+class TriageFrame:
+    """Per-row triage results for a whole ticket frame."""
+
+    needs_category: np.ndarray
+    texts: pd.Series
+    missing: Dict[str, np.ndarray]
+    scores: np.ndarray
+    severities: np.ndarray
+
+    def missing_lists(self) -> Dict[int, List[str]]:
+        """Positions with at least one missing field, in field order."""
+        any_missing = np.zeros(len(self.texts), dtype=bool)
+        for mask in self.missing.values():
+            any_missing |= mask
+        return {
+            int(position): [name for name, mask in self.missing.items() if mask[position]]
+            for position in np.flatnonzero(any_missing)
+        }
+
+
+def ticket_texts(df: pd.DataFrame) -> pd.Series:
+    if "customer_text" not in df.columns:
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+    # Object dtype keeps Python's str.lower and str.strip, which the row-wise
+    # rules use; Arrow-backed string kernels fold "İ" differently.
+    texts = _python_strings(df["customer_text"])
+    return texts.where(texts.notna(), "")
+
+
+def _python_strings(values: pd.Series) -> pd.Series:
+    strings = values.astype(object)
+    if values.dtype == object:
+        strings = strings.map(lambda value: value if pd.isna(value) else str(value))
+    return strings
+
+
+def _na_counts_as_missing(values: pd.Series) -> np.ndarray:
+    # rules.missing_fields sees the row-wise object values: None and float
+    # NaN count as missing, pd.NA and NaT do not (str() makes them non-blank).
+    na = values.isna().to_numpy()
+    if not na.any():
+        return na
+    na_values = values[na].astype(object)
+    if values.dtype == object:
+        flags = na_values.map(lambda value: value is None or isinstance(value, float))
+        result = np.zeros(len(values), dtype=bool)
+        result[na] = flags.to_numpy(dtype=bool)
+        return result
+    first = na_values.iloc[0]
+    if first is None or isinstance(first, float):
+        return na
+    return np.zeros(len(values), dtype=bool)
+
+
+def _blank_text(values: pd.Series) -> np.ndarray:
+    present = values.notna().to_numpy()
+    if not present.any() or pd.api.types.is_numeric_dtype(values.dtype):
+        return np.zeros(len(values), dtype=bool)
+    stripped = _python_strings(values[present]).str.strip()
+    result = np.zeros(len(values), dtype=bool)
+    result[present] = stripped.eq("").to_numpy(dtype=bool)
+    return result
+
+
+def missing_field_masks(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    masks: Dict[str, np.ndarray] = {}
+    for field in REQUIRED_FIELDS:
+        if field not in df.columns:
+            masks[field] = np.ones(len(df), dtype=bool)
+            continue
+        masks[field] = _na_counts_as_missing(df[field]) | _blank_text(df[field])
+    return masks
+
+
+def _amount_values(df: pd.DataFrame) -> np.ndarray:
+    if "amount" not in df.columns:
+        return np.full(len(df), np.nan)
+    amounts = df["amount"]
+    if pd.api.types.is_numeric_dtype(amounts.dtype):
+        return amounts.to_numpy(dtype="float64", na_value=np.nan)
+    parsed = amounts.astype(object).map(safe_float)
+    return parsed.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def priority_scores(texts: pd.Series, amounts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Mirrors rules.priority_score: one lexicon scan over the whole column.
+    matcher = lexicon.default_matcher()
+    scores = matcher.scores(matcher.masks(texts))
+    with np.errstate(invalid="ignore"):
+        scores += amounts > AMOUNT_THRESHOLD
+    severities = np.select([scores >= 4, scores >= 2], ["high", "medium"], default="low")
+    return scores, severities
+
+
+def _blank_category(category: pd.Series) -> np.ndarray:
+    present = category.notna().to_numpy()
+    result = np.zeros(len(category), dtype=bool)
+    if present.any():
+        result[present] = (category[present].astype(object) == "").to_numpy(dtype=bool)
+    return result
+
+
+def triage(df: pd.DataFrame) -> TriageFrame:
+    """Compute category need, missing fields and priority in one pass."""
+    texts = ticket_texts(df)
+    if "category" in df.columns:
+        category = df["category"]
+        needs_category = category.isna().to_numpy() | _blank_category(category)
+    else:
+        needs_category = np.ones(len(df), dtype=bool)
+    scores, severities = priority_scores(texts, _amount_values(df))
+    return TriageFrame(
+        needs_category=needs_category,
+        texts=texts,
+        missing=missing_field_masks(df),
+        scores=scores,
+        severities=severities,
+    )
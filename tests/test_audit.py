@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from core import audit as audit_module
 from core.audit import AuditTrailReader, AuditTrailWriter
-from core.models import ArtifactRecord, InputFileRecord, StepRecord
+from core.models import ArtifactRecord, InputFileRecord, RunAudit, StepRecord
 
 
 def _create_input_file(tmp_path: Path) -> Path:
@@ -89,6 +90,108 @@ def test_mark_applied_updates_status(tmp_path, monkeypatch) -> None:
         duration_ms=0,
     )
     writer.append_step(run_id, step)
+    snapshot = (tmp_path / "runs" / run_id / "audit.json").read_bytes()
     writer.mark_applied(run_id)
     audit = AuditTrailReader().load_run(run_id)
     assert audit.steps[0].status == "applied"
+    # Only the log grows; the snapshot is not rewritten per mutation.
+    assert (tmp_path / "runs" / run_id / "audit.json").read_bytes() == snapshot
+
+
+def _step(index: int, evidence: int = 0) -> StepRecord:
+    return StepRecord(
+        title=f"Step {index}",
+        action="CHECK",
+        severity="info",
+        evidence=[f"row={row}" for row in range(evidence)],
+        decision="done",
+        requires_approval=False,
+        status="done",
+    )
+
+
+def test_append_steps_adds_all_steps(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    writer = AuditTrailWriter()
+    writer.create_run("run-5", "ticket", [])
+    writer.append_steps("run-5", [_step(0), _step(1, evidence=3)])
+    audit = AuditTrailReader().load_run("run-5")
+    assert [step.title for step in audit.steps] == ["Step 0", "Step 1"]
+    assert audit.steps[1].evidence == ["row=0", "row=1", "row=2"]
+
+
+def test_session_writes_steps_at_finalize(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    session = AuditTrailWriter().start_session("run-6", "ticket", [])
+    first = _step(0)
+    session.append_step(first)
+    session.append_steps([first, _step(1)])
+    assert AuditTrailReader().load_run("run-6").steps == []
+
+    session.finalize("summary", [], status="done")
+    audit = AuditTrailReader().load_run("run-6")
+    assert [step.title for step in audit.steps] == ["Step 0", "Step 1"]
+    assert audit.status == "done"
+    assert audit.finished_at is not None
+
+
+def test_session_checkpoints_when_interval_elapsed(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    session = AuditTrailWriter().start_session(
+        "run-7", "ticket", [], checkpoint_seconds=0
+    )
+    session.append_step(_step(0))
+    audit = AuditTrailReader().load_run("run-7")
+    assert len(audit.steps) == 1
+    assert audit.finished_at is None
+
+
+def test_append_only_adds_a_log_line(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    writer = AuditTrailWriter()
+    writer.create_run("run-8", "ticket", [])
+    run_dir = tmp_path / "runs" / "run-8"
+    snapshot = (run_dir / "audit.json").read_bytes()
+
+    writer.append_step("run-8", _step(0))
+    writer.append_steps("run-8", [_step(1), _step(2)])
+    assert (run_dir / "audit.json").read_bytes() == snapshot
+    assert len((run_dir / "audit.log.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+    assert len(AuditTrailReader().load_run("run-8").steps) == 3
+
+    writer.finalize_run("run-8", "summary", [])
+    assert (run_dir / "audit.log.jsonl").read_text(encoding="utf-8") == ""
+    assert len(AuditTrailReader().load_run("run-8").steps) == 3
+
+
+def test_large_log_is_compacted_into_snapshot(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(audit_module, "COMPACT_MIN_BYTES", 0)
+    writer = AuditTrailWriter()
+    writer.create_run("run-9", "ticket", [])
+    writer.append_step("run-9", _step(0, evidence=50))
+    run_dir = tmp_path / "runs" / "run-9"
+    assert (run_dir / "audit.log.jsonl").read_text(encoding="utf-8") == ""
+    assert len(RunAudit.model_validate_json((run_dir / "audit.json").read_bytes()).steps) == 1
+
+
+def test_torn_log_line_is_skipped(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    writer = AuditTrailWriter()
+    writer.create_run("run-10", "ticket", [])
+    writer.append_step("run-10", _step(0))
+    log_path = tmp_path / "runs" / "run-10" / "audit.log.jsonl"
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"event":"steps","steps":[{"tit')
+    writer.append_step("run-10", _step(1))
+    audit = AuditTrailReader().load_run("run-10")
+    assert [step.title for step in audit.steps] == ["Step 0", "Step 1"]
+
+
+def test_audit_without_log_still_loads(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    writer = AuditTrailWriter()
+    writer.create_run("run-11", "ticket", [])
+    (tmp_path / "runs" / "run-11" / "audit.log.jsonl").unlink()
+    assert AuditTrailReader().load_run("run-11").steps == []
+    writer.mark_applied("run-11")
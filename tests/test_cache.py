@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from core import cache, schema
+from core.settings import Settings
+
+
+def _write_invoices(path: Path) -> Path:
+    path.write_text(
+        "invoice_id,vendor,date,subtotal,vat_rate,vat_amount,total,po_id,dn_id\n"
+        "INV-001,Vendor A,2024-01-01,100,0.18,18,118,PO-001,DN-001\n"
+        "INV-002,Vendor B,2024-01-02,200,0.18,36,240,PO-002,DN-002\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_second_load_is_served_from_cache(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = _write_invoices(tmp_path / "invoices.csv")
+    invoice_schema = schema.get_input_schema("edoc", "invoices")
+    settings = Settings(cache_max_mb=16)
+
+    first = schema.load_csv_with_schema(path, invoice_schema, None, settings)
+    assert list(cache.get_parsed_dir().glob("*.arrow"))
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("CSV should not be parsed again")
+
+    monkeypatch.setattr(schema, "iter_csv_with_schema", _fail)
+    second = schema.load_csv_with_schema(path, invoice_schema, None, settings)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_key_depends_on_mapping_and_max_rows() -> None:
+    columns = {"invoice_id": "string"}
+    base = cache.parsed_cache_key("abc", columns, None, None)
+    assert base != cache.parsed_cache_key("abc", columns, {"invoice_id": "No"}, None)
+    assert base != cache.parsed_cache_key("abc", columns, None, 10)
+    assert base == cache.parsed_cache_key("abc", columns, {}, None)
+
+
+def test_evict_removes_least_recently_used(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    frame = pd.DataFrame({"value": range(1000)})
+    cache.store_parsed("old", frame, max_bytes=10**6)
+    cache.store_parsed("new", frame, max_bytes=10**6)
+    parsed_dir = cache.get_parsed_dir()
+    os.utime(parsed_dir / "old.arrow", ns=(1, 1))
+    entry_size = (parsed_dir / "new.arrow").stat().st_size
+
+    cache.evict_parsed(entry_size)
+    assert not (parsed_dir / "old.arrow").exists()
+    assert (parsed_dir / "new.arrow").exists()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from core import classifier
+from core.classifier import TicketClassifier, collect_training_data
+from core.llm import LLMClient
+from plugins.ticket_triage import rules
+from plugins.ticket_triage.plugin import TicketTriagePlugin
+
+
+TRAINING = [
+    ("kargo gecikti nerede", "delivery"),
+    ("kargom hala gelmedi", "delivery"),
+    ("teslimat yapılmadı", "delivery"),
+    ("shipping is late", "delivery"),
+    ("iade istiyorum", "refund"),
+    ("ürünü iade etmek istiyorum", "refund"),
+    ("refund my order", "refund"),
+    ("param iade edilmedi", "refund"),
+    ("kartımdan iki kez ödeme çekildi", "billing"),
+    ("fatura hatalı", "billing"),
+    ("payment charged twice", "billing"),
+    ("ödeme başarısız oldu", "billing"),
+]
+
+
+def _trained() -> TicketClassifier:
+    texts, labels = zip(*TRAINING)
+    return TicketClassifier.train(list(texts), list(labels))
+
+
+def test_classifier_predicts_training_labels() -> None:
+    model = _trained()
+    labels, confidence = model.predict(["Kargo gecikti!", "iade istiyorum", "fatura hatalı"])
+    assert labels == ["delivery", "refund", "billing"]
+    assert confidence.shape == (3,)
+    assert ((confidence > 0) & (confidence <= 1)).all()
+
+
+def test_classifier_round_trips_through_file(tmp_path) -> None:
+    model = _trained()
+    path = tmp_path / "model.npz"
+    model.save(path)
+    loaded = TicketClassifier.load(path)
+    texts = [text for text, _ in TRAINING]
+    assert loaded.predict(texts)[0] == model.predict(texts)[0]
+    assert path.stat().st_size < 1_000_000
+
+
+def test_collect_training_data_skips_untrusted_sources(tmp_path) -> None:
+    artifacts = tmp_path / "run-a" / "artifacts"
+    artifacts.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "ticket_id": ["T1", "T2", "T3", "T4"],
+            "text": ["kargo gecikti", "iade", "fatura", "kargo gecikti"],
+            "category": ["delivery", "refund", "billing", "shipping"],
+            "source": ["input", "heuristic", "classifier", "llm"],
+        }
+    ).to_csv(artifacts / classifier.CATEGORIES_ARTIFACT, index=False)
+
+    data = collect_training_data(tmp_path)
+    assert data[["text", "category"]].values.tolist() == [["kargo gecikti", "shipping"]]
+
+
+def test_only_low_confidence_texts_reach_llm() -> None:
+    model = _trained()
+    llm = LLMClient(None)
+    calls = []
+    llm.categorize_many_with_sources = lambda texts: calls.append(texts) or (
+        ["general"] * len(texts),
+        ["heuristic"] * len(texts),
+    )
+    texts = ["kargo gecikti nerede", "tamamen alakasız bir cümle"]
+    labels, sources = rules.categorize_many(texts, llm, model, min_confidence=0.8)
+
+    assert labels == ["delivery", "general"]
+    assert sources == ["classifier", "heuristic"]
+    assert calls == [["tamamen alakasız bir cümle"]]
+
+
+def test_plugin_writes_categories_artifact(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _trained().save(classifier.get_model_path())
+    csv_path = tmp_path / "tickets.csv"
+    csv_path.write_text(
+        "ticket_id,created_at,channel,customer_text,category,order_id,amount\n"
+        "T1,2024-01-01,email,kargo gecikti nerede,,ORD-1,10\n"
+        "T2,2024-01-01,email,tamamen alakasız bir cümle,,ORD-2,10\n"
+        "T3,2024-01-01,email,fatura hatalı,billing,ORD-3,10\n",
+        encoding="utf-8",
+    )
+    result = TicketTriagePlugin().analyze(
+        inputs={"tickets": csv_path}, llm=LLMClient(None), run_id="run-classifier"
+    )
+    step = next(step for step in result.steps if step.action == "CATEGORIZE")
+    assert "classifier_labelled=1" in step.evidence
+    assert "sent_to_llm=1" in step.evidence
+
+    artifact = next(item for item in result.artifacts if item.type == "csv")
+    written = pd.read_csv(artifact.path, dtype="string")
+    assert written["source"].tolist() == ["classifier", "heuristic", "input"]
+    assert written["category"].tolist()[0] == "delivery"
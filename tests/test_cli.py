@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core import cli, storage
+
+
+ROOT = Path(__file__).resolve().parent.parent
+EDOC_SAMPLES = ROOT / "plugins" / "edocument_audit" / "sample_inputs"
+
+
+def _write_manifest(tmp_path: Path) -> Path:
+    tenant = tmp_path / "tenant-a"
+    tenant.mkdir()
+    for name in ("invoices.csv", "purchase_orders.csv", "delivery_notes.csv"):
+        shutil.copyfile(EDOC_SAMPLES / name, tenant / name)
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "runs": [
+                    {
+                        "name": "tenant-a",
+                        "demo_type": "edoc",
+                        "inputs": {
+                            "invoices": "tenant-a/invoices.csv",
+                            "purchase_orders": "tenant-a/purchase_orders.csv",
+                            "delivery_notes": "tenant-a/delivery_notes.csv",
+                        },
+                    },
+                    {
+                        "name": "broken",
+                        "demo_type": "edoc",
+                        "inputs": {"invoices": "missing/invoices.csv"},
+                    },
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    return manifest
+
+
+def test_batch_isolates_failures_and_writes_summary(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    output = tmp_path / "summary.csv"
+    code = cli.main(
+        ["batch", str(_write_manifest(tmp_path)), "--workers", "2", "--output", str(output)]
+    )
+    assert code == 1
+
+    with output.open("r", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["name"] for row in rows] == ["tenant-a", "broken"]
+    assert rows[0]["status"] == "done"
+    assert int(rows[0]["issues"]) > 0
+    assert (tmp_path / "runs" / rows[0]["run_id"] / "audit.json").exists()
+    assert rows[1]["status"] == "failed"
+    assert "FileNotFoundError" in rows[1]["error"]
+
+
+def _crash_on_entry(entry: dict) -> dict:
+    """Stand-in runner that registers its run, then dies on the "crash" entry."""
+    started = datetime.now(timezone.utc)
+    storage.upsert_index_entry(entry["run_id"], entry["demo_type"], started)
+    if entry["name"] == "crash":
+        os._exit(1)
+    time.sleep(0.2)
+    storage.upsert_index_entry(
+        entry["run_id"], entry["demo_type"], started, datetime.now(timezone.utc)
+    )
+    return {
+        "name": entry["name"],
+        "demo_type": entry["demo_type"],
+        "run_id": entry["run_id"],
+        "status": "done",
+    }
+
+
+def test_dead_worker_only_fails_its_own_entry(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    names = ["a", "crash", "b", "c", "d"]
+    entries = [{"name": name, "demo_type": "edoc", "inputs": {}} for name in names]
+    rows = cli.run_batch(entries, workers=2, runner=_crash_on_entry)
+
+    assert [row["name"] for row in rows] == names
+    assert [row["status"] for row in rows] == ["done", "failed", "done", "done", "done"]
+    assert "BrokenProcessPool" in rows[1]["error"]
+    index = storage.load_index()
+    assert sorted(entry["run_id"] for entry in index) == sorted(
+        row["run_id"] for row in rows if row["status"] == "done"
+    )
+    assert all(entry["finished_at"] for entry in index)
+
+
+def test_cli_does_not_import_streamlit() -> None:
+    code = "import sys, core.cli, core.engine; print('streamlit' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
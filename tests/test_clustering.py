@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+
+from core.llm import LLMClient
+from plugins.ticket_triage.clustering import cluster_texts, lsh_bands
+from plugins.ticket_triage.plugin import TicketTriagePlugin
+
+
+def test_near_duplicates_share_a_cluster() -> None:
+    texts = [
+        "Kargom gelmedi!",
+        "iade istiyorum",
+        "kargom  gelmedi",
+        "KARGOM GELMEDİ :(",
+        "payment failed twice",
+        "",
+    ]
+    result = cluster_texts(texts, threshold=0.6)
+    assert result.labels.tolist() == [0, 1, 0, 0, 2, 3]
+    assert result.sizes.tolist() == [3, 1, 1, 1]
+    assert result.representatives().tolist() == [0, 1, 4, 5]
+
+
+def test_cluster_texts_handles_empty_input() -> None:
+    result = cluster_texts([])
+    assert len(result.labels) == 0
+    assert len(result.sizes) == 0
+
+
+def test_lsh_bands_stay_at_or_below_threshold() -> None:
+    for threshold in (0.5, 0.6, 0.7, 0.9):
+        bands, rows = lsh_bands(threshold)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_plugin_writes_clusters_and_categorizes_representatives(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"cluster_similarity": 60, "cluster_representatives": True}),
+        encoding="utf-8",
+    )
+    csv_path = tmp_path / "tickets.csv"
+    csv_path.write_text(
+        "ticket_id,created_at,channel,customer_text,category,order_id,amount\n"
+        "T1,2024-01-01,email,Kargom gelmedi!,,ORD-1,10\n"
+        "T2,2024-01-01,email,kargom gelmedi,,ORD-2,10\n"
+        "T3,2024-01-01,email,KARGOM GELMEDİ :(,,ORD-3,10\n"
+        "T4,2024-01-01,email,iade istiyorum,,ORD-4,10\n",
+        encoding="utf-8",
+    )
+    llm = LLMClient(None)
+    calls = []
+    original = llm.categorize_many_with_sources
+    monkeypatch.setattr(
+        llm,
+        "categorize_many_with_sources",
+        lambda texts: calls.append(texts) or original(texts),
+    )
+    result = TicketTriagePlugin().analyze(
+        inputs={"tickets": csv_path}, llm=llm, run_id="run-clusters"
+    )
+
+    step = next(step for step in result.steps if step.action == "CLUSTER_TICKETS")
+    assert step.evidence[:3] == [
+        "clusters=2",
+        "near_duplicate_tickets=3",
+        "largest_cluster=3",
+    ]
+    assert step.evidence[3].startswith("cluster_id=0 size=3 sample=Kargom gelmedi!")
+    assert calls == [["Kargom gelmedi!", "iade istiyorum"]]
+
+    clusters_csv = next(
+        item.path for item in result.artifacts if item.path.endswith("clusters.csv")
+    )
+    written = pd.read_csv(clusters_csv)
+    assert written["cluster_id"].tolist() == [0, 0, 0, 1]
+    assert written["cluster_size"].tolist() == [3, 3, 3, 1]
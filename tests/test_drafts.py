@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from plugins.ticket_triage.drafts import PLACEHOLDER, render_body, write_drafts
+
+
+class _FakeLLM:
+    def __init__(self, keep_placeholder: bool = True) -> None:
+        self.calls = 0
+        self.keep_placeholder = keep_placeholder
+        self._lock = threading.Lock()
+
+    def improve_email(self, draft: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if not self.keep_placeholder:
+            return draft.replace(PLACEHOLDER, "")
+        return draft.replace("Merhaba,", "Merhaba, değerli müşterimiz,")
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_one_draft_per_ticket(tmp_path) -> None:
+    path = tmp_path / "drafts.jsonl"
+    stats = write_drafts(
+        path,
+        ticket_ids=["T1", "T2", None],
+        categories=["return", "delivery", "return"],
+        missing={1: ["order_id", "amount"]},
+        severities=["high", "low", "high"],
+    )
+    records = _read(path)
+    assert [record["ticket_id"] for record in records] == ["T1", "T2", "unknown"]
+    assert "Talep numaranız: T1" in records[0]["draft"]
+    assert "öncelikli" in records[0]["draft"]
+    assert "sipariş numaranız, işlem tutarı" in records[1]["draft"]
+    assert records[1]["missing"] == ["order_id", "amount"]
+    assert stats.drafts == 3
+    assert stats.templates == 2
+    assert stats.per_second > 0
+
+
+def test_llm_improves_each_template_once(tmp_path) -> None:
+    path = tmp_path / "drafts.jsonl"
+    llm = _FakeLLM()
+    stats = write_drafts(
+        path,
+        ticket_ids=[f"T{index}" for index in range(100)],
+        categories=["return", "payment"] * 50,
+        missing={},
+        severities=["low"] * 100,
+        llm=llm,
+        workers=4,
+    )
+    assert llm.calls == 2
+    assert stats.improved == 2
+    records = _read(path)
+    assert records[7]["draft"].startswith("Merhaba, değerli müşterimiz,")
+    assert "Talep numaranız: T7" in records[7]["draft"]
+
+
+def test_improvement_that_drops_ticket_id_is_ignored(tmp_path) -> None:
+    path = tmp_path / "drafts.jsonl"
+    stats = write_drafts(
+        path,
+        ticket_ids=["T1"],
+        categories=["general"],
+        missing={},
+        severities=["low"],
+        llm=_FakeLLM(keep_placeholder=False),
+    )
+    assert stats.improved == 0
+    assert _read(path)[0]["draft"] == render_body("general", (), "low").replace(
+        PLACEHOLDER, "T1"
+    )
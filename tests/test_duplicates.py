@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from plugins.edocument_audit import duplicates
+from plugins.edocument_audit.duplicates import (
+    HashedDuplicateTracker,
+    SpillingDuplicateDetector,
+)
+
+
+def test_tracker_finds_duplicates_across_chunks() -> None:
+    tracker = HashedDuplicateTracker()
+    chunks = [
+        pd.Series(["A", "B", None], dtype="string"),
+        pd.Series(["C", "A"], dtype="string"),
+        pd.Series(["D", "C", "C"], dtype="string"),
+    ]
+    for chunk in chunks:
+        tracker.add(chunk)
+    assert tracker.duplicates(pd.concat(chunks, ignore_index=True)) == ["A", "C"]
+
+
+def test_tracker_verifies_hash_collisions(monkeypatch) -> None:
+    monkeypatch.setattr(
+        duplicates, "hash_ids", lambda values: np.zeros(len(values), dtype="uint64")
+    )
+    tracker = HashedDuplicateTracker()
+    values = pd.Series(["A", "B", "C"], dtype="string")
+    tracker.add(values)
+    assert tracker.candidate_hashes().size == 1
+    assert tracker.duplicates(values) == []
+
+
+def test_spilling_detector_matches_in_memory_tracker(tmp_path) -> None:
+    rng = np.random.default_rng(7)
+    chunks = [
+        pd.Series([f"INV-{i}" for i in rng.integers(0, 3000, 1000)], dtype="string")
+        for _ in range(5)
+    ]
+    tracker = HashedDuplicateTracker()
+    # A tiny budget forces spills and a second partitioning pass.
+    detector = SpillingDuplicateDetector(4096, partitions=4, directory=tmp_path)
+    for chunk in chunks:
+        tracker.add(chunk)
+        detector.add(chunk)
+    expected = tracker.duplicates(pd.concat(chunks, ignore_index=True))
+    assert detector.spilled_bytes > 0
+    assert detector.duplicates() == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spilling_detector_keeps_unicode_ids(tmp_path) -> None:
+    detector = SpillingDuplicateDetector(1024 * 1024, partitions=2, directory=tmp_path)
+    detector.add(pd.Series(["FATURA-Ş1", "FATURA-İ2", None], dtype="string"))
+    detector.add(pd.Series(["FATURA-Ş1"], dtype="string"))
+    assert detector.duplicates() == ["FATURA-Ş1"]
+
+
+def test_spilling_detector_charges_each_buffered_id(tmp_path) -> None:
+    budget = 40 * SpillingDuplicateDetector.BYTES_PER_ID_IN_MEMORY
+    detector = SpillingDuplicateDetector(budget, partitions=2, directory=tmp_path)
+    detector.add(pd.Series([f"A{index}" for index in range(10)]))
+    assert detector.spilled_bytes == 0
+    detector.add(pd.Series(["A10"]))
+    assert detector.spilled_bytes > 0
+    detector.close()
@@ -4,9 +4,13 @@ import json
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
+from core import io as io_utils
 from core.audit import AuditTrailReader, AuditTrailWriter
 from core.engine import Engine
+from core.progress import STEP_FINISHED, RunCancelled, RunContext
+from plugins.edocument_audit import duplicates
 from plugins.edocument_audit.plugin import EDocumentAuditPlugin
 
 
@@ -127,3 +131,93 @@ def test_edoc_reference_checks(tmp_path, monkeypatch) -> None:
     rules = set(issues_df["rule"].tolist())
     assert "VENDOR_NOT_ALLOWED" in rules
     assert "VAT_RATE_NOT_ALLOWED" in rules
+
+
+def test_edoc_load_step_reports_per_file_timings(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    inputs = _write_edoc_inputs(tmp_path)
+    vendors = tmp_path / "vendors.csv"
+    vendors.write_text("vendor\nVendor A\n", encoding="utf-8")
+    inputs["vendors"] = vendors
+
+    plugin = EDocumentAuditPlugin()
+    result = plugin.analyze(inputs=inputs, llm=None, run_id="run-edoc-load")
+    load_step = next(step for step in result.steps if step.action == "LOAD_INPUTS")
+    timed = {item.split("]")[0][len("load_ms["):] for item in load_step.evidence if item.startswith("load_ms[")}
+    assert timed == {"invoices", "purchase_orders", "delivery_notes", "vendors"}
+
+
+def test_edoc_chunked_duplicates_read_invoices_once(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    inputs = _write_edoc_inputs(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"chunk_size": 2, "cache_max_mb": None}), encoding="utf-8"
+    )
+    reads: list[Path] = []
+    original = io_utils.iter_csv_chunks
+
+    def _counting(path, *args, **kwargs):
+        reads.append(Path(path))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(io_utils, "iter_csv_chunks", _counting)
+    plugin = EDocumentAuditPlugin()
+    result = plugin.analyze(inputs=inputs, llm=None, run_id="run-edoc-chunked")
+    duplicate_step = next(step for step in result.steps if step.action == "DUPLICATE_CHECK")
+    assert duplicate_step.evidence == ["Mükerrer invoice_id tespit edildi: INV-002"]
+    assert reads.count(inputs["invoices"]) == 1
+
+
+def test_edoc_chunked_duplicates_spill_to_disk(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    inputs = _write_edoc_inputs(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"chunk_size": 2, "cache_max_mb": None, "duplicate_memory_mb": 1}),
+        encoding="utf-8",
+    )
+    plugin = EDocumentAuditPlugin()
+    result = plugin.analyze(inputs=inputs, llm=None, run_id="run-edoc-spill")
+    duplicate_step = next(step for step in result.steps if step.action == "DUPLICATE_CHECK")
+    assert duplicate_step.evidence == ["Mükerrer invoice_id tespit edildi: INV-002"]
+    assert list((tmp_path / "runs" / "_cache").glob("dup-*")) == []
+
+
+def test_duplicate_budget_applies_without_chunking(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    inputs = _write_edoc_inputs(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"cache_max_mb": None, "duplicate_memory_mb": 1}), encoding="utf-8"
+    )
+    created = []
+    original = duplicates.SpillingDuplicateDetector.__init__
+
+    def _tracking_init(self, *args, **kwargs) -> None:
+        original(self, *args, **kwargs)
+        created.append(self._dir)
+
+    monkeypatch.setattr(duplicates.SpillingDuplicateDetector, "__init__", _tracking_init)
+    result = EDocumentAuditPlugin().analyze(inputs=inputs, llm=None, run_id="run-edoc-budget")
+    duplicate_step = next(step for step in result.steps if step.action == "DUPLICATE_CHECK")
+    assert duplicate_step.evidence == ["Mükerrer invoice_id tespit edildi: INV-002"]
+    assert len(created) == 1 and not created[0].exists()
+
+
+def test_cancelled_run_removes_duplicate_spill_dir(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    inputs = _write_edoc_inputs(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"chunk_size": 2, "cache_max_mb": None, "duplicate_memory_mb": 1}),
+        encoding="utf-8",
+    )
+    context = RunContext("run-edoc-cancel")
+
+    def _cancel_before_duplicates(event) -> None:
+        if event.kind == STEP_FINISHED and event.action == "LOAD_INPUTS":
+            context.token.cancel()
+
+    context.subscribe(_cancel_before_duplicates)
+    with pytest.raises(RunCancelled):
+        EDocumentAuditPlugin().analyze(
+            inputs=inputs, llm=None, run_id="run-edoc-cancel", context=context
+        )
+    assert list((tmp_path / "runs" / "_cache").glob("dup-*")) == []
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from plugins.edocument_audit import rules, vectorized_rules
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    invoices = pd.DataFrame(
+        {
+            "invoice_id": ["INV-1", "INV-2", "INV-3", "INV-4", "INV-5", "INV-6"],
+            "vendor": ["Vendor A", " vendor a ", "Vendor B", "Vendor C", "", "Vendor B"],
+            "subtotal": [100.0, 200.0, 150.0, 0.125, 1000.0, 19.99],
+            "vat_rate": [0.18, 18.0, 0.18, 0.08, 0.2, 0.18],
+            "vat_amount": [18.0, 36.0, 30.0, 0.01, 200.0, 3.6],
+            "total": [118.0, 240.0, 170.0, 0.145, 1200.0, 23.59],
+            "po_id": ["PO-1", "PO-2", "PO-9", "PO-3", "PO-3", "PO-1"],
+            "dn_id": ["DN-1", "DN-2", "DN-3", "DN-9", "DN-3", "DN-2"],
+        }
+    )
+    purchase_orders = pd.DataFrame(
+        {"po_id": ["PO-1", "PO-2", "PO-3", "PO-2"], "item_count": [2, 3, 1, 4]}
+    )
+    delivery_notes = pd.DataFrame(
+        {"dn_id": ["DN-1", "DN-2", "DN-3"], "delivered_item_count": [2, 4, 2]}
+    )
+    return invoices, purchase_orders, delivery_notes
+
+
+def test_vectorized_rules_match_row_wise_rules() -> None:
+    invoices, purchase_orders, delivery_notes = _frames()
+
+    assert vectorized_rules.find_total_mismatch(invoices) == rules.find_total_mismatch(invoices)
+    assert vectorized_rules.find_vat_mismatch(invoices) == rules.find_vat_mismatch(invoices)
+    assert vectorized_rules.find_missing_po_dn(
+        invoices, purchase_orders, delivery_notes
+    ) == rules.find_missing_po_dn(invoices, purchase_orders, delivery_notes)
+    assert vectorized_rules.find_three_way_mismatch(
+        invoices, purchase_orders, delivery_notes
+    ) == rules.find_three_way_mismatch(invoices, purchase_orders, delivery_notes)
+    assert vectorized_rules.find_unapproved_vendors(
+        invoices, ["Vendor A"]
+    ) == rules.find_unapproved_vendors(invoices, ["Vendor A"])
+    assert vectorized_rules.find_disallowed_vat_rates(
+        invoices, [18, 0.2]
+    ) == rules.find_disallowed_vat_rates(invoices, [18, 0.2])
+
+
+def test_vectorized_rules_match_on_random_amounts() -> None:
+    rng = np.random.default_rng(7)
+    size = 2000
+    subtotal = np.round(rng.uniform(0, 5000, size), 2)
+    vat_rate = rng.choice([0.01, 0.08, 0.18, 0.2], size)
+    vat_amount = np.round(subtotal * vat_rate, 2) + rng.choice([0, 0, 0, 0.01, 0.02], size)
+    total = np.round(subtotal + vat_amount, 2) + rng.choice([0, 0, 0, 0.01, -0.015], size)
+    invoices = pd.DataFrame(
+        {
+            "invoice_id": [f"INV-{i}" for i in range(size)],
+            "subtotal": subtotal,
+            "vat_rate": vat_rate,
+            "vat_amount": vat_amount,
+            "total": total,
+        }
+    )
+
+    assert vectorized_rules.find_total_mismatch(invoices) == rules.find_total_mismatch(invoices)
+    assert vectorized_rules.find_vat_mismatch(invoices) == rules.find_vat_mismatch(invoices)
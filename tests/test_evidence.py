@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+
+from core import evidence, storage
+from core.engine import Engine
+from core.models import StepRecord
+from plugins.edocument_audit.plugin import EDocumentAuditPlugin
+
+
+EDOC_SAMPLES = Path(__file__).resolve().parent.parent / "plugins" / "edocument_audit" / "sample_inputs"
+
+
+def _step(items: int) -> StepRecord:
+    return StepRecord(
+        title="Toplam hesap kontrolü",
+        action="TOTAL_CHECK",
+        severity="medium",
+        evidence=[f"INV-{index}" for index in range(items)],
+        decision="Toplam uyuşmazlığı bulundu",
+        requires_approval=False,
+        status="done",
+    )
+
+
+def test_small_evidence_stays_inline(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    step = _step(5)
+    assert evidence.spill_step("run-1", step, threshold=5) is step
+    assert evidence.spill_step("run-1", step, threshold=None) is step
+    assert evidence.read_evidence("run-1", step, 3, 10) == ["INV-3", "INV-4"]
+
+
+def test_large_evidence_is_spilled_and_paged(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(evidence, "ROW_GROUP_SIZE", 100)
+    spilled = evidence.spill_step("run-2", _step(1000), threshold=10)
+
+    assert spilled.evidence == [f"INV-{index}" for index in range(evidence.SAMPLE_SIZE)]
+    assert spilled.evidence_count == 1000
+    assert evidence.evidence_count(spilled) == 1000
+    assert (tmp_path / "runs" / "run-2" / spilled.evidence_ref).exists()
+    assert evidence.read_evidence("run-2", spilled, 95, 10) == [
+        f"INV-{index}" for index in range(95, 105)
+    ]
+    assert evidence.read_evidence("run-2", spilled, 995, 50) == [
+        f"INV-{index}" for index in range(995, 1000)
+    ]
+    assert evidence.read_evidence("run-2", spilled, 2000, 50) == []
+
+
+def test_engine_spills_evidence_above_setting(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "settings.json").write_text(
+        json.dumps({"evidence_spill_threshold": 1}), encoding="utf-8"
+    )
+    inputs = {}
+    for name in ("invoices", "purchase_orders", "delivery_notes"):
+        inputs[name] = tmp_path / f"{name}.csv"
+        shutil.copyfile(EDOC_SAMPLES / f"{name}.csv", inputs[name])
+    result = Engine(registry={"edoc": EDocumentAuditPlugin()}).run("edoc", inputs)
+
+    audit = storage.load_run(result.run_id)
+    spilled = [step for step in audit.steps if step.evidence_ref]
+    assert spilled
+    for step in spilled:
+        full = evidence.read_evidence(result.run_id, step, 0, step.evidence_count)
+        assert len(full) == step.evidence_count > 1
+        assert full[: len(step.evidence)] == step.evidence
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from core import io as io_utils
+
+
+def _write_quoted_csv(path: Path, rows: int) -> Path:
+    lines = ["id,text,amount"]
+    for index in range(rows):
+        text = f'"line {index}\nwith ""quoted"" newline"' if index % 3 == 0 else f"plain {index}"
+        lines.append(f"{index},{text},{index * 10}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_split_points_respect_quoted_newlines(tmp_path) -> None:
+    path = _write_quoted_csv(tmp_path / "quoted.csv", 200)
+    boundaries = io_utils.find_csv_split_points(path, parts=7, block_size=64)
+    assert boundaries[-1] == path.stat().st_size
+    assert len(boundaries) > 2
+
+    header = io_utils.read_csv_header(path)
+    parts = [
+        io_utils.read_csv_byte_range(path, start, end, header)
+        for start, end in zip(boundaries, boundaries[1:])
+    ]
+    combined = pd.concat(parts, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, pd.read_csv(path))
+
+
+def test_split_points_for_header_only_file(tmp_path) -> None:
+    path = tmp_path / "empty.csv"
+    path.write_text("id,text\n", encoding="utf-8")
+    size = path.stat().st_size
+    assert io_utils.find_csv_split_points(path, parts=4) == [size, size]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from core import jobs
+from core.engine import RunResult
+from core.schema import SchemaValidationError
+
+
+class _BlockingEngine:
+    def __init__(self, release: threading.Event, fail: Exception | None = None) -> None:
+        self.release = release
+        self.fail = fail
+
+    def run(self, demo_type, inputs, run_id=None, context=None):
+        while not self.release.wait(timeout=0.01):
+            context.check()
+        if self.fail is not None:
+            raise self.fail
+        return RunResult(run_id=run_id, summary=f"{demo_type} ok", artifacts=[])
+
+
+def _wait(manager: jobs.JobManager, run_id: str) -> dict:
+    manager._futures[run_id].result(timeout=5)
+    return manager.poll(run_id)
+
+
+def _wait_running(manager: jobs.JobManager, run_id: str) -> None:
+    deadline = time.monotonic() + 5
+    while manager.poll(run_id)["status"] != jobs.RUNNING and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_submitted_job_reports_status_until_done(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    release = threading.Event()
+    manager = jobs.JobManager(1, engine_factory=lambda: _BlockingEngine(release))
+    run_id = manager.submit("ticket", {}, run_id="run-1")
+
+    assert manager.poll(run_id)["status"] in {jobs.QUEUED, jobs.RUNNING}
+    release.set()
+    job = _wait(manager, run_id)
+    assert job["status"] == jobs.DONE
+    assert job["summary"] == "ticket ok"
+    assert (tmp_path / "runs" / "run-1" / jobs.JOB_FILENAME).exists()
+    manager.shutdown()
+
+
+def test_queued_and_running_jobs_can_be_cancelled(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    release = threading.Event()
+    manager = jobs.JobManager(1, engine_factory=lambda: _BlockingEngine(release))
+    manager.submit("ticket", {}, run_id="first")
+    _wait_running(manager, "first")
+    manager.submit("ticket", {}, run_id="second")
+
+    assert manager.cancel("second") is True
+    assert manager.poll("second")["status"] == jobs.CANCELLED
+    assert manager.cancel("first") is True
+    assert _wait(manager, "first")["status"] == jobs.CANCELLED
+    assert manager.cancel("first") is False
+    manager.shutdown()
+
+
+def test_failures_keep_schema_messages(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    release = threading.Event()
+    release.set()
+    error = SchemaValidationError(["customer_text eksik"])
+    manager = jobs.JobManager(1, engine_factory=lambda: _BlockingEngine(release, error))
+    run_id = manager.submit("ticket", {})
+
+    job = _wait(manager, run_id)
+    assert job["status"] == jobs.FAILED
+    assert job["messages"] == ["customer_text eksik"]
+    manager.shutdown()
+
+
+def test_unfinished_job_from_another_process_is_interrupted(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    jobs._write_job("old", {"run_id": "old", "status": jobs.RUNNING})
+    manager = jobs.JobManager(1)
+    assert manager.poll("old")["status"] == jobs.INTERRUPTED
+    assert jobs.read_job("old")["status"] == jobs.RUNNING
+    assert manager.poll("missing") is None
+    manager.shutdown()
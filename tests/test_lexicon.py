@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+
+from core import lexicon
+from core.lexicon import KeywordGroup, KeywordMatcher, fold_text
+from core.llm import _heuristic_category
+from plugins.ticket_triage import rules
+
+
+def test_fold_text_uses_turkish_i_rules() -> None:
+    assert fold_text("İADE") == "iade"
+    assert fold_text("ACİL") == "acil"
+    assert fold_text("SHIPPING") == "shipping"
+    assert fold_text("ÖDEME") == "ödeme"
+
+
+def test_capitalized_turkish_keywords_are_matched() -> None:
+    assert _heuristic_category("İADE talebim var") == "return"
+    assert _heuristic_category("ÖDEME alınmadı") == "payment"
+    assert rules.priority_score("ACİL İADE", None) == (4, "high")
+
+
+def test_overlapping_keywords_from_different_groups_all_count() -> None:
+    matcher = KeywordMatcher(
+        [
+            KeywordGroup("long", ("paralel",), weight=1),
+            KeywordGroup("short", ("para",), weight=2),
+        ]
+    )
+    assert matcher.score(matcher.mask("paralel")) == 3
+
+
+def test_column_masks_match_single_text_masks() -> None:
+    matcher = lexicon.default_matcher()
+    texts = pd.Series(
+        ["urgent refund", "İade ve ödeme", "", "kargo HEMEN", "nothing here", "parapara"],
+        dtype=object,
+    )
+    assert matcher.masks(texts).tolist() == [matcher.mask(text) for text in texts]
+    assert matcher.masks(pd.Series(["acil", None], dtype=object)).tolist()[1] == 0
+
+
+def test_lexicon_file_overrides_defaults(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "lexicon.json").write_text(
+        json.dumps(
+            {
+                "groups": [
+                    {
+                        "name": "fraud",
+                        "category": "fraud",
+                        "weight": 4,
+                        "keywords": ["dolandırıcı"],
+                    },
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert _heuristic_category("DOLANDIRICI var") == "fraud"
+    assert rules.priority_score("iade", None) == (0, "low")
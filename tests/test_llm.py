@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from core.llm import (
+    LLMClient,
+    LLMResponseCache,
+    RateLimiter,
+    _heuristic_category,
+    parse_batch_labels,
+)
+from core.mock_openai import start_mock_server
+
+
+TEXTS = [
+    "Kargo nerede?",
+    "I want a refund",
+    "payment failed, contact me at jane@example.com",
+    "merhaba",
+    "return label please",
+]
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def _start(**kwargs):
+        server = start_mock_server(**kwargs)
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_categorize_many_batches_requests_in_order(mock_server) -> None:
+    server = mock_server(latency_ms=20)
+    client = LLMClient(
+        api_key="test",
+        use_openai=True,
+        base_url=server.base_url,
+        batch_size=2,
+        max_workers=3,
+    )
+    texts = TEXTS * 4
+    assert client.categorize_many(texts) == [_heuristic_category(t) for t in texts]
+    assert server.request_count == 10
+
+
+def test_categorize_many_retries_failed_requests(mock_server) -> None:
+    server = mock_server(fail_every=2)
+    client = LLMClient(
+        api_key="test",
+        use_openai=True,
+        base_url=server.base_url,
+        batch_size=len(TEXTS),
+        max_retries=2,
+    )
+    client.categorize_many(TEXTS)
+    # The second request fails with 500 and is retried by the shared client.
+    assert client.categorize_many(TEXTS) == [_heuristic_category(t) for t in TEXTS]
+    assert server.request_count == 3
+
+
+def test_fallback_labels_are_not_reported_as_llm(mock_server) -> None:
+    server = mock_server(fail_every=2)
+    client = LLMClient(
+        api_key="test",
+        use_openai=True,
+        base_url=server.base_url,
+        batch_size=len(TEXTS),
+        max_retries=0,
+    )
+    assert client.categorize_many_with_sources(TEXTS)[1] == ["llm"] * len(TEXTS)
+    labels, sources = client.categorize_many_with_sources(TEXTS)
+    assert labels == [_heuristic_category(t) for t in TEXTS]
+    assert sources == ["heuristic"] * len(TEXTS)
+
+
+def test_categorize_many_offline_uses_heuristic() -> None:
+    client = LLMClient(api_key=None, use_openai=True)
+    assert client.categorize_many(TEXTS) == [_heuristic_category(t) for t in TEXTS]
+
+
+def test_parse_batch_labels_rejects_wrong_count() -> None:
+    assert parse_batch_labels('```json\n["Return", "spam"]\n```', 2) == ["return", "general"]
+    assert parse_batch_labels('["return"]', 2) is None
+    assert parse_batch_labels("return, general", 2) is None
+
+
+def test_rate_limiter_spaces_calls() -> None:
+    limiter = RateLimiter(per_minute=1200)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.14
+
+
+def test_cached_answers_skip_requests_and_hold_no_raw_text(mock_server, tmp_path) -> None:
+    server = mock_server()
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    client = LLMClient(
+        api_key="test",
+        use_openai=True,
+        base_url=server.base_url,
+        batch_size=2,
+        cache=cache,
+    )
+    first = client.categorize_many(TEXTS)
+    requests = server.request_count
+    assert client.categorize_many(TEXTS) == first
+    assert client.categorize(TEXTS[0]) == first[0]
+    assert server.request_count == requests
+    assert client.cache_stats() == {"hits": 6, "misses": 5}
+
+    client.improve_email("Merhaba jane@example.com")
+    client.improve_email("Merhaba jane@example.com")
+    assert server.request_count == requests + 1
+    cache.close()
+    stored = b"".join(path.read_bytes() for path in tmp_path.iterdir())
+    assert b"jane@example.com" not in stored
+    assert b"Kargo" not in stored
+
+
+def test_cache_evicts_least_recently_used_and_expired(tmp_path) -> None:
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_days=1, max_entries=2)
+    cache.put_many({"a": "1", "b": "2"})
+    cache.get("a")
+    cache.put("c", "3")
+    cache.evict()
+    assert cache.get_many(["a", "b", "c"]) == {"a": "1", "c": "3"}
+
+    cache.ttl_seconds = -1
+    assert cache.get("a") is None
+    cache.evict()
+    assert len(cache) == 0
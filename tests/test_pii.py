@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from core.llm import LLMClient
+from core.pii import mask_series, mask_text, mask_texts
+from plugins.ticket_triage.plugin import TicketTriagePlugin
+
+
+def test_each_kind_is_masked() -> None:
+    assert mask_text("yaz: ali.veli@example.com") == "yaz: [EMAIL_MASKED]"
+    assert mask_text("IBAN TR33 0006 1005 1978 6457 8413 26") == "IBAN [IBAN_MASKED]"
+    assert mask_text("kart 4111 1111 1111 1111") == "kart [CARD_MASKED]"
+    assert mask_text("TC 10000000146") == "TC [TCKN_MASKED]"
+    assert mask_text("tel 0532 123 45 67") == "tel [PHONE_MASKED]"
+    assert mask_text("+90 532 123 4567 arayın") == "[PHONE_MASKED] arayın"
+    assert mask_text("sipariş no: 123456 gelmedi") == "[ORDER_MASKED] gelmedi"
+    assert mask_text("ORD-00123 kargo") == "[ORDER_MASKED] kargo"
+
+
+def test_numbers_failing_checksums_are_kept() -> None:
+    assert mask_text("kart 4111 1111 1111 1112") == "kart 4111 1111 1111 1112"
+    assert mask_text("TC 12345678901") == "TC 12345678901"
+    assert mask_text("2024-01-01 tarihinde 1200 TL") == "2024-01-01 tarihinde 1200 TL"
+
+
+def test_numbers_next_to_a_rejected_card_are_still_masked() -> None:
+    assert mask_text("TC 10000000146 0532 123 45 67") == "TC [TCKN_MASKED] [PHONE_MASKED]"
+    assert (
+        mask_text("tel 0532 123 45 67 1234 nolu siparis")
+        == "tel [PHONE_MASKED] 1234 nolu siparis"
+    )
+
+
+def test_mask_texts_counts_matches_per_kind() -> None:
+    masked, counts = mask_texts(
+        ["a@b.co ve 0532 123 45 67", "kargo gelmedi", "", "b@c.org"]
+    )
+    assert masked == ["[EMAIL_MASKED] ve [PHONE_MASKED]", "kargo gelmedi", "", "[EMAIL_MASKED]"]
+    assert counts == {"email": 2, "iban": 0, "card": 0, "tckn": 0, "phone": 1, "order": 0}
+
+
+def test_mask_series_keeps_missing_values_and_dtype() -> None:
+    values = pd.Series(["a@b.co", None, "merhaba"], dtype="string")
+    masked, counts = mask_series(values)
+    assert masked.dtype == values.dtype
+    assert masked.tolist()[0] == "[EMAIL_MASKED]"
+    assert pd.isna(masked.iloc[1])
+    assert counts["email"] == 1
+
+
+def test_plugin_masks_ticket_text_once(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    csv_path = tmp_path / "tickets.csv"
+    csv_path.write_text(
+        "ticket_id,created_at,channel,customer_text,category,order_id,amount\n"
+        "T1,2024-01-01,email,iade için ara 0532 123 45 67,,ORD-1,10\n"
+        "T2,2024-01-01,email,mail: ali@example.com,,ORD-2,10\n",
+        encoding="utf-8",
+    )
+    result = TicketTriagePlugin().analyze(
+        inputs={"tickets": csv_path}, llm=LLMClient(None), run_id="run-pii"
+    )
+    step = next(step for step in result.steps if step.action == "MASK_PII")
+    assert "pii_masked[phone]=1" in step.evidence
+    assert "pii_masked[email]=1" in step.evidence
+
+    categories = next(
+        item.path for item in result.artifacts if item.path.endswith("categories.csv")
+    )
+    written = pd.read_csv(categories)["text"].tolist()
+    assert written == ["iade için ara [PHONE_MASKED]", "mail: [EMAIL_MASKED]"]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from core import storage
+from core.engine import Engine
+from core.progress import (
+    ROWS_PROCESSED,
+    STEP_FINISHED,
+    STEP_STARTED,
+    RunCancelled,
+    RunContext,
+)
+from plugins.edocument_audit.plugin import EDocumentAuditPlugin
+
+
+EDOC_SAMPLES = Path(__file__).resolve().parent.parent / "plugins" / "edocument_audit" / "sample_inputs"
+
+
+def _edoc_inputs(tmp_path: Path) -> dict:
+    inputs = {}
+    for name in ("invoices", "purchase_orders", "delivery_notes"):
+        inputs[name] = tmp_path / f"{name}.csv"
+        shutil.copyfile(EDOC_SAMPLES / f"{name}.csv", inputs[name])
+    return inputs
+
+
+def test_plugin_reports_steps_and_rows(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    events = []
+    context = RunContext("run-events", subscriber=events.append)
+    result = Engine(registry={"edoc": EDocumentAuditPlugin()}).run(
+        "edoc", _edoc_inputs(tmp_path), context=context
+    )
+
+    assert result.run_id == "run-events"
+    started = [event.action for event in events if event.kind == STEP_STARTED]
+    finished = [event.action for event in events if event.kind == STEP_FINISHED]
+    assert started[:2] == ["LOAD_INPUTS", "DUPLICATE_CHECK"]
+    assert started == finished
+    assert any(
+        event.kind == ROWS_PROCESSED and event.action == "invoices" and event.rows > 0
+        for event in events
+    )
+    assert storage.load_run("run-events").status == "done"
+
+
+def test_cancelled_run_keeps_finished_steps(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    context = RunContext("run-cancel")
+
+    def cancel_after_first_step(event) -> None:
+        if event.kind == STEP_FINISHED:
+            context.token.cancel()
+
+    context.subscribe(cancel_after_first_step)
+    with pytest.raises(RunCancelled):
+        Engine(registry={"edoc": EDocumentAuditPlugin()}).run(
+            "edoc", _edoc_inputs(tmp_path), context=context
+        )
+
+    audit = storage.load_run("run-cancel")
+    assert audit.status == "cancelled"
+    assert [step.action for step in audit.steps] == ["LOAD_INPUTS", "RUN_CANCELLED"]
+    assert audit.steps[-1].status == "cancelled"
+    assert "completed_steps=1" in audit.steps[-1].evidence
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
+from core import schema as schema_module
 from core.schema import (
     SchemaValidationError,
     get_input_schema,
     get_synonyms,
     auto_map_columns_scored,
+    compile_validation_plan,
+    date_format_evidence,
+    detect_date_format,
+    iter_csv_with_schema,
     load_csv_with_schema,
+    parse_dates,
 )
+from core.settings import Settings
 
 
 def test_mapping_allows_custom_columns(tmp_path, monkeypatch) -> None:
@@ -85,3 +94,192 @@ def test_auto_mapping_synonyms() -> None:
     assert mapping["channel"] == "Source"
     assert mapping["customer_text"] == "Message"
     assert all(scores.get(key) is not None for key in expected)
+
+
+def test_iter_csv_with_schema_yields_converted_chunks(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "tickets.csv"
+    path.write_text(
+        "ticket_id,created_at,channel,customer_text,amount\n"
+        "T1,2024-01-01,email,Hello,100\n"
+        "T2,2024-01-02,chat,Hi,200\n"
+        "T3,2024-01-03,web,Hey,300\n",
+        encoding="utf-8",
+    )
+    schema = get_input_schema("ticket", "tickets")
+    chunks = list(iter_csv_with_schema(path, schema, None, Settings(chunk_size=2)))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(pd.api.types.is_numeric_dtype(chunk["amount"]) for chunk in chunks)
+    assert all(pd.api.types.is_datetime64_any_dtype(chunk["created_at"]) for chunk in chunks)
+
+
+def test_iter_csv_with_schema_reports_all_bad_chunks(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "tickets.csv"
+    path.write_text(
+        "ticket_id,created_at,channel,customer_text,amount\n"
+        "T1,2024-01-01,email,Hello,100\n"
+        "T2,2024-01-02,chat,Hi,abc\n"
+        "T3,2024-01-03,web,Hey,300\n"
+        "T4,2024-01-04,web,Hey,xyz\n",
+        encoding="utf-8",
+    )
+    schema = get_input_schema("ticket", "tickets")
+    yielded = []
+    with pytest.raises(SchemaValidationError) as exc:
+        for chunk in iter_csv_with_schema(path, schema, None, Settings(chunk_size=2)):
+            yielded.append(chunk)
+    assert yielded == []
+    assert len(exc.value.messages) == 2
+    assert "parça 1, satır 2" in exc.value.messages[0]
+    assert "parça 2, satır 4" in exc.value.messages[1]
+
+
+def test_validation_plan_reports_rows_and_samples() -> None:
+    schema = get_input_schema("ticket", "tickets")
+    plan = compile_validation_plan(schema, {"amount": "Tutar"})
+    assert compile_validation_plan(schema, {"amount": "Tutar"}) is plan
+
+    df = plan.map_columns(
+        pd.DataFrame(
+            {"Tutar": pd.array(["10", "x", None, " ", "y"], dtype="string")},
+        )
+    )
+    converted, issues = plan.execute(df)
+    assert converted["amount"].dtype == "string"
+    assert len(issues) == 1
+    assert issues[0].column == "amount"
+    assert issues[0].rows == [1, 4]
+    assert issues[0].samples == ["x", "y"]
+    assert "örnek: 'x', 'y'" in issues[0].message(locate=True)
+
+
+def test_turkish_dates_are_parsed_day_first(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "tickets.csv"
+    path.write_text(
+        "ticket_id,created_at,channel,customer_text\n"
+        "T1,31.01.2024,email,Hello\n"
+        "T2,01.02.2024,chat,Hi\n"
+        "T3,01.02.2024,web,Hey\n",
+        encoding="utf-8",
+    )
+    schema = get_input_schema("ticket", "tickets")
+    df = load_csv_with_schema(path, schema, None, Settings(cache_max_mb=None))
+    assert df["created_at"].tolist() == [
+        pd.Timestamp("2024-01-31"),
+        pd.Timestamp("2024-02-01"),
+        pd.Timestamp("2024-02-01"),
+    ]
+    assert date_format_evidence(df) == ["date_format[created_at]=%d.%m.%Y"]
+
+
+def test_parse_dates_falls_back_for_other_formats() -> None:
+    series = pd.Series(["05/06/2024 10:20", "2024-03-05", None, "bad"], dtype="string")
+    parsed = parse_dates(series, detect_date_format(series))
+    assert parsed.iloc[0] == pd.Timestamp("2024-06-05 10:20")
+    assert parsed.iloc[1] == pd.Timestamp("2024-03-05")
+    assert parsed.iloc[2:].isna().all()
+
+
+def test_parallel_load_matches_sequential(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "tickets.csv"
+    rows = ["ticket_id,created_at,channel,customer_text,amount"]
+    for index in range(300):
+        text = f'"multi\nline {index}"' if index % 7 == 0 else f"text {index}"
+        rows.append(f"T{index},0{index % 9 + 1}.02.2024,email,{text},{index}")
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    schema = get_input_schema("ticket", "tickets")
+    monkeypatch.setattr(schema_module, "PARALLEL_MIN_BYTES", 0)
+
+    sequential = load_csv_with_schema(path, schema, None, Settings(cache_max_mb=None))
+    parallel = load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, parse_workers=2)
+    )
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert parallel.attrs["date_formats"] == {"created_at": "%d.%m.%Y"}
+
+    limited = load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, parse_workers=2, max_rows=150)
+    )
+    assert len(limited) == 150
+    assert limited["ticket_id"].iloc[-1] == "T149"
+
+
+def test_parallel_row_limit_inside_partition_with_late_errors(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "tickets.csv"
+    rows = ["ticket_id,created_at,channel,customer_text,amount"]
+    for index in range(300):
+        amount = "bad" if index == 140 else str(index)
+        rows.append(f"T{index},01.02.2024,email,text {index},{amount}")
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    schema = get_input_schema("ticket", "tickets")
+    monkeypatch.setattr(schema_module, "PARALLEL_MIN_BYTES", 0)
+
+    sequential = load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, max_rows=120)
+    )
+    submitted = []
+
+    class _CountingPool(ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            submitted.append(args[2])
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(schema_module, "ProcessPoolExecutor", _CountingPool)
+    parallel = load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, parse_workers=2, max_rows=120)
+    )
+    pd.testing.assert_frame_equal(parallel, sequential)
+
+    submitted.clear()
+    load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, parse_workers=2, max_rows=10)
+    )
+    assert len(submitted) == 2
+
+
+def test_loader_compacts_repetitive_and_integer_columns(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "invoices.csv"
+    rows = ["invoice_id,vendor,date,subtotal,vat_rate,vat_amount,total,po_id,dn_id"]
+    for index in range(40):
+        rows.append(
+            f"INV-{index},Vendor {index % 3},2024-01-01,100,0.2,20,120,"
+            f"PO-{index // 4},DN-{index}"
+        )
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    schema = get_input_schema("edoc", "invoices")
+
+    whole = load_csv_with_schema(path, schema, None, Settings(cache_max_mb=None))
+    chunked = load_csv_with_schema(
+        path, schema, None, Settings(cache_max_mb=None, chunk_size=15)
+    )
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert isinstance(whole["vendor"].dtype, pd.CategoricalDtype)
+    assert isinstance(whole["po_id"].dtype, pd.CategoricalDtype)
+    assert whole["invoice_id"].dtype == "string"
+    assert whole["dn_id"].dtype == "string"
+    assert whole["subtotal"].dtype == "Float64"
+    assert whole["vat_rate"].dtype == "Float64"
+    assert schema_module.memory_evidence(whole, "invoices")[0].startswith(
+        "memory_mb[invoices]="
+    )
+
+
+def test_whole_number_amounts_keep_wide_dtype(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "invoices.csv"
+    path.write_text(
+        "invoice_id,vendor,date,subtotal,vat_rate,vat_amount,total,po_id,dn_id\n"
+        "INV-1,Vendor A,2024-01-01,100,0.2,20,121,PO-1,DN-1\n",
+        encoding="utf-8",
+    )
+    df = load_csv_with_schema(
+        path, get_input_schema("edoc", "invoices"), None, Settings(cache_max_mb=None)
+    )
+    assert (df["subtotal"] + df["subtotal"] + df["total"]).tolist() == [321]
+    df.loc[df["invoice_id"] == "INV-1", "total"] = 120.5
+    assert df["total"].tolist() == [120.5]
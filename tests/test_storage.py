@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
 from core import storage
@@ -73,3 +76,30 @@ def test_clear_runs_removes_all(tmp_path, monkeypatch) -> None:
     )
     storage.clear_runs()
     assert storage.list_runs() == []
+
+
+def test_concurrent_index_updates_keep_every_run(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    started = datetime.now(timezone.utc)
+    run_ids = [f"run-{index}" for index in range(40)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda run_id: storage.upsert_index_entry(run_id, "edoc", started), run_ids))
+    assert sorted(entry["run_id"] for entry in storage.load_index()) == sorted(run_ids)
+    assert not list((tmp_path / "runs").glob("*.tmp"))
+
+
+def _upsert_runs(prefix: str) -> None:
+    started = datetime.now(timezone.utc)
+    for index in range(15):
+        storage.upsert_index_entry(f"{prefix}-{index}", "edoc", started)
+
+
+def test_index_updates_from_several_processes_keep_every_run(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    storage.get_runs_dir()
+    prefixes = [f"proc-{index}" for index in range(4)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as pool:
+        list(pool.map(_upsert_runs, prefixes))
+    run_ids = {entry["run_id"] for entry in storage.load_index()}
+    assert run_ids == {f"{prefix}-{index}" for prefix in prefixes for index in range(15)}
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from core.llm import LLMClient
+from core.llm import LLMClient, LLMResponseCache
+from core.mock_openai import start_mock_server
 from plugins.ticket_triage.plugin import TicketTriagePlugin
 
 
@@ -65,3 +66,56 @@ def test_ticket_outputs_created(tmp_path, monkeypatch) -> None:
     paths = [Path(artifact.path) for artifact in result.artifacts]
     assert any(path.name == "report.pdf" and path.exists() for path in paths)
     assert any(path.name == "reply_email.txt" and path.exists() for path in paths)
+
+
+def test_ticket_categorize_reports_llm_cache_counts(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    csv_path = _write_ticket_csv(
+        tmp_path / "tickets.csv",
+        "T4,2024-01-01,email,kargo gecikti,,ORD-4,10\n"
+        "T5,2024-01-01,email,refund please,,ORD-5,20\n",
+    )
+    server = start_mock_server()
+    try:
+        llm = LLMClient(
+            api_key="test",
+            use_openai=True,
+            base_url=server.base_url,
+            cache=LLMResponseCache(tmp_path / "llm.sqlite3"),
+        )
+        plugin = TicketTriagePlugin()
+        evidence = []
+        for run_id in ("run-cache-1", "run-cache-2"):
+            result = plugin.analyze(inputs={"tickets": csv_path}, llm=llm, run_id=run_id)
+            step = next(step for step in result.steps if step.action == "CATEGORIZE")
+            evidence.append(step.evidence)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert evidence[0][-2:] == ["llm_cache_hits=0", "llm_cache_misses=2"]
+    assert evidence[1][-2:] == ["llm_cache_hits=2", "llm_cache_misses=0"]
+
+
+def test_ticket_identical_texts_are_categorized_once(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    csv_path = _write_ticket_csv(
+        tmp_path / "tickets.csv",
+        "T6,2024-01-01,email,kargo  gecikti,,ORD-6,10\n"
+        "T7,2024-01-01,email, kargo gecikti ,,ORD-7,10\n"
+        "T8,2024-01-01,email,refund please,,ORD-8,10\n"
+        "T9,2024-01-01,email,kargo gecikti,delivery,ORD-9,10\n",
+    )
+    llm = LLMClient(None)
+    calls = []
+    original = llm.categorize_many_with_sources
+    monkeypatch.setattr(
+        llm,
+        "categorize_many_with_sources",
+        lambda texts: calls.append(texts) or original(texts),
+    )
+    result = TicketTriagePlugin().analyze(
+        inputs={"tickets": csv_path}, llm=llm, run_id="run-dedup"
+    )
+    step = next(step for step in result.steps if step.action == "CATEGORIZE")
+    assert step.evidence == ["predicted_missing=3", "distinct_texts=2", "dedup_ratio=0.33"]
+    assert calls == [["kargo  gecikti", "refund please"]]
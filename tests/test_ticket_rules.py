@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import lexicon
+from core.llm import LLMClient
+from plugins.ticket_triage import rules, vectorized_rules
+from plugins.ticket_triage.plugin import TicketTriagePlugin
+
+
+def test_triage_matches_row_wise_rules() -> None:
+    df = pd.DataFrame(
+        {
+            "ticket_id": ["T1", "T2", "T3", "T4", "T5", "T6"],
+            "customer_text": [
+                "ACİL iade lütfen",
+                "urgent refund payment",
+                "Hemen para iadesi",
+                "return it",
+                "",
+                "İADE",
+            ],
+            "category": ["billing", None, "", np.nan, "other", None],
+            "order_id": ["O1", None, "  ", np.nan, "O5", "O6"],
+            "amount": [1200, None, "", " 50 ", "abc", 1000.5],
+        }
+    )
+    triaged = vectorized_rules.triage(df)
+    missing = triaged.missing_lists()
+    for position, (_, row) in enumerate(df.iterrows()):
+        text = str(row.get("customer_text") or "")
+        assert triaged.texts.iat[position] == text
+        current = row.get("category")
+        assert triaged.needs_category[position] == (pd.isna(current) or current == "")
+        assert missing.get(position, []) == rules.missing_fields(row)
+        score, severity = rules.priority_score(text, row.get("amount"))
+        assert triaged.scores[position] == score
+        assert triaged.severities[position] == severity
+
+
+def test_vectorized_triage_keeps_plugin_output(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    csv_path = tmp_path / "tickets.csv"
+    csv_path.write_text(
+        "ticket_id,created_at,channel,customer_text,category,order_id,amount\n"
+        "T1,2024-01-01,email,ACİL iade,, ,\n"
+        "T2,2024-01-02,chat,urgent refund payment,billing,ORD-1,1200\n"
+        "T3,2024-01-03,email,hemen para,,ORD-3,5\n"
+        "T4,2024-01-04,phone,return request,other,,200\n",
+        encoding="utf-8",
+    )
+
+    def _run(vectorized: bool, run_id: str):
+        Path("settings.json").write_text(
+            json.dumps({"vectorized_rules": vectorized, "cache_max_mb": None}),
+            encoding="utf-8",
+        )
+        result = TicketTriagePlugin().analyze(
+            inputs={"tickets": csv_path}, llm=LLMClient(None), run_id=run_id
+        )
+        email = next(a for a in result.artifacts if a.type == "email")
+        drafts = next(a for a in result.artifacts if a.type == "jsonl")
+        # The drafting rate is a timing, not an output.
+        steps = [
+            (
+                s.action,
+                s.severity,
+                [item for item in s.evidence if not item.startswith("drafts_per_second=")],
+                s.decision,
+            )
+            for s in result.steps
+        ]
+        return (
+            steps,
+            result.recommendations,
+            Path(email.path).read_text(encoding="utf-8"),
+            Path(drafts.path).read_text(encoding="utf-8"),
+        )
+
+    assert _run(True, "run-vectorized") == _run(False, "run-rows")
+
+
+def test_lexicon_is_looked_up_once_per_batch(monkeypatch) -> None:
+    matcher = lexicon.default_matcher()
+    lookups = []
+    monkeypatch.setattr(lexicon, "default_matcher", lambda: lookups.append(1) or matcher)
+    texts = ["acil iade", "kargo nerede", "ödeme hatası"]
+    LLMClient(None).categorize_many(texts)
+    assert len(lookups) == 1
+    assert [rules.priority_score(text, None, matcher) for text in texts]
+    assert len(lookups) == 1